@@ -0,0 +1,43 @@
+"""
+Benchmark do desgaste por autômato celular (maps.decay)
+
+Uso:
+    python benchmarks/bench_decay.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from maps.connectivity import count_components
+from maps.decay import decay_grid
+from maps.map_generator import HauntedMansionGenerator
+
+MAP_SIDE = 1024
+NUM_ROOMS = 400
+ITERATIONS = (1, 3, 5)
+RUNS = 5
+
+
+def main():
+    generator = HauntedMansionGenerator(MAP_SIDE, MAP_SIDE, use_numpy=True)
+    generator.generate_mansion(num_rooms=NUM_ROOMS, seed=1)
+
+    print(f"mapa {MAP_SIDE}x{MAP_SIDE}, {len(generator.rooms)} salas")
+    for iterations in ITERATIONS:
+        best = float("inf")
+        for run in range(RUNS):
+            grid = generator.grid.copy()
+            start = time.perf_counter()
+            # Como no gerador: depois da verificação o mapa já é uma região só
+            stats = decay_grid(grid, run, iterations, components=1)
+            best = min(best, time.perf_counter() - start)
+        print(f"{iterations} iterações: {best * 1000:7.2f} ms  "
+              f"({stats['crumbled']} paredes desmoronadas, {stats['collapsed']} células desabadas, "
+              f"{count_components(grid)} região)")
+
+
+if __name__ == "__main__":
+    main()
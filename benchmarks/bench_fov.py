@@ -0,0 +1,53 @@
+"""
+Benchmark do campo de visão (maps.fov)
+
+Compara o custo de um cálculo de visão em salas e corredores com o de
+apenas consultar a visão quando o jogador não se moveu.
+
+Uso:
+    python benchmarks/bench_fov.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from maps.fov import FOV_RADIUS, FieldOfView
+from maps.map_generator import HauntedMansionGenerator
+
+MAP_SIDE = 256
+NUM_ROOMS = 40
+ORIGINS = 200
+QUERIES = 100000
+
+
+def main():
+    generator = HauntedMansionGenerator(MAP_SIDE, MAP_SIDE)
+    generator.generate_mansion(num_rooms=NUM_ROOMS, seed=1)
+    index = generator.walkable_index
+    origins = [index.random_cell() for _ in range(ORIGINS)]
+
+    fov = FieldOfView(generator.map_data, radius=FOV_RADIUS)
+    visible = 0
+    start = time.perf_counter()
+    for x, y in origins:
+        fov.update(x, y)
+        visible += len(fov.visible_cells)
+    elapsed = time.perf_counter() - start
+    print(f"mapa {MAP_SIDE}x{MAP_SIDE}, raio {FOV_RADIUS}")
+    print(f"cálculo:   {elapsed / ORIGINS * 1000:7.3f} ms  ({visible // ORIGINS} células visíveis em média)")
+
+    # Sem movimento: update não recalcula e as consultas são O(1)
+    x, y = origins[-1]
+    start = time.perf_counter()
+    for i in range(QUERIES):
+        fov.update(x, y)
+        fov.is_visible(x + i % 7 - 3, y + i % 5 - 2)
+    elapsed = time.perf_counter() - start
+    print(f"consulta:  {elapsed / QUERIES * 1e6:7.3f} us  (update sem movimento + is_visible)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmark do desenho do mapa: um pyxel.rect por célula vs imagem em cache
+
+Uso:
+    python benchmarks/bench_map_render.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pyxel
+from core.constants import *
+from maps.map_generator import HauntedMansionGenerator
+from ui.map_renderer import MapRenderer
+
+SCREEN_WIDTH = 1200
+SCREEN_HEIGHT = 800
+SCALE = 3
+FRAMES = 60
+
+
+def draw_per_cell(map_data, view_width, view_height):
+    """Desenho antigo: um pyxel.rect por célula visível."""
+    for y in range(view_height):
+        for x in range(view_width):
+            if 0 <= x < len(map_data[0]) and 0 <= y < len(map_data):
+                cell = map_data[y][x]
+                if cell == CELL_WALL:
+                    pyxel.rect(x * SCALE, y * SCALE, SCALE, SCALE, COLOR_GRAY)
+                elif cell == CELL_FLOOR or cell == CELL_CORRIDOR:
+                    pyxel.rect(x * SCALE, y * SCALE, SCALE, SCALE, COLOR_BROWN)
+
+
+def measure(label, draw_frame):
+    """Mede o tempo médio por frame em milissegundos."""
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        pyxel.cls(COLOR_BLACK)
+        draw_frame()
+    elapsed = (time.perf_counter() - start) / FRAMES * 1000
+    print(f"  {label:<22} {elapsed:8.3f} ms/frame")
+    return elapsed
+
+
+def main():
+    pyxel.init(SCREEN_WIDTH, SCREEN_HEIGHT, title="Benchmark de renderização")
+
+    view_width = (SCREEN_WIDTH - UI_PANEL_WIDTH) // SCALE
+    view_height = (SCREEN_HEIGHT - STATUS_HEIGHT) // SCALE
+
+    for map_width, map_height in [(60, 60), (view_width, view_height)]:
+        generator = HauntedMansionGenerator(map_width, map_height)
+        map_data = generator.generate_mansion(num_rooms=max(8, map_width * map_height // 900))
+        renderer = MapRenderer(scale=SCALE)
+
+        print(f"Mapa {map_width}x{map_height}:")
+        start = time.perf_counter()
+        renderer.update(map_data)
+        print(f"  {'rasterização (1x)':<22} {(time.perf_counter() - start) * 1000:8.3f} ms")
+
+        per_cell = measure("rect por célula", lambda: draw_per_cell(map_data, view_width, view_height))
+        cached = measure("blt da imagem em cache",
+                         lambda: renderer.draw(map_data, 0, 0, view_width, view_height))
+        print(f"  ganho: {per_cell / cached:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
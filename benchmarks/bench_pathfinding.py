@@ -0,0 +1,58 @@
+"""
+Benchmark do pathfinding: A* célula a célula vs HPA* por salas
+
+Uso:
+    python benchmarks/bench_pathfinding.py
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from maps.map_generator import HauntedMansionGenerator, np
+
+MAP_SIDE = 1024
+NUM_ROOMS = 400
+QUERIES = 500
+CELL_QUERIES = 5  # A* célula a célula leva centenas de ms por rota
+
+
+def main():
+    generator = HauntedMansionGenerator(MAP_SIDE, MAP_SIDE, use_numpy=np is not None)
+    generator.generate_mansion(num_rooms=NUM_ROOMS, seed=1)
+    pathfinder = generator.pathfinder
+
+    start = time.perf_counter()
+    pathfinder.build()
+    build = time.perf_counter() - start
+
+    rng = random.Random(2)
+    index = generator.walkable_index
+    queries = [(index.random_cell(rng), index.random_cell(rng)) for _ in range(QUERIES)]
+    width = generator.map_width
+
+    start = time.perf_counter()
+    for (start_x, start_y), (goal_x, goal_y) in queries[:CELL_QUERIES]:
+        pathfinder._cell_search(start_y * width + start_x, goal_y * width + goal_x, None)
+    cell_ms = (time.perf_counter() - start) / CELL_QUERIES * 1000
+
+    timings = []
+    for label in ("HPA* (1ª vez)", "HPA* (trechos em cache)"):
+        start = time.perf_counter()
+        for origin, goal in queries:
+            generator.find_path(origin, goal)
+        timings.append((label, (time.perf_counter() - start) / QUERIES * 1000))
+
+    print(f"mapa {MAP_SIDE}x{MAP_SIDE}, {len(generator.rooms)} salas, "
+          f"{sum(len(cells) for cells in pathfinder.entrances.values())} entradas "
+          f"(pré-cálculo {build:.2f}s)")
+    print(f"{'A* célula a célula':<26} {cell_ms:10.3f} ms/rota")
+    for label, elapsed in timings:
+        print(f"{label:<26} {elapsed:10.3f} ms/rota   ({cell_ms / elapsed:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Benchmark das estratégias de posicionamento de salas: sorteio com rejeição vs BSP
+
+Uso:
+    python benchmarks/bench_placement_modes.py
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from maps.map_generator import HauntedMansionGenerator, np
+
+# (lado do mapa, salas pedidas): do layout padrão até mapas lotados
+CASES = [(60, 8), (60, 20), (60, 40), (120, 60), (120, 150), (300, 1000)]
+SEEDS = range(5)
+
+
+def time_placement(side: int, num_rooms: int, placement: str) -> tuple:
+    """Mede _generate_rooms / _generate_rooms_bsp (média das sementes)."""
+    generator = HauntedMansionGenerator(side, side, use_numpy=np is not None)
+    elapsed = 0.0
+    placed = 0
+    attempts = 0
+    for seed in SEEDS:
+        generator.generate_mansion(num_rooms=0, seed=seed)  # Só inicializa o grid
+        generator.rng = random.Random(seed)
+        start = time.perf_counter()
+        if placement == "bsp":
+            rooms = generator._generate_rooms_bsp(num_rooms)
+        else:
+            rooms = generator._generate_rooms(num_rooms)
+        elapsed += time.perf_counter() - start
+        placed += len(rooms)
+        attempts += generator.placement_attempts
+
+    runs = len(SEEDS)
+    return elapsed / runs, placed / runs, attempts / runs
+
+
+def main():
+    print(f"{'mapa':>9} {'pedidas':>8} | {'random: salas':>13} {'tentativas':>10} {'ms':>8} | "
+          f"{'bsp: salas':>10} {'tentativas':>10} {'ms':>8}")
+    for side, num_rooms in CASES:
+        random_ms, random_placed, random_attempts = time_placement(side, num_rooms, "random")
+        bsp_ms, bsp_placed, bsp_attempts = time_placement(side, num_rooms, "bsp")
+        print(f"{f'{side}x{side}':>9} {num_rooms:>8} | {random_placed:13.1f} {random_attempts:10.0f} "
+              f"{random_ms * 1000:8.2f} | {bsp_placed:10.1f} {bsp_attempts:10.0f} {bsp_ms * 1000:8.2f}")
+
+
+if __name__ == "__main__":
+    main()
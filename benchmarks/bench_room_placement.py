@@ -0,0 +1,81 @@
+"""
+Benchmark do posicionamento de salas: varredura linear vs índice espacial
+
+Uso:
+    python benchmarks/bench_room_placement.py
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import maps.map_generator as map_generator
+from maps.map_generator import HauntedMansionGenerator, np
+
+ROOM_COUNTS = [8, 100, 1000, 10000]
+LINEAR_LIMIT = 1000  # Acima disso a varredura linear leva minutos
+
+
+class LinearRoomIndex:
+    """Comportamento antigo: compara a candidata com todas as salas posicionadas."""
+
+    def __init__(self, cell_size: int = 24, margin: int = 3):
+        self.margin = margin
+        self.rooms = []
+
+    def insert(self, room):
+        self.rooms.append(room)
+
+    def collides(self, room) -> bool:
+        for other in self.rooms:
+            if room.intersects(other) or room.distance_to(other) < self.margin:
+                return True
+        return False
+
+
+def map_side_for(num_rooms: int) -> int:
+    """Lado do mapa quadrado com área suficiente para num_rooms salas."""
+    return max(60, int((num_rooms * 500) ** 0.5))
+
+
+def time_placement(num_rooms: int, index_class) -> tuple:
+    """Mede o tempo de _generate_rooms com a classe de índice informada."""
+    side = map_side_for(num_rooms)
+    generator = HauntedMansionGenerator(side, side, use_numpy=np is not None)
+    generator.generate_mansion(num_rooms=0)  # Só inicializa o grid
+
+    original = map_generator.RoomSpatialIndex
+    map_generator.RoomSpatialIndex = index_class
+    try:
+        random.seed(num_rooms)
+        start = time.perf_counter()
+        rooms = generator._generate_rooms(num_rooms)
+        elapsed = time.perf_counter() - start
+    finally:
+        map_generator.RoomSpatialIndex = original
+
+    return elapsed, len(rooms), side
+
+
+def main():
+    print(f"{'salas':>6} {'mapa':>11} {'linear (s)':>12} {'índice (s)':>12} {'ganho':>7}")
+    for num_rooms in ROOM_COUNTS:
+        indexed, placed, side = time_placement(num_rooms, map_generator.RoomSpatialIndex)
+
+        if num_rooms <= LINEAR_LIMIT:
+            linear, _, _ = time_placement(num_rooms, LinearRoomIndex)
+            linear_text = f"{linear:12.4f}"
+            speedup_text = f"{linear / indexed:6.1f}x"
+        else:
+            linear_text = f"{'-':>12}"
+            speedup_text = f"{'-':>7}"
+
+        print(f"{num_rooms:>6} {f'{side}x{side}':>11} {linear_text} {indexed:12.4f} {speedup_text}"
+              f"   ({placed} salas posicionadas)")
+
+
+if __name__ == "__main__":
+    main()
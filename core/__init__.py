@@ -4,6 +4,7 @@ Core module - Núcleo do jogo
 
 from .game_state import GameState
 from .player import Player
+from .camera import Camera
 from .constants import *
 
-__all__ = ['GameState', 'Player'] 
\ No newline at end of file
+__all__ = ['GameState', 'Player', 'Camera'] 
\ No newline at end of file
@@ -0,0 +1,105 @@
+"""
+Câmera da área do jogo
+"""
+
+from typing import Optional, Tuple
+from .constants import MAP_SCALE
+
+# Limites do zoom (pixels por célula do mapa)
+MIN_SCALE = 1
+MAX_SCALE = 6
+
+
+class Camera:
+    """
+    Janela da área do jogo sobre o mapa.
+
+    Guarda a célula do mundo no canto superior esquerdo e a escala (zoom),
+    e faz as conversões tela <-> mundo usadas pelo desenho do mapa, pelos
+    cliques e pelo recorte do que está fora da tela. Todas as consultas são
+    aritmética simples sobre o retângulo visível (nada percorre o mapa).
+    """
+
+    def __init__(self, screen_x: int, screen_y: int, screen_width: int, screen_height: int,
+                 scale: int = MAP_SCALE):
+        """
+        Inicializa a câmera.
+
+        Args:
+            screen_x: Posição da área do jogo na tela (pixels)
+            screen_y: Posição da área do jogo na tela (pixels)
+            screen_width: Largura da área do jogo (pixels)
+            screen_height: Altura da área do jogo (pixels)
+            scale: Pixels por célula do mapa
+        """
+        self.screen_x = screen_x
+        self.screen_y = screen_y
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        self.scale = scale
+        self.min_scale = MIN_SCALE  # Zoom mínimo deste mundo (ex.: limitado pelos chunks carregados)
+        self.x = 0  # Coluna do mundo no canto superior esquerdo
+        self.y = 0  # Linha do mundo no canto superior esquerdo
+        self.bounds: Optional[Tuple[int, int]] = None  # (largura, altura) do mapa; None = sem limites
+
+    @property
+    def view_width(self) -> int:
+        """Largura visível em células."""
+        return self.screen_width // self.scale
+
+    @property
+    def view_height(self) -> int:
+        """Altura visível em células."""
+        return self.screen_height // self.scale
+
+    def set_bounds(self, width: Optional[int], height: Optional[int] = None):
+        """Limita a câmera a um mapa width x height (None libera, ex.: mundo infinito)."""
+        self.bounds = None if width is None else (width, height)
+
+    def set_scale(self, scale: int) -> bool:
+        """
+        Muda o zoom (limitado a [min_scale, MAX_SCALE]).
+
+        Returns:
+            True se a escala mudou
+        """
+        scale = max(self.min_scale, min(MAX_SCALE, scale))
+        if scale == self.scale:
+            return False
+        self.scale = scale
+        return True
+
+    def follow(self, world_x: int, world_y: int):
+        """Centraliza a câmera na célula, sem mostrar além das bordas do mapa."""
+        x = world_x - self.view_width // 2
+        y = world_y - self.view_height // 2
+        if self.bounds is not None:
+            # Mapa menor que a janela fica encostado no canto superior esquerdo
+            x = max(0, min(x, self.bounds[0] - self.view_width))
+            y = max(0, min(y, self.bounds[1] - self.view_height))
+        self.x = x
+        self.y = y
+
+    def world_to_screen(self, world_x: int, world_y: int) -> Tuple[int, int]:
+        """Canto superior esquerdo (em pixels da tela) da célula do mundo."""
+        return (self.screen_x + (world_x - self.x) * self.scale,
+                self.screen_y + (world_y - self.y) * self.scale)
+
+    def screen_to_world(self, screen_x: int, screen_y: int) -> Tuple[int, int]:
+        """Célula do mundo sob o pixel da tela."""
+        return (self.x + (screen_x - self.screen_x) // self.scale,
+                self.y + (screen_y - self.screen_y) // self.scale)
+
+    def contains_screen(self, screen_x: int, screen_y: int) -> bool:
+        """Verifica se o pixel da tela está na área do jogo."""
+        return (self.screen_x <= screen_x < self.screen_x + self.screen_width and
+                self.screen_y <= screen_y < self.screen_y + self.screen_height)
+
+    def visible_rect(self) -> Tuple[int, int, int, int]:
+        """Retângulo visível do mundo (x, y, largura, altura) em células."""
+        return (self.x, self.y, self.view_width, self.view_height)
+
+    def is_visible(self, world_x: int, world_y: int) -> bool:
+        """Verifica se a célula do mundo aparece na tela."""
+        return (self.x <= world_x < self.x + self.view_width and
+                self.y <= world_y < self.y + self.view_height)
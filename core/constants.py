@@ -24,6 +24,8 @@ COLOR_PEACH = 15
 CELL_WALL = 1
 CELL_FLOOR = 3
 CELL_CORRIDOR = 4
+CELL_STAIRS_UP = 6
+CELL_STAIRS_DOWN = 7
 
 # Estados do jogo
 GAME_STATE_MENU = "menu"           # Menu inicial
@@ -68,6 +70,7 @@ UI_PANEL_WIDTH = 200
 UI_PANEL_HEIGHT = 600
 CHAT_HEIGHT = 150
 STATUS_HEIGHT = 100
+MAP_SCALE = 3                       # Pixels por célula do mapa
 
 # Configurações de combate
 COMBAT_RANGE = 2
@@ -2,20 +2,52 @@
 Estado global do jogo
 """
 
+import random
+from collections import deque
+from itertools import islice
 from typing import List, Dict, Optional, Tuple
 from .player import Player
+from .camera import MAX_SCALE, Camera
 from .constants import *
 from maps.map_generator import HauntedMansionGenerator
+from maps.mansion_cache import MansionCache
+from maps.prefetcher import MansionPrefetcher
+from maps.candidates import CandidateGenerator
+from maps.floors import FloorStack
+from maps.chunk_manager import ChunkManager
+from maps.packed_map import PackedMap
+from maps.fov import FieldOfView
 
 # Constantes da tela (importadas do main.py)
 SCREEN_WIDTH = 1200
 SCREEN_HEIGHT = 800
 
+# Mensagens guardadas no histórico do chat (roláveis na interface)
+CHAT_HISTORY_LIMIT = 50000
+
+# Parâmetros de geração da mansão
+MANSION_PARAMS = {
+    'num_rooms': 8,
+    'max_connection_distance': 15,
+    'corridor_width': 3,
+    'prefabs': 'builtin',
+}
+
+# Parâmetros dos chunks da mansão infinita
+CHUNK_PARAMS = {
+    'num_rooms': 6,
+    'max_connection_distance': 15,
+    'corridor_width': 3,
+}
+
 
 class GameState:
     """Gerencia o estado global do jogo."""
     
-    def __init__(self, map_width: int, map_height: int):
+    def __init__(self, map_width: int, map_height: int, seed: Optional[int] = None,
+                 cache_dir: Optional[str] = None, chunked: bool = False,
+                 map_path: Optional[str] = None, candidates: int = 1,
+                 basements: int = 0, attics: int = 0):
         self.map_width = map_width
         self.map_height = map_height
         
@@ -23,9 +55,44 @@ class GameState:
         self.map_generator = HauntedMansionGenerator(map_width, map_height)
         self.map_data = []
         
+        # Semente fixa da mansão (None = mansão nova a cada jogo) e cache de mansões
+        self.seed = seed
+        self.mansion_cache = MansionCache(cache_dir=cache_dir)
+        
+        # Gera a próxima mansão em segundo plano durante o jogo
+        self.mansion_prefetcher = MansionPrefetcher(map_width, map_height, self.mansion_cache,
+                                                    **MANSION_PARAMS)
+        
+        # Melhor de N: gera várias candidatas em paralelo e fica com a de maior fitness
+        self.candidate_generator = None
+        if candidates > 1:
+            self.candidate_generator = CandidateGenerator(map_width, map_height, self.mansion_cache,
+                                                          candidates=candidates, **MANSION_PARAMS)
+        
+        # Andares ligados por escadas (porões abaixo e sótãos acima do térreo)
+        self.basements = basements
+        self.attics = attics
+        self.floor_stack = None
+        
+        # Mansão infinita em chunks (map_width/map_height não limitam o mundo)
+        self.chunked = chunked
+        self.cache_dir = cache_dir
+        self.chunk_manager = None
+        
+        # Mansão pré-gerada em formato compacto (aberta com mmap, sem copiar para listas)
+        self.map_path = map_path
+        self.packed_map = None
+        
         # Jogador
         self.player = None
         
+        # Campo de visão do jogador (névoa de guerra; None no mundo infinito)
+        self.fov = None
+        
+        # Câmera da área do jogo (compartilhada pelo desenho e pelos cliques)
+        self.camera = Camera(0, 0, SCREEN_WIDTH - UI_PANEL_WIDTH, SCREEN_HEIGHT - STATUS_HEIGHT)
+        self.current_room = None  # Índice da sala onde o jogador está (None = fora de salas)
+        
         # Estado do jogo
         self.current_state = GAME_STATE_MENU
         self.current_ui = UI_NORMAL
@@ -36,23 +103,27 @@ class GameState:
         
         # Eventos e mensagens
         self.event_log = []
-        self.chat_messages = []
+        self.chat_messages = deque(maxlen=CHAT_HISTORY_LIMIT)
+        self.chat_revision = 0  # Mensagens já adicionadas (id da próxima mensagem)
         
         # Inicializa o jogo
         self._initialize_game()
     
     def _initialize_game(self):
         """Inicializa o jogo."""
-        # Gera o mapa
-        self.map_data = self.map_generator.generate_mansion(
-            num_rooms=8,
-            max_connection_distance=15,
-            corridor_width=3
-        )
+        if self.chunked:
+            self._initialize_chunked_world()
+        elif self.map_path:
+            self._initialize_packed_map()
+        elif self.basements or self.attics:
+            self._initialize_floors()
+        else:
+            self._initialize_mansion()
         
-        # Cria o jogador em uma posição válida
-        spawn_x, spawn_y = self.map_generator.find_valid_spawn_position()
-        self.player = Player(spawn_x, spawn_y)
+        self.current_room = None
+        self._update_current_room()
+        self.fov = None
+        self.update_fov()
         
         # Adiciona mensagem inicial
         self.add_chat_message("Mestre da Dungeon", "Bem-vindo à mansão mal assombrada! Explore com cuidado...")
@@ -61,6 +132,81 @@ class GameState:
         self.current_state = GAME_STATE_PLAYING
         self.player.start_turn()
     
+    def _initialize_chunked_world(self):
+        """Cria o mundo em chunks e posiciona o jogador no chunk de origem."""
+        world_seed = self.seed if self.seed is not None else random.randrange(2 ** 32)
+        self.chunk_manager = ChunkManager(world_seed, cache_dir=self.cache_dir, **CHUNK_PARAMS)
+        self.map_data = []
+        
+        spawn_x, spawn_y = self.chunk_manager.find_valid_spawn_position()
+        self.player = Player(spawn_x, spawn_y)
+        self.chunk_manager.update_focus(spawn_x, spawn_y)
+        
+        # Zoom mínimo: a janela não pode mostrar mais chunks do que ficam carregados
+        camera = self.camera
+        while (camera.min_scale < MAX_SCALE and
+               not self.chunk_manager.fits_view(camera.screen_width // camera.min_scale,
+                                                camera.screen_height // camera.min_scale)):
+            camera.min_scale += 1
+        camera.set_scale(max(camera.scale, camera.min_scale))
+    
+    def _initialize_packed_map(self):
+        """Abre a mansão pré-gerada do arquivo compacto e posiciona o jogador."""
+        if self.packed_map is None:
+            self.packed_map = PackedMap.open(self.map_path)
+        self.map_generator.load_mansion(self.packed_map)
+        self.map_data = self.packed_map
+        self.map_width = self.packed_map.width
+        self.map_height = self.packed_map.height
+        
+        spawn_x, spawn_y = self.map_generator.find_valid_spawn_position()
+        self.player = Player(spawn_x, spawn_y)
+    
+    def _initialize_floors(self):
+        """Cria a pilha de andares e posiciona o jogador no térreo."""
+        base_seed = self.seed if self.seed is not None else random.randrange(2 ** 32)
+        self.floor_stack = FloorStack(self.map_width, self.map_height, base_seed, self.mansion_cache,
+                                      lowest=-self.basements, highest=self.attics,
+                                      prefetcher=self.mansion_prefetcher, **MANSION_PARAMS)
+        self.map_data = self.floor_stack.enter(self.map_generator, 0)
+        
+        spawn_x, spawn_y = self.map_generator.find_valid_spawn_position()
+        self.player = Player(spawn_x, spawn_y)
+    
+    def _initialize_mansion(self):
+        """Gera (ou carrega) a mansão de tamanho fixo e posiciona o jogador."""
+        if self.candidate_generator is not None:
+            # Usa as candidatas adiantadas se houver (senão gera ou carrega do cache)
+            base_seed = self.seed
+            if base_seed is None:
+                base_seed = self.candidate_generator.pending_seed
+            if base_seed is None:
+                base_seed = random.randrange(2 ** 32)
+            self.map_data = self.candidate_generator.generate(self.map_generator, base_seed)
+            
+            # Começa a gerar as candidatas do próximo recomeço enquanto esta é jogada
+            if self.seed is None:
+                self.candidate_generator.prefetch(random.randrange(2 ** 32))
+            spawn_x, spawn_y = self.map_generator.find_valid_spawn_position()
+            self.player = Player(spawn_x, spawn_y)
+            return
+        
+        # Usa a mansão pré-gerada se houver (senão gera ou carrega do cache)
+        seed = self.seed
+        if seed is None:
+            seed = self.mansion_prefetcher.pending_seed
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+        self.map_data = self.mansion_prefetcher.take(self.map_generator, seed)
+        
+        # Começa a gerar a próxima mansão enquanto esta é jogada
+        if self.seed is None:
+            self.mansion_prefetcher.prefetch(random.randrange(2 ** 32))
+        
+        # Cria o jogador em uma posição válida
+        spawn_x, spawn_y = self.map_generator.find_valid_spawn_position()
+        self.player = Player(spawn_x, spawn_y)
+    
     def update(self):
         """Atualiza o estado do jogo."""
         # Verifica se o jogo acabou
@@ -69,6 +215,10 @@ class GameState:
             self.add_chat_message("Sistema", "Você morreu! Game Over!")
             return
         
+        # Mantém carregados só os chunks perto do jogador
+        if self.chunk_manager is not None:
+            self.chunk_manager.update_focus(*self.player.get_position())
+        
         # Sistema turn-based
         if self.current_state == GAME_STATE_PLAYING:
             if self.current_turn == TURN_PLAYER:
@@ -156,26 +306,19 @@ class GameState:
             return False
         
         # Converte coordenadas da tela para coordenadas do mundo
-        # Assumindo que a área do jogo está na esquerda da tela
-        game_area_width = SCREEN_WIDTH - UI_PANEL_WIDTH
-        game_area_height = SCREEN_HEIGHT - STATUS_HEIGHT
-        
-        # Calcula offset da câmera
-        player_x, player_y = self.player.get_position()
-        camera_x = max(0, min(player_x - game_area_width // 2, len(self.map_data[0]) - game_area_width))
-        camera_y = max(0, min(player_y - game_area_height // 2, len(self.map_data) - game_area_height))
-        
-        # Converte coordenadas da tela para coordenadas do mapa
-        map_x = camera_x + screen_x
-        map_y = camera_y + screen_y
+        if not self.camera.contains_screen(screen_x, screen_y):
+            return False
+        self.update_camera()
+        map_x, map_y = self.camera.screen_to_world(screen_x, screen_y)
         
         # Verifica se a posição é válida
-        if (0 <= map_x < self.map_width and 
-            0 <= map_y < self.map_height and
-            not self.map_generator.is_wall(map_x, map_y)):
+        if not self.is_wall(map_x, map_y):
             
             if self.player.move(map_x, map_y):
                 self.add_chat_message("Sistema", f"Você se move para ({map_x}, {map_y})")
+                self._take_stairs()
+                self._update_current_room()
+                self.update_fov()
                 return True
         
         return False
@@ -189,12 +332,13 @@ class GameState:
         new_y = self.player.y + dy
         
         # Verifica se a posição é válida
-        if (0 <= new_x < self.map_width and 
-            0 <= new_y < self.map_height and
-            not self.map_generator.is_wall(new_x, new_y)):
+        if not self.is_wall(new_x, new_y):
             
             if self.player.move(new_x, new_y):
                 self.add_chat_message("Sistema", f"Você se move para ({new_x}, {new_y})")
+                self._take_stairs()
+                self._update_current_room()
+                self.update_fov()
                 return True
         
         return False
@@ -248,17 +392,40 @@ class GameState:
         self.player.start_turn()
         self.add_chat_message("Sistema", "Seu turno!")
     
+    def _take_stairs(self):
+        """Se o jogador parou em uma escada, leva-o ao andar ligado a ela."""
+        if self.floor_stack is None:
+            return
+        destination = self.floor_stack.stairs_destination(*self.player.get_position())
+        if destination is None:
+            return
+        floor, (x, y) = destination
+        self.map_data = self.floor_stack.enter(self.map_generator, floor)
+        self.player.x, self.player.y = x, y
+        self.current_room = None
+        self.add_chat_message("Sistema", f"Você chega ao andar {floor}")
+        self.add_event("floor_change", f"Jogador foi para o andar {floor}")
+    
+    def _update_current_room(self):
+        """Atualiza a sala atual do jogador e registra a entrada em uma sala nova."""
+        if self.chunk_manager is not None:
+            return
+        room_id = self.map_generator.room_at(*self.player.get_position())
+        if room_id is not None and room_id != self.current_room:
+            room = self.map_generator.rooms[room_id]
+            self.add_event("room_enter", f"Jogador entrou na sala {room_id} ({room.room_type})")
+        self.current_room = room_id
+    
     def add_chat_message(self, sender: str, message: str):
         """Adiciona uma mensagem ao chat."""
+        # O deque descarta as mensagens mais antigas além de CHAT_HISTORY_LIMIT
         self.chat_messages.append({
+            'id': self.chat_revision,
             'sender': sender,
             'message': message,
             'timestamp': len(self.chat_messages)
         })
-        
-        # Limita o número de mensagens
-        if len(self.chat_messages) > 50:
-            self.chat_messages.pop(0)
+        self.chat_revision += 1
     
     def add_event(self, event_type: str, description: str):
         """Adiciona um evento ao log."""
@@ -272,13 +439,60 @@ class GameState:
         """Retorna os dados do mapa."""
         return self.map_data
     
+    def is_wall(self, x: int, y: int) -> bool:
+        """Verifica se a posição é uma parede (fora do mapa conta como parede)."""
+        if self.chunk_manager is not None:
+            return self.chunk_manager.is_wall(x, y)
+        return self.map_generator.is_wall(x, y)
+    
+    def update_fov(self) -> bool:
+        """
+        Recalcula o campo de visão se o jogador andou ou o mapa mudou.
+        
+        Returns:
+            True se a visão foi recalculada
+        """
+        if self.chunk_manager is not None:
+            return False
+        if self.fov is None or self.fov.map_data is not self.map_data:
+            self.fov = FieldOfView(self.map_data)
+        return self.fov.update(*self.player.get_position())
+    
+    def is_visible(self, x: int, y: int) -> bool:
+        """Verifica se o jogador vê a célula agora (sem névoa, tudo é visível)."""
+        return self.fov is None or self.fov.is_visible(x, y)
+    
+    def is_explored(self, x: int, y: int) -> bool:
+        """Verifica se o jogador já viu a célula alguma vez."""
+        return self.fov is None or self.fov.is_explored(x, y)
+    
+    def update_camera(self) -> Camera:
+        """Centraliza a câmera no jogador, limitada ao mapa atual (sem limites no mundo infinito)."""
+        if self.chunk_manager is not None:
+            self.camera.set_bounds(None)
+        else:
+            self.camera.set_bounds(self.map_width, self.map_height)
+        self.camera.follow(*self.player.get_position())
+        return self.camera
+    
+    def get_generation_stats(self) -> Dict[str, float]:
+        """Retorna as estatísticas de geração da mansão (pré-gerada vs síncrona)."""
+        stats = self.mansion_prefetcher.get_stats()
+        if self.candidate_generator is not None:
+            stats["candidates"] = self.candidate_generator.get_stats()
+        if self.floor_stack is not None:
+            stats["floors"] = self.floor_stack.get_stats()
+        return stats
+    
     def get_player_status(self) -> Dict[str, any]:
         """Retorna o status do jogador."""
         return self.player.get_status_summary()
     
     def get_recent_chat_messages(self, count: int = 10) -> List[Dict]:
         """Retorna as mensagens mais recentes do chat."""
-        return self.chat_messages[-count:]
+        recent = list(islice(reversed(self.chat_messages), count))
+        recent.reverse()
+        return recent
     
     def get_recent_events(self, count: int = 10) -> List[Dict]:
         """Retorna os eventos mais recentes."""
@@ -1,6 +1,7 @@
 import pyxel
 from core.game_state import GameState
-from ui.interface import GameInterface
+from ui.interface import GameInterface, draw_large_text_centered
+from ui.text_renderer import TITLE_FONT, text_renderer
 from core.constants import *
 
 # Configurações da tela
@@ -24,7 +25,14 @@ class App:
         # Atualiza o estado do jogo
         self.game_state.update()
         
-        # Processa apenas cliques do mouse
+        # Roda do mouse rola o histórico do chat ou muda o zoom do mapa
+        if pyxel.mouse_wheel:
+            if not self.interface.handle_scroll(self.game_state, pyxel.mouse_x, pyxel.mouse_y,
+                                                pyxel.mouse_wheel):
+                self.interface.handle_zoom(self.game_state, pyxel.mouse_x, pyxel.mouse_y,
+                                           pyxel.mouse_wheel)
+        
+        # Processa cliques do mouse
         if pyxel.btnp(pyxel.MOUSE_BUTTON_LEFT):
             x, y = pyxel.mouse_x, pyxel.mouse_y
             action = self.interface.handle_click(x, y)
@@ -50,15 +58,10 @@ class App:
         title = "Call Me After The Tone"
         subtitle = "D&D Haunted Mansion"
         
-        # Desenha título maior
-        title_x = SCREEN_WIDTH // 2 - len(title) * 6 // 2
-        subtitle_x = SCREEN_WIDTH // 2 - len(subtitle) * 6 // 2
-        
-        for i, char in enumerate(title):
-            pyxel.text(title_x + i * 6, SCREEN_HEIGHT // 2 - 50, char, COLOR_WHITE)
-        
-        for i, char in enumerate(subtitle):
-            pyxel.text(subtitle_x + i * 6, SCREEN_HEIGHT // 2 - 30, char, COLOR_YELLOW)
+        # Desenha título maior (fonte BDF)
+        text_renderer.draw_centered(0, SCREEN_HEIGHT // 2 - 50, title, COLOR_WHITE, SCREEN_WIDTH,
+                                    font=TITLE_FONT)
+        draw_large_text_centered(0, SCREEN_HEIGHT // 2 - 30, subtitle, COLOR_YELLOW, SCREEN_WIDTH)
         
         # Botão para começar
         button_x = SCREEN_WIDTH // 2 - 100
@@ -70,15 +73,11 @@ class App:
         
         # Texto do botão maior
         button_text = "COMEÇAR"
-        button_text_x = SCREEN_WIDTH // 2 - len(button_text) * 6 // 2
-        for i, char in enumerate(button_text):
-            pyxel.text(button_text_x + i * 6, button_y + 15, char, COLOR_WHITE)
+        draw_large_text_centered(0, button_y + 15, button_text, COLOR_WHITE, SCREEN_WIDTH)
         
         # Instruções
         instructions = "Clique no botão para começar"
-        instructions_x = SCREEN_WIDTH // 2 - len(instructions) * 6 // 2
-        for i, char in enumerate(instructions):
-            pyxel.text(instructions_x + i * 6, button_y + 60, char, COLOR_WHITE)
+        draw_large_text_centered(0, button_y + 60, instructions, COLOR_WHITE, SCREEN_WIDTH)
     
     def _draw_game(self):
         """Desenha o jogo."""
@@ -95,9 +94,7 @@ class App:
         
         # Texto de pausa
         pause_text = "PAUSA"
-        pause_x = SCREEN_WIDTH // 2 - len(pause_text) * 6 // 2
-        for i, char in enumerate(pause_text):
-            pyxel.text(pause_x + i * 6, SCREEN_HEIGHT // 2 - 20, char, COLOR_WHITE)
+        draw_large_text_centered(0, SCREEN_HEIGHT // 2 - 20, pause_text, COLOR_WHITE, SCREEN_WIDTH)
         
         # Botão continuar
         button_x = SCREEN_WIDTH // 2 - 50
@@ -105,18 +102,14 @@ class App:
         pyxel.rect(button_x, button_y, 100, 25, COLOR_GREEN)
         
         continue_text = "Continuar"
-        continue_x = SCREEN_WIDTH // 2 - len(continue_text) * 6 // 2
-        for i, char in enumerate(continue_text):
-            pyxel.text(continue_x + i * 6, button_y + 8, char, COLOR_WHITE)
+        draw_large_text_centered(0, button_y + 8, continue_text, COLOR_WHITE, SCREEN_WIDTH)
         
         # Botão sair
         button_y2 = SCREEN_HEIGHT // 2 + 30
         pyxel.rect(button_x, button_y2, 100, 25, COLOR_RED)
         
         quit_text = "Sair"
-        quit_x = SCREEN_WIDTH // 2 - len(quit_text) * 6 // 2
-        for i, char in enumerate(quit_text):
-            pyxel.text(quit_x + i * 6, button_y2 + 8, char, COLOR_WHITE)
+        draw_large_text_centered(0, button_y2 + 8, quit_text, COLOR_WHITE, SCREEN_WIDTH)
     
     def _draw_game_over(self):
         """Desenha a tela de game over."""
@@ -124,9 +117,8 @@ class App:
         
         # Título
         game_over_text = "GAME OVER"
-        game_over_x = SCREEN_WIDTH // 2 - len(game_over_text) * 6 // 2
-        for i, char in enumerate(game_over_text):
-            pyxel.text(game_over_x + i * 6, SCREEN_HEIGHT // 2 - 50, char, COLOR_RED)
+        text_renderer.draw_centered(0, SCREEN_HEIGHT // 2 - 50, game_over_text, COLOR_RED, SCREEN_WIDTH,
+                                    font=TITLE_FONT)
         
         # Botão recomeçar
         button_x = SCREEN_WIDTH // 2 - 100
@@ -134,18 +126,14 @@ class App:
         pyxel.rect(button_x, button_y, 200, 40, COLOR_GREEN)
         
         restart_text = "Recomeçar"
-        restart_x = SCREEN_WIDTH // 2 - len(restart_text) * 6 // 2
-        for i, char in enumerate(restart_text):
-            pyxel.text(restart_x + i * 6, button_y + 15, char, COLOR_WHITE)
+        draw_large_text_centered(0, button_y + 15, restart_text, COLOR_WHITE, SCREEN_WIDTH)
         
         # Botão sair
         button_y2 = SCREEN_HEIGHT // 2 + 30
         pyxel.rect(button_x, button_y2, 200, 40, COLOR_RED)
         
         quit_text = "Sair"
-        quit_x = SCREEN_WIDTH // 2 - len(quit_text) * 6 // 2
-        for i, char in enumerate(quit_text):
-            pyxel.text(quit_x + i * 6, button_y2 + 15, char, COLOR_WHITE)
+        draw_large_text_centered(0, button_y2 + 15, quit_text, COLOR_WHITE, SCREEN_WIDTH)
 
 if __name__ == "__main__":
     App() 
\ No newline at end of file
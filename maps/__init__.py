@@ -3,5 +3,23 @@ Maps module - Geradores de mapas
 """
 
 from .map_generator import HauntedMansionGenerator, create_mansion_generator
+from .spatial_index import RoomSpatialIndex
+from .disjoint_set import DisjointSet
+from .mansion_cache import MansionCache
+from .prefetcher import MansionPrefetcher
+from .chunk_manager import ChunkManager
+from .packed_map import PackedMap
+from .walkable_index import WalkableIndex
+from .room_graph import RoomGraph
+from .pathfinding import HierarchicalPathfinder
+from .connectivity import label_components, is_connected
+from .candidates import CandidateGenerator
+from .floors import FloorStack
+from .prefabs import PrefabLibrary, load_library
+from .fov import FieldOfView
 
-__all__ = ['HauntedMansionGenerator', 'create_mansion_generator'] 
\ No newline at end of file
+__all__ = ['HauntedMansionGenerator', 'create_mansion_generator', 'RoomSpatialIndex', 'DisjointSet',
+           'MansionCache', 'MansionPrefetcher', 'ChunkManager',
+           'PackedMap', 'WalkableIndex', 'RoomGraph', 'HierarchicalPathfinder', 'label_components', 'is_connected',
+           'CandidateGenerator', 'FloorStack',
+           'PrefabLibrary', 'load_library', 'FieldOfView'] 
\ No newline at end of file
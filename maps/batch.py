@@ -0,0 +1,191 @@
+"""
+Geração de mansões em lote
+==========================
+
+Gera mansões em paralelo (um processo por núcleo) sobre um intervalo de
+sementes e uma grade de parâmetros, gravando cada layout em disco e uma
+linha de estatísticas por layout em stats.jsonl.
+
+Os arquivos de layout usam o mesmo formato e a mesma chave do MansionCache,
+então o diretório de saída pode ser usado como cache_dir do jogo. Os
+padrões da linha de comando são os parâmetros do jogo (MANSION_PARAMS) e
+os parâmetros com o valor padrão do gerador ficam fora da chave, como
+nas chamadas do jogo.
+
+Uso:
+    python -m maps.batch --seeds 0:1000 --size 60x60,120x120 --num-rooms 8,16 --out layouts
+    python -m maps.batch --seeds 0:200 --placement random,bsp --prefabs builtin,none --decay 0,2
+"""
+
+import argparse
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from .map_generator import CELL_CORRIDOR, CELL_FLOOR, HauntedMansionGenerator
+from .mansion_cache import CACHE_FILE_EXTENSION, CachedMansion, MansionCache
+from .packed_map import PACKED_FILE_EXTENSION, save_packed_map
+
+# Valores padrão de generate_mansion: omitidos dos parâmetros (e da chave do cache)
+GENERATOR_DEFAULTS = {"placement": "random", "prefabs": None, "decay": 0}
+
+
+def compute_layout_stats(generator: HauntedMansionGenerator, requested_rooms: int,
+                         corridor_width: int) -> Dict[str, float]:
+    """Calcula as estatísticas do último layout gerado pelo gerador."""
+    floor_cells = 0
+    corridor_cells = 0
+    for row in generator.get_map_data():
+        floor_cells += row.count(CELL_FLOOR)
+        corridor_cells += row.count(CELL_CORRIDOR)
+
+    total_cells = generator.map_width * generator.map_height
+    return {
+        "rooms_requested": requested_rooms,
+        "rooms_placed": len(generator.rooms),
+        "floor_ratio": (floor_cells + corridor_cells) / total_cells if total_cells else 0.0,
+        "corridor_cells": corridor_cells,
+        "corridor_length": corridor_cells / corridor_width if corridor_width else 0,
+        "attempts": generator.placement_attempts,
+        "components": generator.component_count,
+    }
+
+
+def generate_layout(task: Tuple[int, int, int, dict, Optional[str], bool]) -> Dict:
+    """
+    Gera um layout no processo worker e, se houver diretório, grava o mapa.
+
+    Args:
+        task: (largura, altura, semente, parâmetros, diretório de saída, formato compacto)
+
+    Returns:
+        Dicionário de estatísticas do layout
+    """
+    map_width, map_height, seed, params, out_dir, packed = task
+    generator = HauntedMansionGenerator(map_width, map_height)
+
+    start = time.perf_counter()
+    generator.generate_mansion(seed=seed, **params)
+    elapsed = time.perf_counter() - start
+
+    key = MansionCache.make_key(map_width, map_height, seed, **params)
+    if out_dir and packed:
+        save_packed_map(os.path.join(out_dir, key + PACKED_FILE_EXTENSION), generator.get_map_data())
+    elif out_dir:
+        entry = CachedMansion(generator.get_map_data(), generator.rooms, seed,
+                              generator.corridor_rects)
+        with open(os.path.join(out_dir, key + CACHE_FILE_EXTENSION), "wb") as file:
+            file.write(entry.to_bytes())
+
+    stats = {
+        "key": key,
+        "seed": seed,
+        "width": map_width,
+        "height": map_height,
+        "params": params,
+        "generation_ms": elapsed * 1000,
+    }
+    stats.update(compute_layout_stats(generator, params.get("num_rooms", 8),
+                                      params.get("corridor_width", 3)))
+    return stats
+
+
+def iter_tasks(seeds: range, sizes: List[Tuple[int, int]], param_grid: Dict[str, List],
+               out_dir: Optional[str], packed: bool = False) -> Iterator[Tuple]:
+    """Produz uma tarefa por combinação de tamanho, parâmetros e semente."""
+    names = sorted(param_grid)
+    combinations = [{name: value for name, value in zip(names, values)
+                     if name not in GENERATOR_DEFAULTS or GENERATOR_DEFAULTS[name] != value}
+                    for values in itertools.product(*(param_grid[name] for name in names))]
+    for (map_width, map_height), params in itertools.product(sizes, combinations):
+        for seed in seeds:
+            yield (map_width, map_height, seed, params, out_dir, packed)
+
+
+def run_batch(seeds: range, sizes: List[Tuple[int, int]], param_grid: Dict[str, List],
+              out_dir: Optional[str], workers: Optional[int] = None,
+              chunksize: int = 16, packed: bool = False,
+              worker: Callable[[Tuple], Dict] = generate_layout) -> Iterator[Dict]:
+    """
+    Gera todas as combinações em um pool de processos, produzindo as
+    estatísticas na ordem das tarefas à medida que ficam prontas.
+    """
+    tasks = iter_tasks(seeds, sizes, param_grid, out_dir, packed)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(worker, tasks, chunksize=chunksize)
+
+
+def _parse_int_list(text: str) -> List[int]:
+    return [int(value) for value in text.split(",")]
+
+
+def _parse_sizes(text: str) -> List[Tuple[int, int]]:
+    sizes = []
+    for size in text.split(","):
+        width, height = size.lower().split("x")
+        sizes.append((int(width), int(height)))
+    return sizes
+
+
+def _parse_prefabs(text: str) -> List[Optional[str]]:
+    return [None if value == "none" else value for value in text.split(",")]
+
+
+def _parse_seeds(text: str) -> range:
+    start, stop = text.split(":")
+    return range(int(start), int(stop))
+
+
+def main(argv: Optional[List[str]] = None):
+    """Ponto de entrada da linha de comando."""
+    parser = argparse.ArgumentParser(description="Gera mansões em lote e registra estatísticas")
+    parser.add_argument("--seeds", type=_parse_seeds, default=range(0, 100),
+                        help="intervalo de sementes início:fim (padrão 0:100)")
+    parser.add_argument("--size", type=_parse_sizes, default=[(60, 60)],
+                        help="tamanhos LxA separados por vírgula (padrão 60x60)")
+    parser.add_argument("--num-rooms", type=_parse_int_list, default=[8])
+    parser.add_argument("--max-connection-distance", type=_parse_int_list, default=[15])
+    parser.add_argument("--corridor-width", type=_parse_int_list, default=[3])
+    parser.add_argument("--placement", type=lambda text: text.split(","), default=["random"],
+                        help="modos de posicionamento separados por vírgula (random, bsp)")
+    parser.add_argument("--prefabs", type=_parse_prefabs, default=["builtin"],
+                        help="bibliotecas de prefabs separadas por vírgula (builtin, caminho "
+                             "ou none; padrão builtin, como no jogo)")
+    parser.add_argument("--decay", type=_parse_int_list, default=[0],
+                        help="iterações do desgaste por autômato celular")
+    parser.add_argument("--out", default="layouts", help="diretório de saída")
+    parser.add_argument("--no-maps", action="store_true", help="grava só as estatísticas")
+    parser.add_argument("--packed", action="store_true",
+                        help="grava os mapas no formato compacto (.cmap, para mmap)")
+    parser.add_argument("--workers", type=int, default=None, help="processos (padrão: núcleos)")
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.out, exist_ok=True)
+    param_grid = {
+        "num_rooms": args.num_rooms,
+        "max_connection_distance": args.max_connection_distance,
+        "corridor_width": args.corridor_width,
+        "placement": args.placement,
+        "prefabs": args.prefabs,
+        "decay": args.decay,
+    }
+
+    start = time.perf_counter()
+    count = 0
+    with open(os.path.join(args.out, "stats.jsonl"), "w") as stats_file:
+        for stats in run_batch(args.seeds, args.size, param_grid,
+                               None if args.no_maps else args.out, args.workers,
+                               packed=args.packed):
+            stats_file.write(json.dumps(stats) + "\n")
+            count += 1
+
+    elapsed = time.perf_counter() - start
+    print(f"{count} layouts em {elapsed:.2f}s ({count / elapsed:.1f} layouts/s)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
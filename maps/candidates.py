@@ -0,0 +1,248 @@
+"""
+Melhor de N mansões
+===================
+
+Gera N mansões candidatas ao mesmo tempo (uma por núcleo), avalia cada uma
+com uma função de fitness plugável e entrega a melhor. Com núcleos
+suficientes, o tempo total fica perto do de uma única geração.
+
+A função de fitness roda no processo worker, logo precisa ser uma função
+de módulo (serializável por referência). Ela recebe o gerador com a mansão
+candidata e devolve um número (maior = melhor); fitness_metrics calcula as
+métricas usadas pela função padrão e pode ser reaproveitada.
+
+A vencedora fica no cache sob a chave da escolha (semente base, número de
+candidatas, fitness e parâmetros), então repetir uma semente base não gera
+nada; prefetch adianta as candidatas do próximo recomeço em segundo plano.
+"""
+
+import random
+import statistics
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .map_generator import HauntedMansionGenerator, derive_seed
+from .mansion_cache import CachedMansion, MansionCache
+
+# Pesos das métricas na fitness padrão
+FITNESS_WEIGHTS = {
+    "connectivity": 4.0,
+    "loops": 1.0,
+    "room_size_spread": 1.0,
+    "spawn_distance": 1.0,
+}
+
+FitnessFunction = Callable[[HauntedMansionGenerator], float]
+
+
+def fitness_metrics(generator: HauntedMansionGenerator) -> Dict[str, float]:
+    """
+    Métricas da mansão atual do gerador, normalizadas para ~[0, 1]:
+
+    - connectivity: 1 / regiões caminháveis antes do reparo
+    - loops: ciclos do grafo de salas (arestas - salas + componentes),
+      relativos a metade do número de salas
+    - room_size_spread: coeficiente de variação das áreas das salas
+    - spawn_distance: distância da sala de spawn à sala mais distante,
+      relativa ao perímetro do mapa
+    """
+    rooms = generator.rooms
+    graph = generator.room_graph
+
+    components = len(_room_components(graph))
+    loops = len(graph.edges) - len(rooms) + components
+    areas = [room.width * room.height for room in rooms]
+    spread = statistics.pstdev(areas) / statistics.mean(areas) if len(areas) > 1 else 0.0
+
+    # Mesmo sorteio de spawn que o jogo faz ao carregar a mansão (rng da semente)
+    spawn_distance = 0.0
+    if rooms:
+        spawn = generator.find_valid_spawn_position(random.Random(generator.seed))
+        spawn_room = generator.room_at(*spawn)
+        if spawn_room is not None:
+            reachable = [d for d in graph.distances_from(spawn_room) if d != float("inf")]
+            spawn_distance = max(reachable) / (generator.map_width + generator.map_height)
+
+    return {
+        "connectivity": 1.0 / max(1, generator.component_count),
+        "loops": min(1.0, max(0, loops) / max(1, len(rooms) // 2)),
+        "room_size_spread": min(1.0, spread),
+        "spawn_distance": min(1.0, spawn_distance),
+    }
+
+
+def _room_components(graph) -> List[List[int]]:
+    """Salas agrupadas por componente do grafo de salas."""
+    seen = set()
+    components = []
+    for start in range(graph.room_count):
+        if start in seen:
+            continue
+        seen.add(start)
+        stack = [start]
+        component = []
+        while stack:
+            room = stack.pop()
+            component.append(room)
+            for neighbour, _, _ in graph.neighbours(room):
+                if neighbour not in seen:
+                    seen.add(neighbour)
+                    stack.append(neighbour)
+        components.append(component)
+    return components
+
+
+def default_fitness(generator: HauntedMansionGenerator) -> float:
+    """Soma ponderada (FITNESS_WEIGHTS) das métricas de fitness_metrics."""
+    metrics = fitness_metrics(generator)
+    return sum(FITNESS_WEIGHTS[name] * value for name, value in metrics.items())
+
+
+def _generate_candidate(map_width: int, map_height: int, seed: int, params: dict,
+                        fitness: FitnessFunction) -> Tuple[float, bytes]:
+    """Gera e avalia uma candidata no processo worker."""
+    generator = HauntedMansionGenerator(map_width, map_height)
+    generator.generate_mansion(seed=seed, **params)
+    score = fitness(generator)
+    entry = CachedMansion(generator.get_map_data(), generator.rooms, seed, generator.corridor_rects)
+    return score, entry.to_bytes()
+
+
+class CandidateGenerator:
+    """Gera N candidatas em paralelo e carrega a de maior fitness."""
+
+    def __init__(self, map_width: int, map_height: int, cache: MansionCache,
+                 candidates: int = 4, fitness: FitnessFunction = default_fitness,
+                 workers: Optional[int] = None, **params):
+        """
+        Inicializa o gerador de candidatas.
+
+        Args:
+            map_width: Largura do mapa
+            map_height: Altura do mapa
+            cache: Cache onde a mansão escolhida é guardada
+            candidates: Número de candidatas por mansão
+            fitness: Função de módulo gerador -> pontuação (maior = melhor)
+            workers: Processos (None = número de núcleos)
+            **params: Parâmetros de generate_mansion
+        """
+        self.map_width = map_width
+        self.map_height = map_height
+        self.cache = cache
+        self.candidates = candidates
+        self.fitness = fitness
+        self.workers = workers
+        self.params = params
+
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self.pending_seed: Optional[int] = None  # Semente base das candidatas adiantadas
+        self.pending: List[Future] = []
+        self.stats = {"last_ms": 0.0, "last_seed": None, "last_score": None, "scores": [],
+                      "cached": False}
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        """Cria o pool na primeira vez (None se não for possível)."""
+        if self.executor is None:
+            try:
+                self.executor = ProcessPoolExecutor(max_workers=self.workers)
+            except (OSError, NotImplementedError):
+                return None
+        return self.executor
+
+    def candidate_seeds(self, base_seed: int) -> List[int]:
+        """Sementes das candidatas derivadas da semente base."""
+        return [derive_seed(base_seed, "candidate", i) for i in range(self.candidates)]
+
+    def winner_key(self, base_seed: int) -> str:
+        """Chave do cache da vencedora da semente base (depende das candidatas e da fitness)."""
+        fitness = f"{self.fitness.__module__}.{self.fitness.__qualname__}"
+        return MansionCache.make_key(self.map_width, self.map_height, base_seed,
+                                     candidates=self.candidates, fitness=fitness, **self.params)
+
+    def _submit(self, base_seed: int) -> List[Future]:
+        """Envia as candidatas da semente base ao pool ([] se não houver pool)."""
+        executor = self._get_executor()
+        if executor is None:
+            return []
+        args = (self.map_width, self.map_height)
+        return [executor.submit(_generate_candidate, *args, seed, self.params, self.fitness)
+                for seed in self.candidate_seeds(base_seed)]
+
+    def _cancel_pending(self):
+        for future in self.pending:
+            future.cancel()
+        self.pending = []
+        self.pending_seed = None
+
+    def prefetch(self, base_seed: int):
+        """Começa a gerar em segundo plano as candidatas da semente base do próximo generate."""
+        self._cancel_pending()
+        self.pending_seed = base_seed
+        # Vencedora já escolhida: não precisa de worker
+        if self.winner_key(base_seed) not in self.cache.entries:
+            self.pending = self._submit(base_seed)
+
+    def generate(self, generator: HauntedMansionGenerator, base_seed: int) -> List[List[int]]:
+        """
+        Carrega no gerador a melhor candidata da semente base: do cache se a
+        escolha já foi feita, senão gerando as candidatas (ou usando as
+        adiantadas por prefetch).
+
+        Returns:
+            Lista 2D representando o mapa da mansão escolhida
+        """
+        start = time.perf_counter()
+        key = self.winner_key(base_seed)
+        entry = self.cache.get(key)
+        score = None
+        scores = []
+
+        if entry is None:
+            if base_seed == self.pending_seed and self.pending:
+                futures = self.pending
+                self.pending = []
+            else:
+                self._cancel_pending()
+                futures = self._submit(base_seed) if self.candidates > 1 else []
+            if futures:
+                results = [future.result() for future in futures]
+            else:
+                args = (self.map_width, self.map_height)
+                results = [_generate_candidate(*args, seed, self.params, self.fitness)
+                           for seed in self.candidate_seeds(base_seed)]
+
+            # Maior pontuação; empate fica com a primeira candidata
+            best = max(range(len(results)), key=lambda i: (results[i][0], -i))
+            score, data = results[best]
+            scores = [result[0] for result in results]
+            entry = CachedMansion.from_bytes(data)
+            self.cache.put(key, entry)
+        else:
+            self._cancel_pending()
+        self.pending_seed = None
+
+        generator.load_mansion(entry.map_data, list(entry.rooms), entry.seed, entry.corridors)
+        self.stats = {
+            "last_ms": (time.perf_counter() - start) * 1000,
+            "last_seed": entry.seed,
+            "last_score": score,
+            "scores": scores,
+            "cached": score is None,
+        }
+        return generator.get_map_data()
+
+    def get_stats(self) -> Dict:
+        """
+        Retorna o tempo, a semente e as pontuações da última escolha (sem
+        pontuações se a vencedora veio do cache).
+        """
+        return dict(self.stats)
+
+    def shutdown(self):
+        """Encerra os processos worker."""
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+        self.pending = []
+        self.pending_seed = None
@@ -0,0 +1,162 @@
+"""
+Mansão infinita em chunks
+=========================
+
+O mundo é dividido em chunks quadrados gerados sob demanda pelo
+HauntedMansionGenerator, cada um com semente derivada da semente do mundo
+e da sua posição. Só os chunks perto do jogador ficam em memória; os
+distantes são descartados (e gravados em disco, se houver cache_dir),
+então a memória fica limitada não importa o quanto o jogador explore.
+"""
+
+import os
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from .map_generator import CELL_WALL, HauntedMansionGenerator
+from .mansion_cache import CACHE_FILE_EXTENSION, CachedMansion, MansionCache
+
+
+class ChunkManager:
+    """Carrega, gera e descarta chunks de uma mansão infinita."""
+
+    def __init__(self, world_seed: int, chunk_size: int = 64, keep_radius: int = 3,
+                 max_loaded_chunks: int = 64, cache_dir: Optional[str] = None, **params):
+        """
+        Inicializa o gerenciador.
+
+        Args:
+            world_seed: Semente do mundo
+            chunk_size: Lado de cada chunk em células
+            keep_radius: Chunks a até esta distância (em chunks) do foco ficam carregados
+            max_loaded_chunks: Máximo de chunks em memória
+            cache_dir: Diretório onde chunks descartados são gravados (None desativa)
+            **params: Parâmetros de generate_chunk (num_rooms, corridor_width, ...)
+        """
+        self.world_seed = world_seed
+        self.chunk_size = chunk_size
+        self.keep_radius = keep_radius
+        self.max_loaded_chunks = max_loaded_chunks
+        self.params = params
+
+        self.generator = HauntedMansionGenerator(chunk_size, chunk_size)
+        self.chunks: "OrderedDict[Tuple[int, int], CachedMansion]" = OrderedDict()
+        self.focus = (0, 0)
+
+        self.cache_dir = None
+        if cache_dir:
+            world_key = MansionCache.make_key(chunk_size, chunk_size, world_seed, chunked=True, **params)
+            self.cache_dir = os.path.join(cache_dir, "world_" + world_key[:16])
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+        self.stats = {"generated": 0, "loaded_from_disk": 0, "evicted": 0}
+
+    def chunk_coords(self, x: int, y: int) -> Tuple[int, int]:
+        """Converte coordenadas do mundo no chunk que as contém."""
+        return (x // self.chunk_size, y // self.chunk_size)
+
+    def _chunk_path(self, chunk_x: int, chunk_y: int) -> str:
+        return os.path.join(self.cache_dir, f"chunk_{chunk_x}_{chunk_y}{CACHE_FILE_EXTENSION}")
+
+    def get_chunk(self, chunk_x: int, chunk_y: int) -> CachedMansion:
+        """Retorna o chunk, carregando do disco ou gerando se necessário."""
+        key = (chunk_x, chunk_y)
+        chunk = self.chunks.get(key)
+        if chunk is not None:
+            self.chunks.move_to_end(key)
+            return chunk
+
+        if self.cache_dir and os.path.exists(self._chunk_path(chunk_x, chunk_y)):
+            with open(self._chunk_path(chunk_x, chunk_y), "rb") as file:
+                chunk = CachedMansion.from_bytes(file.read())
+            self.stats["loaded_from_disk"] += 1
+        else:
+            map_data = self.generator.generate_chunk(chunk_x, chunk_y, self.world_seed, **self.params)
+            chunk = CachedMansion(map_data, list(self.generator.rooms), self.generator.seed,
+                                  list(self.generator.corridor_rects))
+            self.stats["generated"] += 1
+
+        self.chunks[key] = chunk
+        self._evict()
+        return chunk
+
+    def _evict(self):
+        """Descarta os chunks mais distantes do foco além do limite de memória."""
+        focus_x, focus_y = self.focus
+        while len(self.chunks) > self.max_loaded_chunks:
+            far_key = max(self.chunks, key=lambda k: max(abs(k[0] - focus_x), abs(k[1] - focus_y)))
+            self._drop(far_key)
+
+    def _drop(self, key: Tuple[int, int]):
+        """Remove um chunk da memória, gravando-o em disco se houver cache."""
+        chunk = self.chunks.pop(key)
+        if self.cache_dir and not os.path.exists(self._chunk_path(*key)):
+            with open(self._chunk_path(*key), "wb") as file:
+                file.write(chunk.to_bytes())
+        self.stats["evicted"] += 1
+
+    def update_focus(self, x: int, y: int):
+        """Carrega os chunks ao redor da posição e descarta os que ficaram longe."""
+        focus_x, focus_y = self.chunk_coords(x, y)
+        self.focus = (focus_x, focus_y)
+
+        for key in [k for k in self.chunks
+                    if max(abs(k[0] - focus_x), abs(k[1] - focus_y)) > self.keep_radius]:
+            self._drop(key)
+
+        # Pré-carrega a vizinhança imediata do jogador
+        for chunk_y in range(focus_y - 1, focus_y + 2):
+            for chunk_x in range(focus_x - 1, focus_x + 2):
+                self.get_chunk(chunk_x, chunk_y)
+
+    def fits_view(self, view_width: int, view_height: int) -> bool:
+        """
+        Verifica se uma janela centrada no foco (em células) só mostra chunks
+        que ficam carregados: todos a até keep_radius do foco e no máximo
+        max_loaded_chunks (senão cada frame descartaria e regeraria chunks visíveis).
+        """
+        size = self.chunk_size
+        count = 1
+        for view in (view_width, view_height):
+            # Chunks antes e depois do chunk do foco, no pior alinhamento
+            before = -(-(view // 2) // size)
+            after = (size - 1 + view - 1 - view // 2) // size
+            if max(before, after) > self.keep_radius:
+                return False
+            count *= before + after + 1
+        return count <= self.max_loaded_chunks
+
+    def get_cell(self, x: int, y: int) -> int:
+        """Retorna a célula do mundo na posição."""
+        chunk_x, chunk_y = self.chunk_coords(x, y)
+        chunk = self.get_chunk(chunk_x, chunk_y)
+        return chunk.map_data[y - chunk_y * self.chunk_size][x - chunk_x * self.chunk_size]
+
+    def is_wall(self, x: int, y: int) -> bool:
+        """Verifica se a posição do mundo é uma parede."""
+        return self.get_cell(x, y) == CELL_WALL
+
+    def find_valid_spawn_position(self) -> Tuple[int, int]:
+        """Encontra uma posição válida para spawn no chunk de origem."""
+        chunk = self.get_chunk(0, 0)
+        if chunk.rooms:
+            return chunk.rooms[0].get_center()
+        for y, row in enumerate(chunk.map_data):
+            for x, cell in enumerate(row):
+                if cell != CELL_WALL:
+                    return (x, y)
+        return (self.chunk_size // 2, self.chunk_size // 2)
+
+    def visible_chunks(self, x: int, y: int, width: int, height: int) -> List[Tuple[int, int]]:
+        """Lista os chunks que cobrem o retângulo do mundo [x, x+width) x [y, y+height)."""
+        first_x, first_y = self.chunk_coords(x, y)
+        last_x, last_y = self.chunk_coords(x + width - 1, y + height - 1)
+        return [(chunk_x, chunk_y)
+                for chunk_y in range(first_y, last_y + 1)
+                for chunk_x in range(first_x, last_x + 1)]
+
+    def get_stats(self) -> Dict[str, int]:
+        """Retorna contadores de chunks gerados, lidos do disco e descartados."""
+        stats = dict(self.stats)
+        stats["loaded"] = len(self.chunks)
+        return stats
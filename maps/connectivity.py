@@ -0,0 +1,179 @@
+"""
+Componentes conectados do mapa
+==============================
+
+Rotula as regiões caminháveis (conectividade 4) do mapa. Com numpy, a
+rotulação é vetorizada: cada linha é quebrada em trechos contínuos de
+células caminháveis, trechos que se sobrepõem em linhas vizinhas são
+ligados e os rótulos são propagados com "pointer jumping". Sem numpy,
+usa flood fill em Python.
+"""
+
+from collections import deque
+from typing import List, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .map_generator import CELL_WALL
+
+
+def label_components(map_data) -> Tuple[object, List[int]]:
+    """
+    Rotula as regiões caminháveis do mapa.
+
+    Args:
+        map_data: Lista 2D, ndarray ou PackedMap
+
+    Returns:
+        (rótulos, tamanhos): rótulos tem a forma do mapa, com 0 nas paredes e
+        1..k nas componentes (ndarray int32 com numpy, lista 2D sem);
+        tamanhos[i] é o número de células da componente i (tamanhos[0] = 0)
+    """
+    if np is not None:
+        return _label_numpy(_as_grid(map_data))
+    return _label_python(map_data)
+
+
+def count_components(map_data) -> int:
+    """Retorna quantas regiões caminháveis separadas o mapa tem."""
+    return len(label_components(map_data)[1]) - 1
+
+
+def is_connected(map_data) -> bool:
+    """Verifica se todas as células caminháveis formam uma única região."""
+    return count_components(map_data) <= 1
+
+
+def representative_cells(labels, component_count: int) -> List[Tuple[int, int]]:
+    """
+    Retorna uma célula (x, y) de cada componente.
+
+    Args:
+        labels: Rótulos devolvidos por label_components
+        component_count: Número de componentes (len(tamanhos) - 1)
+
+    Returns:
+        Lista em que o item i - 1 é uma célula da componente i
+    """
+    if np is not None and isinstance(labels, np.ndarray):
+        width = labels.shape[1]
+        flat = labels.reshape(-1)
+        cells = np.flatnonzero(flat)
+        chosen = np.zeros(component_count + 1, dtype=np.int64)
+        chosen[flat[cells]] = cells
+        return [(int(cell) % width, int(cell) // width) for cell in chosen[1:]]
+
+    found = {}
+    for y, row in enumerate(labels):
+        for x, label in enumerate(row):
+            if label and label not in found:
+                found[label] = (x, y)
+    return [found[label] for label in range(1, component_count + 1)]
+
+
+def _as_grid(map_data):
+    """Converte o mapa em ndarray uint8 (altura x largura)."""
+    if hasattr(map_data, "to_grid"):
+        return map_data.to_grid()
+    grid = np.asarray(map_data, dtype=np.uint8)
+    return grid.reshape(len(map_data), -1)
+
+
+def _label_numpy(grid) -> Tuple[object, List[int]]:
+    """Rotulação vetorizada por trechos de linha."""
+    height, width = grid.shape
+    stride = width + 1
+
+    # Coluna de parede extra à direita: nenhum trecho atravessa o fim da linha
+    walkable = np.zeros((height, stride), dtype=bool)
+    walkable[:, :width] = grid != CELL_WALL
+    flat = walkable.reshape(-1)
+
+    # Transições parede/caminhável alternam início e fim de trecho
+    transitions = np.flatnonzero(flat[1:] != flat[:-1]) + 1
+    if flat[0]:
+        transitions = np.concatenate(([0], transitions))
+    starts = transitions[0::2]
+    ends = transitions[1::2]
+    run_count = len(starts)
+    if run_count == 0:
+        return np.zeros((height, width), dtype=np.int32), [0]
+
+    # Trechos da linha seguinte que se sobrepõem a cada trecho (intervalo [lo, hi))
+    rows = starts // stride
+    next_row_start = (rows + 1) * stride + (starts - rows * stride)
+    next_row_end = (rows + 1) * stride + (ends - rows * stride)
+    lo = np.searchsorted(ends, next_row_start, side="right")
+    hi = np.searchsorted(starts, next_row_end, side="left")
+    counts = np.maximum(hi - lo, 0)
+
+    total = int(counts.sum())
+    first = np.repeat(np.arange(run_count), counts)
+    offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    second = np.repeat(lo, counts) + offsets
+
+    # Union-find vetorizado: liga raízes ao menor rótulo e comprime os caminhos
+    parent = np.arange(run_count)
+    while total:
+        root_a = parent[first]
+        root_b = parent[second]
+        differ = root_a != root_b
+        if not differ.any():
+            break
+        lowest = np.minimum(root_a[differ], root_b[differ])
+        np.minimum.at(parent, root_a[differ], lowest)
+        np.minimum.at(parent, root_b[differ], lowest)
+        while True:
+            jumped = parent[parent]
+            if np.array_equal(jumped, parent):
+                break
+            parent = jumped
+
+    roots, run_labels = np.unique(parent, return_inverse=True)
+    run_labels = run_labels.astype(np.int32) + 1
+    lengths = ends - starts
+
+    sizes = np.zeros(len(roots) + 1, dtype=np.int64)
+    np.add.at(sizes, run_labels, lengths)
+
+    # Posições das células de cada trecho, sem varrer o mapa de novo
+    cell_count = int(lengths.sum())
+    run_offsets = np.repeat(np.cumsum(lengths) - lengths, lengths)
+    positions = np.repeat(starts, lengths) + (np.arange(cell_count) - run_offsets)
+
+    labels = np.zeros(height * stride, dtype=np.int32)
+    labels[positions] = np.repeat(run_labels, lengths)
+    return labels.reshape(height, stride)[:, :width], sizes.tolist()
+
+
+def _label_python(map_data) -> Tuple[List[List[int]], List[int]]:
+    """Rotulação por flood fill (sem numpy)."""
+    height = len(map_data)
+    width = len(map_data[0]) if height else 0
+    labels = [[0] * width for _ in range(height)]
+    sizes = [0]
+
+    for start_y in range(height):
+        row = map_data[start_y]
+        for start_x in range(width):
+            if row[start_x] == CELL_WALL or labels[start_y][start_x]:
+                continue
+
+            label = len(sizes)
+            size = 0
+            labels[start_y][start_x] = label
+            queue = deque([(start_x, start_y)])
+            while queue:
+                x, y = queue.popleft()
+                size += 1
+                for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+                    if (0 <= nx < width and 0 <= ny < height and not labels[ny][nx]
+                            and map_data[ny][nx] != CELL_WALL):
+                        labels[ny][nx] = label
+                        queue.append((nx, ny))
+            sizes.append(size)
+
+    return labels, sizes
@@ -0,0 +1,168 @@
+"""
+Desgaste da mansão
+==================
+
+Pós-processamento opcional por autômato celular: paredes desmoronam para
+dentro das salas e corredores ficam parcialmente obstruídos. Cada iteração
+conta os vizinhos caminháveis de todas as células com somas de fatias
+deslocadas (uma convolução 3x3 separável) e só os poucos candidatos
+sorteados são examinados individualmente, então o custo fica em poucas
+operações vetorizadas sobre o grid por iteração.
+
+A conectividade é preservada por construção: uma parede só desmorona se
+tocar (conectividade 4) uma célula caminhável, e uma célula de corredor
+só desaba se for um "ponto simples" (os vizinhos caminháveis continuam
+ligados pelo anel 3x3 sem ela). As remoções são feitas em quatro subcampos
+(paridade de x e y), para que duas células removidas juntas nunca sejam
+vizinhas. No fim, a contagem de componentes é conferida pela rotulação e,
+se tiver aumentado, os desabamentos são desfeitos.
+"""
+
+from functools import lru_cache
+from typing import Dict, Optional
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .connectivity import label_components
+from .map_generator import CELL_CORRIDOR, CELL_FLOOR, CELL_WALL
+
+# Chance por iteração de uma parede candidata desmoronar (vira chão)
+DECAY_CRUMBLE_CHANCE = 0.12
+
+# Chance por iteração de uma célula de corredor candidata desabar (vira parede)
+DECAY_COLLAPSE_CHANCE = 0.08
+
+# Vizinhos caminháveis (de 8) para uma parede ser candidata a desmoronar
+CRUMBLE_MIN_NEIGHBOURS = 3
+
+# Paredes vizinhas (de 8) para uma célula de corredor ser candidata a desabar
+COLLAPSE_MIN_WALLS = 3
+
+# Anel 3x3 em ordem circular: N, NE, E, SE, S, SW, W, NW (dy, dx); índices pares são ortogonais
+RING = ((-1, 0), (-1, 1), (0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1))
+ORTHOGONAL_MASK = 0b01010101
+
+
+@lru_cache(maxsize=None)
+def _simple_point_table():
+    """
+    Tabela (256 códigos do anel) dos pontos simples: células cuja remoção
+    não separa os vizinhos caminháveis. Células consecutivas do anel são
+    sempre 4-vizinhas, então os grupos ligados são os trechos contínuos de
+    bits; o ponto é simples se exatamente um trecho contém um vizinho ortogonal.
+    """
+    table = np.zeros(256, dtype=bool)
+    for code in range(256):
+        bits = [(code >> i) & 1 for i in range(8)]
+        if all(bits):
+            table[code] = True
+            continue
+        # Começa logo após uma célula vazia para não partir um trecho ao meio
+        start = bits.index(0) + 1
+        runs = 0
+        in_run = touches_orthogonal = False
+        for step in range(8):
+            i = (start + step) % 8
+            if bits[i]:
+                in_run = True
+                touches_orthogonal = touches_orthogonal or i % 2 == 0
+            elif in_run:
+                runs += touches_orthogonal
+                in_run = touches_orthogonal = False
+        runs += in_run and touches_orthogonal
+        table[code] = runs == 1
+    return table
+
+
+def _ring_codes(walkable, padded_cells, stride: int):
+    """Código de 8 bits dos vizinhos caminháveis de cada célula (índices no grid com borda)."""
+    codes = np.zeros(len(padded_cells), dtype=np.uint8)
+    for bit, (dy, dx) in enumerate(RING):
+        codes |= walkable[padded_cells + (dy * stride + dx)] << bit
+    return codes
+
+
+def decay_grid(grid, seed: int, iterations: int = 3,
+               crumble_chance: float = DECAY_CRUMBLE_CHANCE,
+               collapse_chance: float = DECAY_COLLAPSE_CHANCE,
+               components: Optional[int] = None) -> Dict[str, int]:
+    """
+    Aplica o desgaste ao grid (ndarray uint8, alterado no lugar).
+
+    Args:
+        grid: Mapa (altura x largura)
+        seed: Semente do sorteio
+        iterations: Iterações do autômato
+        crumble_chance: Chance de uma parede candidata desmoronar
+        collapse_chance: Chance de uma célula de corredor candidata desabar
+        components: Regiões caminháveis do grid antes do desgaste, se já
+            conhecidas (None rotula o grid para contar)
+
+    Returns:
+        Contadores (paredes desmoronadas, células desabadas e se os
+        desabamentos foram desfeitos pela verificação de conectividade) e,
+        em "crumbled_cells", os ids planos (y * largura + x) das paredes
+        desmoronadas na ordem em que caíram
+    """
+    if np is None:
+        raise ImportError("O desgaste da mansão requer o pacote numpy")
+
+    height, width = grid.shape
+    stride = width + 2
+    rng = np.random.default_rng(seed)
+    table = _simple_point_table()
+
+    if components is None:
+        components = len(label_components(grid)[1]) - 1
+
+    # Grid caminhável com uma borda de parede: vizinhos nunca saem do array
+    walkable = np.zeros((height + 2, stride), dtype=np.uint8)
+    inner = walkable[1:-1, 1:-1]
+    inner[...] = grid != CELL_WALL
+    flat_walkable = walkable.reshape(-1)
+    flat_grid = grid.reshape(-1)
+
+    crumbled_cells = []
+    collapsed_cells = []
+    for _ in range(iterations):
+        # Vizinhos caminháveis de cada célula (convolução 3x3 separável, sem o centro)
+        rows = walkable[:, :-2] + walkable[:, 1:-1] + walkable[:, 2:]
+        neighbours = rows[:-2] + rows[1:-1] + rows[2:] - inner
+
+        # Paredes desmoronam se tocarem o chão por um lado (nunca criam região isolada);
+        # a moldura do mapa fica intacta
+        candidates = np.flatnonzero((neighbours >= CRUMBLE_MIN_NEIGHBOURS) & (inner == 0))
+        chosen = candidates[rng.random(len(candidates)) < crumble_chance]
+        rows_, columns = np.divmod(chosen, width)
+        chosen = chosen[(rows_ > 0) & (rows_ < height - 1) & (columns > 0) & (columns < width - 1)]
+        padded = chosen + (chosen // width) * 2 + stride + 1
+        chosen = chosen[(_ring_codes(flat_walkable, padded, stride) & ORTHOGONAL_MASK) != 0]
+        flat_grid[chosen] = CELL_FLOOR
+        flat_walkable[chosen + (chosen // width) * 2 + stride + 1] = 1
+        crumbled_cells.append(chosen)
+
+        # Corredores desabam pelas bordas, um subcampo de paridade por vez
+        candidates = np.flatnonzero((grid == CELL_CORRIDOR) & (neighbours <= 8 - COLLAPSE_MIN_WALLS))
+        chosen = candidates[rng.random(len(candidates)) < collapse_chance]
+        parity = (chosen // width) % 2 * 2 + chosen % 2
+        for subfield in range(4):
+            cells = chosen[parity == subfield]
+            padded = cells + (cells // width) * 2 + stride + 1
+            simple = table[_ring_codes(flat_walkable, padded, stride)]
+            cells = cells[simple]
+            flat_grid[cells] = CELL_WALL
+            flat_walkable[padded[simple]] = 0
+            collapsed_cells.append(cells)
+
+    collapsed = np.concatenate(collapsed_cells) if collapsed_cells else np.zeros(0, dtype=np.int64)
+    reverted = False
+    if len(collapsed) and len(label_components(grid)[1]) - 1 > components:
+        flat_grid[collapsed] = CELL_CORRIDOR
+        reverted = True
+
+    crumbled = np.concatenate(crumbled_cells) if crumbled_cells else np.zeros(0, dtype=np.int64)
+    return {"crumbled": len(crumbled), "collapsed": 0 if reverted else len(collapsed),
+            "reverted": reverted, "crumbled_cells": crumbled}
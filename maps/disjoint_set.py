@@ -0,0 +1,52 @@
+"""
+Disjoint-set (union-find)
+=========================
+
+Estrutura usada para saber quais salas já estão no mesmo componente
+conectado durante a construção da árvore geradora mínima.
+"""
+
+from typing import List
+
+
+class DisjointSet:
+    """Union-find com compressão de caminho e união por tamanho."""
+
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+        self.size = [1] * size
+        self.components = size
+
+    def find(self, item: int) -> int:
+        """Retorna o representante do componente do item."""
+        root = item
+        while self.parent[root] != root:
+            root = self.parent[root]
+        # Compressão de caminho
+        while self.parent[item] != root:
+            self.parent[item], item = root, self.parent[item]
+        return root
+
+    def union(self, a: int, b: int) -> bool:
+        """Une os componentes de a e b. Retorna False se já estavam unidos."""
+        root_a = self.find(a)
+        root_b = self.find(b)
+        if root_a == root_b:
+            return False
+        if self.size[root_a] < self.size[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        self.size[root_a] += self.size[root_b]
+        self.components -= 1
+        return True
+
+    def connected(self, a: int, b: int) -> bool:
+        """Verifica se a e b estão no mesmo componente."""
+        return self.find(a) == self.find(b)
+
+    def groups(self) -> List[List[int]]:
+        """Retorna os itens agrupados por componente."""
+        groups = {}
+        for item in range(len(self.parent)):
+            groups.setdefault(self.find(item), []).append(item)
+        return list(groups.values())
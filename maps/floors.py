@@ -0,0 +1,177 @@
+"""
+Mansão de vários andares
+========================
+
+Uma pilha de andares (porões com índice negativo, térreo 0, sótãos
+positivos) ligados por escadas: a escada de subida de um andar leva à
+escada de descida do andar de cima. Cada andar tem semente derivada da
+semente da mansão e é gerado (ou lido do cache) quando o jogador entra
+em um andar vizinho a ele, para que a escada já encontre o destino
+pronto; em memória ficam apenas o andar atual e os vizinhos. Com um
+MansionPrefetcher, os vizinhos são gerados no processo worker dele.
+"""
+
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from .map_generator import CELL_STAIRS_DOWN, CELL_STAIRS_UP, HauntedMansionGenerator, derive_seed
+from .mansion_cache import CachedMansion, MansionCache
+from .prefetcher import MansionPrefetcher
+
+
+def find_stairs(map_data) -> Dict[str, Tuple[int, int]]:
+    """Posições das escadas ("up"/"down") de um mapa."""
+    stairs = {}
+    for y, row in enumerate(map_data):
+        for x, cell in enumerate(row):
+            if cell == CELL_STAIRS_UP:
+                stairs["up"] = (x, y)
+            elif cell == CELL_STAIRS_DOWN:
+                stairs["down"] = (x, y)
+    return stairs
+
+
+class FloorStack:
+    """Gera, carrega e descarta os andares de uma mansão sob demanda."""
+
+    def __init__(self, map_width: int, map_height: int, base_seed: int, cache: MansionCache,
+                 lowest: int = 0, highest: int = 0, prefetcher: Optional[MansionPrefetcher] = None,
+                 **params):
+        """
+        Inicializa a pilha de andares.
+
+        Args:
+            map_width: Largura de cada andar
+            map_height: Altura de cada andar
+            base_seed: Semente da mansão (usada como está no térreo)
+            cache: Cache onde os andares gerados são guardados
+            lowest: Índice do andar mais baixo (ex.: -1 = um porão)
+            highest: Índice do andar mais alto (ex.: 1 = um sótão)
+            prefetcher: Gera os andares vizinhos em segundo plano (deve usar o
+                mesmo cache e os mesmos parâmetros); None gera na hora
+            **params: Parâmetros de generate_mansion
+        """
+        if lowest > 0 or highest < 0:
+            raise ValueError("A pilha de andares precisa incluir o térreo (andar 0)")
+
+        self.map_width = map_width
+        self.map_height = map_height
+        self.base_seed = base_seed
+        self.cache = cache
+        self.lowest = lowest
+        self.highest = highest
+        self.params = params
+        self.prefetcher = prefetcher
+
+        self.generator = HauntedMansionGenerator(map_width, map_height)
+        self.floors: "OrderedDict[int, CachedMansion]" = OrderedDict()
+        self.stairs: Dict[int, Dict[str, Tuple[int, int]]] = {}
+        self.current: Optional[int] = None
+
+        self.stats = {"generated": 0, "loaded_from_cache": 0, "prefetched": 0, "evicted": 0}
+
+    def floor_seed(self, floor: int) -> int:
+        """Semente do andar (o térreo usa a semente da mansão)."""
+        return self.base_seed if floor == 0 else derive_seed(self.base_seed, "floor", floor)
+
+    def _floor_stairs(self, floor: int) -> List[bool]:
+        # As escadas dependem da posição na pilha: andares das pontas têm uma só
+        return [floor < self.highest, floor > self.lowest]
+
+    def _floor_key(self, floor: int) -> str:
+        return MansionCache.make_key(self.map_width, self.map_height, self.floor_seed(floor),
+                                     stairs=self._floor_stairs(floor), **self.params)
+
+    def get_floor(self, floor: int) -> CachedMansion:
+        """Retorna o andar, lendo do cache ou gerando se ainda não estiver em memória."""
+        if not self.lowest <= floor <= self.highest:
+            raise ValueError(f"Andar {floor} fora da pilha ({self.lowest}..{self.highest})")
+
+        entry = self.floors.get(floor)
+        if entry is not None:
+            return entry
+
+        key = self._floor_key(floor)
+        entry = self.cache.get(key)
+        if entry is not None:
+            self.stats["loaded_from_cache"] += 1
+        elif self.prefetcher is not None:
+            # Gerado no worker (espera se ainda estiver em andamento)
+            entry = self.prefetcher.collect(key)
+            if entry is not None:
+                self.stats["prefetched"] += 1
+
+        if entry is not None:
+            self.stairs[floor] = find_stairs(entry.map_data)
+        else:
+            generator = self.generator
+            up, down = self._floor_stairs(floor)
+            generator.generate_mansion(seed=self.floor_seed(floor), **self.params)
+            self.stairs[floor] = generator.place_stairs(up=up, down=down)
+            entry = CachedMansion(generator.get_map_data(), list(generator.rooms), generator.seed,
+                                  list(generator.corridor_rects))
+            self.cache.put(key, entry)
+            self.stats["generated"] += 1
+
+        self.floors[floor] = entry
+        return entry
+
+    def enter(self, generator: HauntedMansionGenerator, floor: int):
+        """
+        Torna o andar o atual: carrega-o no gerador do jogo, descarta da
+        memória os andares que deixaram de ser vizinhos e prepara os
+        vizinhos (no worker do prefetcher, se houver, senão na hora).
+
+        Returns:
+            Lista 2D representando o mapa do andar
+        """
+        entry = self.get_floor(floor)
+        generator.load_mansion(entry.map_data, list(entry.rooms), entry.seed, entry.corridors)
+        self.current = floor
+
+        for other in [f for f in self.floors if abs(f - floor) > 1]:
+            del self.floors[other]
+            del self.stairs[other]
+            self.stats["evicted"] += 1
+
+        neighbours = [f for f in (floor - 1, floor + 1)
+                      if self.lowest <= f <= self.highest and f not in self.floors]
+        if self.prefetcher is not None:
+            keys = set()
+            for neighbour in neighbours:
+                key = self.prefetcher.submit(self.floor_seed(neighbour),
+                                             stairs=self._floor_stairs(neighbour))
+                if key is None and self._floor_key(neighbour) not in self.cache.entries:
+                    self.get_floor(neighbour)  # Sem worker: gera na hora
+                keys.add(key)
+            # Gerações de andares que deixaram de ser vizinhos não são mais necessárias
+            self.prefetcher.discard(keep=keys)
+        else:
+            for neighbour in neighbours:
+                self.get_floor(neighbour)
+        return generator.get_map_data()
+
+    def stairs_destination(self, x: int, y: int) -> Optional[Tuple[int, Tuple[int, int]]]:
+        """
+        Destino da escada na posição do andar atual.
+
+        Returns:
+            (andar de destino, posição de chegada) ou None se não houver escada
+        """
+        stairs = self.stairs.get(self.current, {})
+        if stairs.get("up") == (x, y):
+            target, arrival = self.current + 1, "down"
+        elif stairs.get("down") == (x, y):
+            target, arrival = self.current - 1, "up"
+        else:
+            return None
+        self.get_floor(target)
+        position = self.stairs[target].get(arrival)
+        return (target, position) if position is not None else None
+
+    def get_stats(self) -> Dict[str, int]:
+        """Retorna contadores de andares gerados, lidos do cache e descartados."""
+        stats = dict(self.stats)
+        stats["loaded"] = len(self.floors)
+        stats["current"] = self.current
+        return stats
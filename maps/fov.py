@@ -0,0 +1,171 @@
+"""
+Campo de visão com shadowcasting recursivo
+==========================================
+
+Calcula as células vistas a partir da posição do jogador dividindo o
+círculo de visão em 8 octantes e varrendo cada um linha a linha; paredes
+abrem "sombras" (intervalos de inclinação) que as linhas seguintes pulam.
+
+O resultado fica em dois bitsets planos (id = y * largura + x): células
+visíveis agora e células já exploradas. O cálculo só é refeito quando a
+origem muda ou uma célula dentro do raio de visão é alterada, e as
+consultas são O(1).
+"""
+
+from typing import Iterator, List, Optional, Tuple
+
+from .map_generator import CELL_WALL
+
+# Raio de visão padrão (em células)
+FOV_RADIUS = 10
+
+# Multiplicadores (xx, xy, yx, yy) que levam o octante canônico a cada um dos 8
+_OCTANTS = (
+    (1, 0, 0, 1), (0, 1, 1, 0), (0, -1, 1, 0), (-1, 0, 0, 1),
+    (-1, 0, 0, -1), (0, -1, -1, 0), (0, 1, -1, 0), (1, 0, 0, -1),
+)
+
+
+class FieldOfView:
+    """Células visíveis e exploradas de um mapa a partir de uma origem."""
+
+    def __init__(self, map_data, radius: int = FOV_RADIUS):
+        """
+        Inicializa o campo de visão (nada visível até o primeiro update).
+
+        Args:
+            map_data: Dados do mapa (lista 2D, ndarray ou PackedMap); paredes bloqueiam a visão
+            radius: Raio de visão em células
+        """
+        self.map_data = map_data
+        self.map_height = len(map_data)
+        self.map_width = len(map_data[0]) if self.map_height else 0
+        self.radius = radius
+
+        size = (self.map_width * self.map_height + 7) // 8
+        self.visible = bytearray(size)
+        self.explored = bytearray(size)
+
+        # Ids das células visíveis agora e no cálculo anterior (para redesenhos incrementais)
+        self.visible_cells: List[int] = []
+        self.previous_cells: List[int] = []
+
+        self.origin: Optional[Tuple[int, int]] = None
+        self.dirty = True
+        self.revision = 0  # Cálculos feitos (muda sempre que o bitset visível muda)
+
+    def update(self, x: int, y: int) -> bool:
+        """
+        Recalcula a visão a partir de (x, y) se a origem ou o mapa mudaram.
+
+        Returns:
+            True se a visão foi recalculada
+        """
+        if not self.dirty and self.origin == (x, y):
+            return False
+        self.origin = (x, y)
+        self.dirty = False
+
+        # Apaga só os bits da visão anterior
+        visible = self.visible
+        for cell_id in self.visible_cells:
+            visible[cell_id >> 3] &= ~(1 << (cell_id & 7)) & 0xFF
+        self.previous_cells = self.visible_cells
+        self.visible_cells = []
+
+        if 0 <= x < self.map_width and 0 <= y < self.map_height:
+            self._mark(y * self.map_width + x)
+            for xx, xy, yx, yy in _OCTANTS:
+                self._cast_light(x, y, 1, 1.0, 0.0, xx, xy, yx, yy)
+
+        self.revision += 1
+        return True
+
+    def cell_changed(self, x: int, y: int):
+        """Avisa que uma célula do mapa mudou (só importa dentro do raio de visão)."""
+        if self.origin is None:
+            return
+        origin_x, origin_y = self.origin
+        if abs(x - origin_x) <= self.radius and abs(y - origin_y) <= self.radius:
+            self.dirty = True
+
+    def invalidate(self):
+        """Força o recálculo no próximo update."""
+        self.dirty = True
+
+    def _mark(self, cell_id: int):
+        """Marca a célula como visível e explorada."""
+        byte = cell_id >> 3
+        bit = 1 << (cell_id & 7)
+        if not self.visible[byte] & bit:
+            self.visible[byte] |= bit
+            self.explored[byte] |= bit
+            self.visible_cells.append(cell_id)
+
+    def _cast_light(self, cx: int, cy: int, row: int, start: float, end: float,
+                    xx: int, xy: int, yx: int, yy: int):
+        """Varre um octante a partir da linha row entre as inclinações start e end."""
+        if start < end:
+            return
+        map_data = self.map_data
+        width = self.map_width
+        height = self.map_height
+        radius = self.radius
+        radius_squared = radius * radius
+        new_start = start
+
+        for distance in range(row, radius + 1):
+            dy = -distance
+            blocked = False
+            for dx in range(-distance, 1):
+                # Inclinações das bordas esquerda e direita da célula
+                left_slope = (dx - 0.5) / (dy + 0.5)
+                right_slope = (dx + 0.5) / (dy - 0.5)
+                if start < right_slope:
+                    continue
+                if end > left_slope:
+                    break
+
+                map_x = cx + dx * xx + dy * xy
+                map_y = cy + dx * yx + dy * yy
+                inside = 0 <= map_x < width and 0 <= map_y < height
+                if inside and dx * dx + dy * dy <= radius_squared:
+                    self._mark(map_y * width + map_x)
+                opaque = not inside or map_data[map_y][map_x] == CELL_WALL
+
+                if blocked:
+                    # Dentro de uma sombra: continua até achar uma célula transparente
+                    if opaque:
+                        new_start = right_slope
+                    else:
+                        blocked = False
+                        start = new_start
+                elif opaque and distance < radius:
+                    # Começo de uma sombra: o trecho antes dela continua na próxima linha
+                    blocked = True
+                    self._cast_light(cx, cy, distance + 1, start, left_slope, xx, xy, yx, yy)
+                    new_start = right_slope
+            if blocked:
+                break
+
+    def is_visible(self, x: int, y: int) -> bool:
+        """Verifica se a célula está visível agora."""
+        if not (0 <= x < self.map_width and 0 <= y < self.map_height):
+            return False
+        cell_id = y * self.map_width + x
+        return bool(self.visible[cell_id >> 3] & (1 << (cell_id & 7)))
+
+    def is_explored(self, x: int, y: int) -> bool:
+        """Verifica se a célula já foi vista alguma vez."""
+        if not (0 <= x < self.map_width and 0 <= y < self.map_height):
+            return False
+        cell_id = y * self.map_width + x
+        return bool(self.explored[cell_id >> 3] & (1 << (cell_id & 7)))
+
+    def explored_cells(self) -> Iterator[int]:
+        """Itera os ids das células já exploradas (pula bytes zerados)."""
+        for byte_index, byte in enumerate(self.explored):
+            if byte:
+                for bit in range(8):
+                    if byte & (1 << bit):
+                        yield byte_index * 8 + bit
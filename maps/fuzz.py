@@ -0,0 +1,302 @@
+"""
+Fuzzing do gerador de mansões
+=============================
+
+Roda o HauntedMansionGenerator sobre um intervalo grande de sementes e
+parâmetros em paralelo (mesmas tarefas do maps.batch) e procura layouts
+patológicos: geração lenta, tentativas esgotadas, salas a menos que o
+pedido, regiões desconectadas antes do reparo ou erro. Cada caso encontrado
+é minimizado (menos salas, mapa menor, mantendo o mesmo problema) e pode
+ser guardado em um corpus JSON de regressão com limite de tempo, que
+depois é conferido com --check (que também confere se o pathfinder acha
+rota entre células de um mapa conexo).
+
+Uso:
+    python -m maps.fuzz --seeds 0:5000 --size 60x60,40x40 --num-rooms 8,20 --corpus bad_seeds.json
+    python -m maps.fuzz --seeds 0:500 --size 111x112 --num-rooms 36 --corridor-width 1 --decay 2 --corpus decay.json
+    python -m maps.fuzz --check bad_seeds.json
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+from .batch import generate_layout, run_batch, _parse_int_list, _parse_seeds, _parse_sizes
+from .connectivity import is_connected
+from .map_generator import HauntedMansionGenerator
+
+# Fator sobre a mediana a partir do qual uma geração conta como lenta
+SLOW_FACTOR = 4.0
+
+# Folga do limite de tempo gravado no corpus sobre o tempo medido: o limite é
+# max(CORPUS_TIME_MARGIN x mediana, mediana + CORPUS_TIME_SLACK_MS)
+CORPUS_TIME_MARGIN = 2.0
+CORPUS_TIME_SLACK_MS = 20.0
+
+# Gerações cronometradas por caso do corpus (a mediana vira o tempo de referência)
+CORPUS_TIMING_RUNS = 3
+
+# Passos de redução tentados ao minimizar um caso
+MINIMIZE_ROUNDS = 32
+
+# Pares de células sorteados por caso do corpus para conferir o pathfinder
+PATH_QUERIES = 20
+
+# Casos minimizados por execução (os mais lentos primeiro); o resto vai como encontrado
+MINIMIZE_LIMIT = 20
+
+
+def safe_generate_layout(task: Tuple) -> Dict:
+    """generate_layout que devolve o erro nas estatísticas em vez de levantar."""
+    try:
+        return generate_layout(task)
+    except Exception as error:  # noqa: BLE001 - o fuzzing quer registrar qualquer falha
+        map_width, map_height, seed, params, _, _ = task
+        return {"seed": seed, "width": map_width, "height": map_height, "params": params,
+                "error": f"{type(error).__name__}: {error}"}
+
+
+def find_problems(stats: Dict, max_ms: float) -> List[str]:
+    """Lista os problemas de um layout (vazia se estiver normal)."""
+    if "error" in stats:
+        return ["error"]
+    problems = []
+    if stats["generation_ms"] > max_ms:
+        problems.append("slow")
+    if stats["attempts"] >= stats["rooms_requested"] * 200 > 0:
+        problems.append("attempts_exhausted")
+    if stats["rooms_placed"] < stats["rooms_requested"]:
+        problems.append("room_shortfall")
+    if stats["components"] > 1:
+        problems.append("disconnected")
+    return problems
+
+
+def _run_case(map_width: int, map_height: int, seed: int, params: Dict) -> Dict:
+    return safe_generate_layout((map_width, map_height, seed, params, None, False))
+
+
+def minimize_case(stats: Dict, problems: List[str], max_ms: float) -> Dict:
+    """
+    Reduz o número de salas e o tamanho do mapa enquanto o mesmo problema
+    continuar aparecendo com a mesma semente.
+
+    Returns:
+        Estatísticas do menor caso encontrado
+    """
+    best = stats
+    target = problems[0]
+    for _ in range(MINIMIZE_ROUNDS):
+        params = best["params"]
+        num_rooms = params.get("num_rooms", 8)
+        candidates = []
+        if num_rooms > 1:
+            candidates.append((best["width"], best["height"], dict(params, num_rooms=num_rooms // 2)))
+            candidates.append((best["width"], best["height"], dict(params, num_rooms=num_rooms - 1)))
+        for factor in (0.5, 0.9):
+            width = int(best["width"] * factor)
+            height = int(best["height"] * factor)
+            if width >= 10 and height >= 10 and (width, height) != (best["width"], best["height"]):
+                candidates.append((width, height, params))
+
+        for width, height, candidate_params in candidates:
+            result = _run_case(width, height, best["seed"], candidate_params)
+            if target in find_problems(result, max_ms):
+                best = result
+                break
+        else:
+            break
+    return best
+
+
+def median_generation_ms(stats: Dict, runs: int = CORPUS_TIMING_RUNS) -> float:
+    """Mediana (ms) de várias gerações do caso, menos sensível a uma medição ruidosa."""
+    timings = []
+    for _ in range(runs):
+        generator = HauntedMansionGenerator(stats["width"], stats["height"])
+        start = time.perf_counter()
+        generator.generate_mansion(seed=stats["seed"], **stats["params"])
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def corpus_entry(stats: Dict, problems: List[str]) -> Dict:
+    """Entrada do corpus de regressão (parâmetros + limite de tempo)."""
+    generation_ms = stats.get("generation_ms", 0.0)
+    if "error" not in stats:
+        generation_ms = median_generation_ms(stats)
+    return {
+        "seed": stats["seed"],
+        "width": stats["width"],
+        "height": stats["height"],
+        "params": stats["params"],
+        "problems": problems,
+        "generation_ms": round(generation_ms, 3),
+        "max_ms": round(max(generation_ms * CORPUS_TIME_MARGIN,
+                            generation_ms + CORPUS_TIME_SLACK_MS), 3),
+    }
+
+
+def hunt(seeds: range, sizes: List[Tuple[int, int]], param_grid: Dict[str, List],
+         workers: Optional[int] = None, max_ms: Optional[float] = None,
+         minimize: bool = True) -> Tuple[List[Dict], Dict[str, float]]:
+    """
+    Roda o fuzzing e devolve os casos patológicos (minimizados) e um resumo.
+
+    Args:
+        max_ms: Limite de tempo de geração (None = SLOW_FACTOR x a mediana)
+    """
+    start = time.perf_counter()
+    results = list(run_batch(seeds, sizes, param_grid, None, workers, worker=safe_generate_layout))
+
+    timings = [stats["generation_ms"] for stats in results if "error" not in stats]
+    median_ms = statistics.median(timings) if timings else 0.0
+    if max_ms is None:
+        max_ms = median_ms * SLOW_FACTOR
+
+    found = [(stats, find_problems(stats, max_ms)) for stats in results]
+    found = [(stats, problems) for stats, problems in found if problems]
+    found.sort(key=lambda item: -item[0].get("generation_ms", 0.0))
+
+    # Problemas por combinação de tamanho e parâmetros (falha do parâmetro, não da semente)
+    by_combination = {}
+    for stats, problems in found:
+        key = f"{stats['width']}x{stats['height']} {json.dumps(stats['params'], sort_keys=True)}"
+        counts = by_combination.setdefault(key, {})
+        for problem in problems:
+            counts[problem] = counts.get(problem, 0) + 1
+
+    cases = []
+    for position, (stats, problems) in enumerate(found):
+        if minimize and position < MINIMIZE_LIMIT and problems != ["error"]:
+            stats = minimize_case(stats, problems, max_ms)
+            problems = find_problems(stats, max_ms) or problems
+        cases.append(corpus_entry(stats, problems))
+
+    summary = {
+        "layouts": len(results),
+        "pathological": len(cases),
+        "median_ms": median_ms,
+        "max_ms": max_ms,
+        "slowest_ms": max(timings) if timings else 0.0,
+        "elapsed_s": time.perf_counter() - start,
+        "by_combination": by_combination,
+    }
+    return cases, summary
+
+
+def count_unreachable(generator: HauntedMansionGenerator, seed: int,
+                      queries: int = PATH_QUERIES) -> int:
+    """
+    Sorteia pares de células caminháveis e conta quantos ficaram sem rota
+    no find_path (em um mapa conexo, todos deveriam ter).
+    """
+    rng = random.Random(seed)
+    index = generator.walkable_index
+    if not len(index):
+        return 0
+    unreachable = 0
+    for _ in range(queries):
+        if generator.find_path(index.random_cell(rng), index.random_cell(rng)) is None:
+            unreachable += 1
+    return unreachable
+
+
+def check_corpus(entries: List[Dict]) -> List[Tuple[Dict, List[str]]]:
+    """
+    Refaz as entradas do corpus e devolve as que passaram do limite de
+    tempo, deram erro, terminaram desconectadas ou deixaram o pathfinder
+    sem rota, com os motivos.
+    """
+    failures = []
+    for entry in entries:
+        generator = HauntedMansionGenerator(entry["width"], entry["height"])
+        reasons = []
+        start = time.perf_counter()
+        try:
+            map_data = generator.generate_mansion(seed=entry["seed"], **entry["params"])
+        except Exception as error:  # noqa: BLE001
+            reasons.append(f"{type(error).__name__}: {error}")
+        else:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            if elapsed_ms > entry["max_ms"]:
+                # Confirma com a mediana de várias gerações, como a gravada no corpus
+                elapsed_ms = median_generation_ms(entry)
+            if elapsed_ms > entry["max_ms"]:
+                reasons.append(f"{elapsed_ms:.1f} ms > {entry['max_ms']} ms")
+            if not is_connected(map_data):
+                reasons.append("mapa final desconectado")
+            else:
+                unreachable = count_unreachable(generator, entry["seed"])
+                if unreachable:
+                    reasons.append(f"find_path sem rota em {unreachable}/{PATH_QUERIES} pares")
+        if reasons:
+            failures.append((entry, reasons))
+    return failures
+
+
+def main(argv: Optional[List[str]] = None):
+    """Ponto de entrada da linha de comando."""
+    parser = argparse.ArgumentParser(description="Procura sementes patológicas do gerador de mansões")
+    parser.add_argument("--seeds", type=_parse_seeds, default=range(0, 1000),
+                        help="intervalo de sementes início:fim (padrão 0:1000)")
+    parser.add_argument("--size", type=_parse_sizes, default=[(60, 60)],
+                        help="tamanhos LxA separados por vírgula (padrão 60x60)")
+    parser.add_argument("--num-rooms", type=_parse_int_list, default=[8])
+    parser.add_argument("--max-connection-distance", type=_parse_int_list, default=[15])
+    parser.add_argument("--corridor-width", type=_parse_int_list, default=[3])
+    parser.add_argument("--placement", type=lambda text: text.split(","), default=["random"],
+                        help="modos de posicionamento separados por vírgula (random, bsp)")
+    parser.add_argument("--decay", type=_parse_int_list, default=[0],
+                        help="iterações do desgaste por autômato celular")
+    parser.add_argument("--max-ms", type=float, default=None,
+                        help=f"limite de tempo por geração (padrão {SLOW_FACTOR:g}x a mediana)")
+    parser.add_argument("--no-minimize", action="store_true", help="não minimiza os casos")
+    parser.add_argument("--corpus", default=None, help="grava os casos neste arquivo JSON")
+    parser.add_argument("--check", default=None, metavar="CORPUS",
+                        help="confere um corpus de regressão em vez de procurar")
+    parser.add_argument("--workers", type=int, default=None, help="processos (padrão: núcleos)")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        with open(args.check) as file:
+            entries = json.load(file)
+        failures = check_corpus(entries)
+        for entry, reasons in failures:
+            print(f"FALHOU semente {entry['seed']} {entry['width']}x{entry['height']} "
+                  f"{entry['params']}: {'; '.join(reasons)}")
+        print(f"{len(entries) - len(failures)}/{len(entries)} casos do corpus ok", file=sys.stderr)
+        sys.exit(1 if failures else 0)
+
+    param_grid = {
+        "num_rooms": args.num_rooms,
+        "max_connection_distance": args.max_connection_distance,
+        "corridor_width": args.corridor_width,
+        "placement": args.placement,
+        "decay": args.decay,
+    }
+    cases, summary = hunt(args.seeds, args.size, param_grid, args.workers, args.max_ms,
+                          minimize=not args.no_minimize)
+
+    for case in sorted(cases, key=lambda c: -c["generation_ms"]):
+        print(f"semente {case['seed']:>8} {case['width']}x{case['height']} {case['params']} "
+              f"{case['generation_ms']:8.2f} ms  {', '.join(case['problems'])}")
+    for combination, counts in sorted(summary["by_combination"].items()):
+        print(f"  {combination}: " + ", ".join(f"{problem} x{count}"
+                                               for problem, count in sorted(counts.items())),
+              file=sys.stderr)
+    print(f"{summary['layouts']} layouts, {summary['pathological']} patológicos "
+          f"(mediana {summary['median_ms']:.2f} ms, limite {summary['max_ms']:.2f} ms, "
+          f"pior {summary['slowest_ms']:.2f} ms) em {summary['elapsed_s']:.1f}s", file=sys.stderr)
+
+    if args.corpus:
+        with open(args.corpus, "w") as file:
+            json.dump(cases, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+Cache de mansões
+================
+
+Guarda mansões já geradas, endereçadas pelo conteúdo dos parâmetros que as
+produzem (dimensões, semente e parâmetros de geração). Mantém um LRU em
+memória e, opcionalmente, uma cópia compacta em disco (células em bytes
+comprimidas com zlib), para que mansões repetidas ou pré-geradas sejam
+carregadas sem gerar de novo.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import zlib
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from .map_generator import GENERATOR_VERSION, HauntedMansionGenerator, Room
+
+CACHE_FILE_EXTENSION = ".mansion"
+
+
+class CachedMansion:
+    """Mapa, salas e corredores de uma mansão guardada no cache."""
+
+    def __init__(self, map_data: List[List[int]], rooms: List[Room], seed: int,
+                 corridors: Optional[List[List[Tuple[int, int, int, int]]]] = None):
+        self.map_data = map_data
+        self.rooms = rooms
+        self.seed = seed
+        self.corridors = corridors if corridors is not None else []
+
+    def to_bytes(self) -> bytes:
+        """Serializa em formato compacto: cabeçalho JSON + uma célula por byte, com zlib."""
+        height = len(self.map_data)
+        width = len(self.map_data[0]) if height else 0
+        header = {
+            "width": width,
+            "height": height,
+            "seed": self.seed,
+            "rooms": [[r.x, r.y, r.width, r.height, r.room_type] for r in self.rooms],
+            "corridors": [[list(rect) for rect in rects] for rects in self.corridors],
+        }
+        cells = bytearray(width * height)
+        for y, row in enumerate(self.map_data):
+            cells[y * width:(y + 1) * width] = bytes(row)
+        return zlib.compress(json.dumps(header).encode("utf-8") + b"\0" + bytes(cells))
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'CachedMansion':
+        """Reconstrói a mansão a partir de to_bytes."""
+        payload = zlib.decompress(data)
+        split = payload.index(b"\0")
+        header = json.loads(payload[:split].decode("utf-8"))
+        cells = payload[split + 1:]
+        width = header["width"]
+        map_data = [list(cells[y * width:(y + 1) * width]) for y in range(header["height"])]
+        rooms = [Room(x, y, w, h, room_type) for x, y, w, h, room_type in header["rooms"]]
+        corridors = [[tuple(rect) for rect in rects] for rects in header.get("corridors", [])]
+        return cls(map_data, rooms, header["seed"], corridors)
+
+
+class MansionCache:
+    """LRU em memória de mansões geradas, com persistência opcional em disco."""
+
+    def __init__(self, max_entries: int = 16, cache_dir: Optional[str] = None):
+        """
+        Inicializa o cache.
+
+        Args:
+            max_entries: Máximo de mansões mantidas em memória
+            cache_dir: Diretório do cache em disco (None desativa o disco)
+        """
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self.entries: "OrderedDict[str, CachedMansion]" = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(map_width: int, map_height: int, seed: int, **params) -> str:
+        """Calcula a chave (hash do conteúdo) de uma mansão."""
+        description = {
+            "version": GENERATOR_VERSION,
+            "width": map_width,
+            "height": map_height,
+            "seed": seed,
+            "params": params,
+        }
+        encoded = json.dumps(description, sort_keys=True).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + CACHE_FILE_EXTENSION)
+
+    def get(self, key: str) -> Optional[CachedMansion]:
+        """Busca uma mansão na memória e depois no disco."""
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+        if self.cache_dir and os.path.exists(self._path(key)):
+            with open(self._path(key), "rb") as file:
+                entry = CachedMansion.from_bytes(file.read())
+            self._remember(key, entry)
+            self.disk_hits += 1
+            return entry
+
+        return None
+
+    def put(self, key: str, entry: CachedMansion):
+        """Guarda uma mansão na memória e no disco."""
+        self._remember(key, entry)
+
+        if self.cache_dir:
+            # Escrita atômica: arquivo temporário + rename
+            fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as file:
+                file.write(entry.to_bytes())
+            os.replace(temp_path, self._path(key))
+
+    def _remember(self, key: str, entry: CachedMansion):
+        """Insere no LRU em memória, descartando a entrada mais antiga se preciso."""
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def get_or_generate(self, generator: HauntedMansionGenerator, seed: int,
+                        **params) -> List[List[int]]:
+        """
+        Carrega a mansão do cache no gerador, gerando e guardando se não existir.
+
+        Args:
+            generator: Gerador que passa a conter o mapa
+            seed: Semente do layout
+            **params: Parâmetros de generate_mansion (num_rooms, max_connection_distance, ...)
+
+        Returns:
+            Lista 2D representando o mapa da mansão
+        """
+        key = self.make_key(generator.map_width, generator.map_height, seed, **params)
+        entry = self.get(key)
+
+        if entry is None:
+            self.misses += 1
+            generator.generate_mansion(seed=seed, **params)
+            entry = CachedMansion(generator.get_map_data(), list(generator.rooms), seed,
+                                  list(generator.corridor_rects))
+            self.put(key, entry)
+        else:
+            generator.load_mansion(entry.map_data, list(entry.rooms), entry.seed, entry.corridors)
+
+        return generator.get_map_data()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Retorna contadores de uso do cache."""
+        return {
+            "entries": len(self.entries),
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+        }
@@ -8,9 +8,50 @@ Este módulo gera mansões mal assombradas estilo D&D com:
 - Layout realista de mansão
 """
 
+import hashlib
 import random
 import math
-from typing import List, Tuple, Optional, Set
+from typing import Dict, List, Tuple, Optional, Set
+
+try:
+    import numpy as np
+except ImportError:  # numpy é opcional (backend "numpy" do grid)
+    np = None
+
+from .disjoint_set import DisjointSet
+from .spatial_index import RoomSpatialIndex
+
+# Versão do algoritmo de geração (incrementar quando o layout de uma semente mudar,
+# invalidando mansões guardadas em cache)
+#   1: geração original
+#   2: regiões desconectadas ligadas por padrão (connectivity="repair")
+#   3: escadas e spawn sorteados só entre as células abertas das salas
+GENERATOR_VERSION = 3
+
+# Distância mínima (Manhattan) entre salas
+ROOM_MIN_DISTANCE = 3
+
+# Vizinhos por sala no grafo de conexões candidatas
+CANDIDATE_NEIGHBOURS = 6
+
+# Modos da verificação de conectividade ao fim da geração
+CONNECTIVITY_MODES = ("repair", "reject", "off")
+
+# Tipos de salas para mansão
+ROOM_TYPES = [
+    {"type": "large", "min_size": 12, "max_size": 18, "weight": 2},
+    {"type": "normal", "min_size": 8, "max_size": 14, "weight": 5},
+    {"type": "small", "min_size": 5, "max_size": 8, "weight": 3}
+]
+
+# Estratégias de posicionamento das salas
+PLACEMENT_MODES = ("random", "bsp")
+
+# Menor lado de sala (tipo "small"): unidade das folhas do BSP
+BSP_MIN_ROOM_SIZE = min(room_type["min_size"] for room_type in ROOM_TYPES)
+
+# Grid de ids: 0 = nenhum, sala i = i + 1, corredor c = -(c + 1)
+ROOM_ID_NONE = 0
 
 
 class Room:
@@ -21,17 +62,18 @@ class Room:
         self.y = y
         self.width = width
         self.height = height
-        self.room_type = room_type  # normal, large, small, corridor
+        self.room_type = room_type  # normal, large, small, corridor (ou o tipo do prefab)
+        self.prefab = None  # Prefab carimbado na sala, se houver
         
     def get_center(self) -> Tuple[int, int]:
         """Retorna o centro da sala."""
         return (self.x + self.width // 2, self.y + self.height // 2)
         
-    def get_random_point(self) -> Tuple[int, int]:
+    def get_random_point(self, rng: random.Random = random) -> Tuple[int, int]:
         """Retorna um ponto aleatório dentro da sala."""
         return (
-            random.randint(self.x + 1, self.x + self.width - 2),
-            random.randint(self.y + 1, self.y + self.height - 2)
+            rng.randint(self.x + 1, self.x + self.width - 2),
+            rng.randint(self.y + 1, self.y + self.height - 2)
         )
         
     def intersects(self, other: 'Room') -> bool:
@@ -68,20 +110,44 @@ class HauntedMansionGenerator:
     Gerador de mansões mal assombradas estilo D&D.
     """
     
-    def __init__(self, map_width: int, map_height: int):
+    def __init__(self, map_width: int, map_height: int, use_numpy: bool = False):
         """
         Inicializa o gerador de mansões.
         
         Args:
             map_width: Largura do mapa em células
             map_height: Altura do mapa em células
+            use_numpy: Usa um ndarray uint8 como grid (carving vetorizado)
         """
+        if use_numpy and np is None:
+            raise ImportError("O backend numpy do grid requer o pacote numpy")
+        
         self.map_width = map_width
         self.map_height = map_height
+        self.use_numpy = use_numpy
         self.map_data = []
+        self.grid = None  # ndarray (altura x largura) quando use_numpy=True
+        self.room_index = None  # RoomSpatialIndex das salas da última geração
+        self.rooms = []
+        self.seed = None
+        self.rng = random.Random()
+        self.placement_attempts = 0  # Tentativas usadas por _generate_rooms na última geração
+        self.corridor_rects = []  # Retângulos cavados por cada corredor
+        self.component_count = 0  # Regiões caminháveis encontradas antes do reparo
+        self._walkable_index = None
+        self._room_grid = None  # Id de sala/corredor de cada célula (montado sob demanda)
+        self._room_adjacency = None
+        self._room_graph = None
+        self._pathfinder = None
+        self.corridor_rooms = []  # Salas tocadas por cada corredor
+        self.prefab_library = None  # PrefabLibrary da última geração (None = só retângulos)
+        self.decay_stats = None  # Contadores do desgaste da última geração
+        self.crumbled_cells = None  # Ids das paredes desmoronadas ([] sem desgaste; None = desconhecido)
         
     def generate_mansion(self, num_rooms: int = 8, max_connection_distance: int = 15, 
-                        corridor_width: int = 3) -> List[List[int]]:
+                        corridor_width: int = 3, seed: Optional[int] = None,
+                        connectivity: str = "repair", placement: str = "random",
+                        prefabs: Optional[str] = None, decay: int = 0) -> List[List[int]]:
         """
         Gera uma mansão mal assombrada.
         
@@ -89,178 +155,471 @@ class HauntedMansionGenerator:
             num_rooms: Número de salas a gerar
             max_connection_distance: Distância máxima para conectar salas
             corridor_width: Largura dos corredores
+            seed: Semente do layout (None sorteia uma; a usada fica em self.seed)
+            connectivity: O que fazer se o mapa sair com regiões isoladas:
+                "repair" cava corredores até a região principal, "reject"
+                levanta ValueError e "off" não verifica
+            placement: "random" sorteia posições e rejeita colisões; "bsp"
+                particiona o mapa e põe uma sala por folha (sempre num_rooms
+                salas se couberem, em O(num_rooms))
+            prefabs: Biblioteca de salas pré-fabricadas ("builtin" ou caminho
+                de um arquivo, ver maps.prefabs); None gera só retângulos
+            decay: Iterações do desgaste por autômato celular (paredes que
+                desmoronam e corredores obstruídos, ver maps.decay; requer
+                numpy); 0 desativa
             
         Returns:
             Lista 2D representando o mapa da mansão
         """
+        if connectivity not in CONNECTIVITY_MODES:
+            raise ValueError(f"Modo de conectividade inválido: {connectivity}")
+        if placement not in PLACEMENT_MODES:
+            raise ValueError(f"Modo de posicionamento inválido: {placement}")
+        
+        # 0. Gerador aleatório próprio: a mesma semente reproduz o mesmo layout
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+        self.seed = seed
+        self.rng = random.Random(seed)
+        
+        self.prefab_library = None
+        if prefabs is not None:
+            from .prefabs import load_library
+            self.prefab_library = load_library(prefabs)
+        
         # 1. Inicializa o mapa com paredes
-        self.map_data = [[CELL_WALL for _ in range(self.map_width)] 
-                        for _ in range(self.map_height)]
+        self.corridor_rects = []
+        self._reset_lookups()
+        if self.use_numpy:
+            self.grid = np.full((self.map_height, self.map_width), CELL_WALL, dtype=np.uint8)
+        else:
+            self.grid = None
+            self.map_data = [[CELL_WALL for _ in range(self.map_width)] 
+                            for _ in range(self.map_height)]
         
         # 2. Gera salas com distâncias e tamanhos razoáveis
-        rooms = self._generate_rooms(num_rooms)
+        if placement == "bsp":
+            rooms = self._generate_rooms_bsp(num_rooms)
+        else:
+            rooms = self._generate_rooms(num_rooms)
+        self.rooms = rooms
         
         # 3. Conecta salas que estão até X de distância
         self._connect_nearby_rooms(rooms, max_connection_distance, corridor_width)
         
+        # 4. Verifica se toda a área caminhável é alcançável
+        if connectivity != "off":
+            self._verify_connectivity(corridor_width, repair=connectivity == "repair")
+        
+        # 4b. Desgaste opcional (preserva a conectividade; depois da verificação
+        # o mapa já é uma região só, o que poupa uma rotulação)
+        self.decay_stats = None
+        self.crumbled_cells = []
+        if decay:
+            self._apply_decay(decay, components=1 if connectivity != "off" else None)
+        
+        # 5. Gera a visão em listas usada pelo jogo e pela interface
+        if self.grid is not None:
+            self.map_data = self.grid.tolist()
+        
         return self.map_data
     
+    def generate_chunk(self, chunk_x: int, chunk_y: int, world_seed: int, num_rooms: int = 6,
+                       max_connection_distance: int = 15, corridor_width: int = 3,
+                       placement: str = "random", prefabs: Optional[str] = None) -> List[List[int]]:
+        """
+        Gera um chunk de uma mansão infinita (o mapa deste gerador é o chunk).
+        
+        Cada borda recebe uma porta em posição derivada só da semente do mundo
+        e da borda, então os dois chunks vizinhos cavam o mesmo ponto e os
+        corredores se encontram.
+        
+        Args:
+            chunk_x: Coluna do chunk no mundo
+            chunk_y: Linha do chunk no mundo
+            world_seed: Semente do mundo
+            num_rooms: Número de salas por chunk
+            max_connection_distance: Distância máxima para conectar salas
+            corridor_width: Largura dos corredores
+            placement: Estratégia de posicionamento das salas ("random" ou "bsp")
+            prefabs: Biblioteca de salas pré-fabricadas (ver generate_mansion)
+            
+        Returns:
+            Lista 2D representando o chunk
+        """
+        self.generate_mansion(num_rooms, max_connection_distance, corridor_width,
+                              seed=derive_seed(world_seed, "chunk", chunk_x, chunk_y),
+                              placement=placement, prefabs=prefabs)
+        
+        # Garante ao menos uma sala para as portas chegarem
+        if not self.rooms:
+            hub = Room(self.map_width // 2 - 3, self.map_height // 2 - 3, 6, 6, "small")
+            self._carve_room(hub)
+            self.rooms.append(hub)
+        
+        # Bordas verticais são identificadas pelo chunk à direita; horizontais, pelo de baixo
+        left = self._door_offset(world_seed, "x", chunk_x, chunk_y, self.map_height, corridor_width)
+        right = self._door_offset(world_seed, "x", chunk_x + 1, chunk_y, self.map_height, corridor_width)
+        top = self._door_offset(world_seed, "y", chunk_x, chunk_y, self.map_width, corridor_width)
+        bottom = self._door_offset(world_seed, "y", chunk_x, chunk_y + 1, self.map_width, corridor_width)
+        doors = [
+            ((0, left), True),
+            ((self.map_width - 1, right), True),
+            ((top, 0), False),
+            ((bottom, self.map_height - 1), False),
+        ]
+        
+        for (door_x, door_y), horizontal in doors:
+            # Liga a porta ao centro da sala mais próxima
+            target_x, target_y = min((room.get_center() for room in self.rooms),
+                                     key=lambda c: abs(c[0] - door_x) + abs(c[1] - door_y))
+            if horizontal:
+                rects = [self._carve_horizontal_corridor(door_x, target_x, door_y, corridor_width),
+                         self._carve_vertical_corridor(door_y, target_y, target_x, corridor_width),
+                         self._fill_corner(target_x, door_y, corridor_width, "horizontal_to_vertical")]
+            else:
+                rects = [self._carve_vertical_corridor(door_y, target_y, door_x, corridor_width),
+                         self._carve_horizontal_corridor(door_x, target_x, target_y, corridor_width),
+                         self._fill_corner(door_x, target_y, corridor_width, "vertical_to_horizontal")]
+            self.corridor_rects.append([rect for rect in rects if rect is not None])
+        
+        if self.grid is not None:
+            self.map_data = self.grid.tolist()
+        
+        return self.map_data
+    
+    @staticmethod
+    def _door_offset(world_seed: int, axis: str, chunk_x: int, chunk_y: int,
+                     edge_length: int, corridor_width: int) -> int:
+        """Posição determinística da porta em uma borda de chunk."""
+        margin = corridor_width + 1
+        span = max(1, edge_length - 2 * margin)
+        return margin + derive_seed(world_seed, "door", axis, chunk_x, chunk_y) % span
+    
     def _generate_rooms(self, num_rooms: int) -> List[Room]:
         """Gera salas com tamanhos e formatos razoáveis."""
         rooms = []
         attempts = 0
         max_attempts = num_rooms * 200
         
-        # Define tipos de salas para mansão
-        room_types = [
-            {"type": "large", "min_size": 12, "max_size": 18, "weight": 2},
-            {"type": "normal", "min_size": 8, "max_size": 14, "weight": 5},
-            {"type": "small", "min_size": 5, "max_size": 8, "weight": 3}
-        ]
+        # Índice espacial com a distância mínima embutida (rejeição em tempo ~constante)
+        self.room_index = RoomSpatialIndex(margin=ROOM_MIN_DISTANCE)
+        
+        room_types = ROOM_TYPES
         
         while len(rooms) < num_rooms and attempts < max_attempts:
             # Escolhe tipo de sala baseado em peso
-            room_type = random.choices(room_types, weights=[r["weight"] for r in room_types])[0]
+            room_type = self.rng.choices(room_types, weights=[r["weight"] for r in room_types])[0]
             
             # Gera dimensões da sala
-            width = random.randint(room_type["min_size"], room_type["max_size"])
-            height = random.randint(room_type["min_size"], room_type["max_size"])
+            width = self.rng.randint(room_type["min_size"], room_type["max_size"])
+            height = self.rng.randint(room_type["min_size"], room_type["max_size"])
             
             # Posição aleatória
-            x = random.randint(2, self.map_width - width - 2)
-            y = random.randint(2, self.map_height - height - 2)
+            x = self.rng.randint(2, self.map_width - width - 2)
+            y = self.rng.randint(2, self.map_height - height - 2)
             
             new_room = Room(x, y, width, height, room_type["type"])
             
-            # Verifica se não intersecta com salas existentes
-            failed = False
-            for room in rooms:
-                if new_room.intersects(room):
-                    failed = True
-                    break
-                # Mantém distância mínima de 3 células
-                if new_room.distance_to(room) < 3:
-                    failed = True
-                    break
-            
-            if not failed:
+            # Verifica se não intersecta nem fica a menos de 3 células das salas existentes
+            if not self.room_index.collides(new_room):
                 rooms.append(new_room)
+                self.room_index.insert(new_room)
+                self._assign_prefab(new_room)
                 self._carve_room(new_room)
             
             attempts += 1
         
+        self.placement_attempts = attempts
+        return rooms
+    
+    def _generate_rooms_bsp(self, num_rooms: int) -> List[Room]:
+        """
+        Gera salas particionando o mapa (BSP) em uma folha por sala.
+        
+        Cada corte deixa ROOM_MIN_DISTANCE células livres entre as duas metades
+        e só é feito onde as duas metades comportam as salas que recebem, então
+        todas as salas pedidas são posicionadas (se couberem no mapa) sem
+        nenhuma tentativa rejeitada.
+        """
+        self.room_index = RoomSpatialIndex(margin=ROOM_MIN_DISTANCE)
+        region = (2, 2, self.map_width - 2, self.map_height - 2)
+        
+        leaves = []
+        self._split_region(region, min(num_rooms, self._region_capacity(region)), leaves)
+        
+        rooms = []
+        for leaf in leaves:
+            new_room = self._room_in_leaf(leaf)
+            rooms.append(new_room)
+            self.room_index.insert(new_room)
+            self._assign_prefab(new_room)
+            self._carve_room(new_room)
+        
+        self.placement_attempts = len(leaves)
         return rooms
     
+    @staticmethod
+    def _region_capacity(region: Tuple[int, int, int, int]) -> int:
+        """Quantas salas mínimas (com o espaçamento) cabem na região em grade."""
+        x1, y1, x2, y2 = region
+        unit = BSP_MIN_ROOM_SIZE + ROOM_MIN_DISTANCE
+        return (max(0, x2 - x1 + ROOM_MIN_DISTANCE) // unit) * (max(0, y2 - y1 + ROOM_MIN_DISTANCE) // unit)
+    
+    def _split_region(self, region: Tuple[int, int, int, int], count: int,
+                      leaves: List[Tuple[int, int, int, int]]):
+        """Divide a região recursivamente até ter uma folha por sala."""
+        if count <= 0:
+            return
+        if count == 1:
+            leaves.append(region)
+            return
+        
+        x1, y1, x2, y2 = region
+        gap = ROOM_MIN_DISTANCE
+        unit = BSP_MIN_ROOM_SIZE + gap
+        width = x2 - x1
+        height = y2 - y1
+        
+        # Corta primeiro o eixo mais longo
+        axes = ("x", "y") if width >= height else ("y", "x")
+        for axis in axes:
+            length, across = (width, height) if axis == "x" else (height, width)
+            rows = (across + gap) // unit  # Salas mínimas que cabem na direção do corte
+            if rows == 0:
+                continue
+            
+            first = count // 2
+            # Metade 1 comporta first salas; metade 2 (após o espaçamento) comporta o resto
+            low = unit * -(-first // rows) - gap
+            high = length - unit * -(-(count - first) // rows)
+            if low > high:
+                # Metades equilibradas não cabem: divide em múltiplos de linhas inteiras
+                first = max(1, min(count - 1, rows * round(count / (2 * rows))))
+                low = unit * -(-first // rows) - gap
+                high = length - unit * -(-(count - first) // rows)
+                if low > high:
+                    continue
+            
+            # Corte proporcional às salas de cada lado, com um pouco de variação
+            target = length * first // count + self.rng.randint(-unit // 2, unit // 2)
+            cut = max(low, min(high, target))
+            if axis == "x":
+                halves = ((x1, y1, x1 + cut, y2), (x1 + cut + gap, y1, x2, y2))
+            else:
+                halves = ((x1, y1, x2, y1 + cut), (x1, y1 + cut + gap, x2, y2))
+            self._split_region(halves[0], first, leaves)
+            self._split_region(halves[1], count - first, leaves)
+            return
+        
+        # Nenhum corte possível: a região fica com uma sala só
+        leaves.append(region)
+    
+    def _room_in_leaf(self, leaf: Tuple[int, int, int, int]) -> Room:
+        """Sorteia tipo (pelos pesos), tamanho e posição de uma sala dentro da folha."""
+        x1, y1, x2, y2 = leaf
+        width = x2 - x1
+        height = y2 - y1
+        
+        # Só os tipos cujo tamanho mínimo cabe na folha
+        room_types = [t for t in ROOM_TYPES if t["min_size"] <= min(width, height)]
+        room_type = self.rng.choices(room_types, weights=[r["weight"] for r in room_types])[0]
+        
+        room_width = self.rng.randint(room_type["min_size"], min(room_type["max_size"], width))
+        room_height = self.rng.randint(room_type["min_size"], min(room_type["max_size"], height))
+        x = self.rng.randint(x1, x2 - room_width)
+        y = self.rng.randint(y1, y2 - room_height)
+        return Room(x, y, room_width, room_height, room_type["type"])
+    
     def _connect_nearby_rooms(self, rooms: List[Room], max_distance: int, corridor_width: int):
         """Conecta salas garantindo que todas tenham pelo menos uma conexão."""
         if len(rooms) < 2:
             return
         
+        # Grafo esparso de candidatas (k vizinhos mais próximos de cada sala)
+        candidate_edges = self._build_candidate_graph(rooms)
+        
         # Primeiro, garante conectividade mínima usando algoritmo de árvore geradora mínima
-        connected_rooms = self._ensure_minimum_connectivity(rooms, corridor_width)
+        connected_pairs = self._ensure_minimum_connectivity(rooms, corridor_width, candidate_edges)
         
         # Depois, adiciona conexões extras para salas próximas
-        self._add_extra_connections(rooms, max_distance, corridor_width, connected_rooms)
+        self._add_extra_connections(rooms, max_distance, corridor_width, connected_pairs,
+                                    candidate_edges)
+    
+    def _build_candidate_graph(self, rooms: List[Room]) -> List[Tuple[int, int, int]]:
+        """
+        Monta o grafo de conexões candidatas ligando cada sala às suas
+        vizinhas mais próximas, usando o índice espacial das salas.
+        
+        Returns:
+            Lista de arestas (distância, i, j) com i < j, ordenada por distância
+        """
+        index = self.room_index
+        if index is None or index.rooms != rooms:
+            index = RoomSpatialIndex(margin=ROOM_MIN_DISTANCE)
+            for room in rooms:
+                index.insert(room)
+        
+        room_ids = {id(room): i for i, room in enumerate(rooms)}
+        edges = set()
+        for i, room in enumerate(rooms):
+            for neighbour in index.nearest(room, CANDIDATE_NEIGHBOURS):
+                j = room_ids[id(neighbour)]
+                edges.add((room.distance_to(neighbour), min(i, j), max(i, j)))
+        
+        return sorted(edges)
     
-    def _ensure_minimum_connectivity(self, rooms: List[Room], corridor_width: int) -> set:
-        """Garante que todas as salas tenham pelo menos uma conexão."""
+    def _ensure_minimum_connectivity(self, rooms: List[Room], corridor_width: int,
+                                     candidate_edges: List[Tuple[int, int, int]]) -> Set[Tuple[int, int]]:
+        """
+        Garante que todas as salas fiquem em um único componente conectado
+        (Kruskal com union-find sobre o grafo de candidatas).
+        
+        Returns:
+            Pares (i, j) de salas ligadas por corredor
+        """
         if len(rooms) < 2:
             return set()
         
-        # Usa algoritmo de árvore geradora mínima (Kruskal simplificado)
-        connected_rooms = set()
-        connections_made = []
-        
-        # Encontra todas as possíveis conexões
-        all_connections = []
-        for i in range(len(rooms)):
-            for j in range(i + 1, len(rooms)):
-                room1 = rooms[i]
-                room2 = rooms[j]
-                distance = room1.distance_to(room2)
-                all_connections.append((room1, room2, distance))
-        
-        # Ordena por distância (mais próximas primeiro)
-        all_connections.sort(key=lambda x: x[2])
-        
-        # Conecta salas até que todas estejam conectadas
-        for room1, room2, distance in all_connections:
-            # Verifica se esta conexão conecta componentes desconectados
-            room1_connected = room1 in connected_rooms
-            room2_connected = room2 in connected_rooms
-            
-            # Se nenhuma sala está conectada, conecta ambas
-            if not room1_connected and not room2_connected:
-                connected_rooms.add(room1)
-                connected_rooms.add(room2)
-                connections_made.append((room1, room2))
-                
-                # Cria o corredor
-                point1 = room1.get_random_point()
-                point2 = room2.get_random_point()
-                self._create_corridor(point1, point2, corridor_width)
-                
-            # Se apenas uma sala está conectada, conecta a outra
-            elif room1_connected and not room2_connected:
-                connected_rooms.add(room2)
-                connections_made.append((room1, room2))
-                
-                point1 = room1.get_random_point()
-                point2 = room2.get_random_point()
-                self._create_corridor(point1, point2, corridor_width)
-                
-            elif room2_connected and not room1_connected:
-                connected_rooms.add(room1)
-                connections_made.append((room1, room2))
-                
-                point1 = room1.get_random_point()
-                point2 = room2.get_random_point()
-                self._create_corridor(point1, point2, corridor_width)
-            
-            # Se todas as salas estão conectadas, para
-            if len(connected_rooms) == len(rooms):
-                break
+        components = DisjointSet(len(rooms))
+        connected_pairs = set()
+        
+        for distance, i, j in candidate_edges:
+            if components.union(i, j):
+                connected_pairs.add((i, j))
+                self._create_corridor(rooms[i].get_random_point(self.rng),
+                                      rooms[j].get_random_point(self.rng), corridor_width)
+                if components.components == 1:
+                    break
         
-        return connected_rooms
+        # Grupos de salas isolados no grafo de vizinhos: liga pelo par mais próximo
+        # entre representantes até sobrar um só componente
+        while components.components > 1:
+            groups = components.groups()
+            first = groups[0]
+            best = None
+            for group in groups[1:]:
+                for i in first:
+                    for j in group:
+                        distance = rooms[i].distance_to(rooms[j])
+                        if best is None or distance < best[0]:
+                            best = (distance, min(i, j), max(i, j))
+            _, i, j = best
+            components.union(i, j)
+            connected_pairs.add((i, j))
+            self._create_corridor(rooms[i].get_random_point(self.rng),
+                                  rooms[j].get_random_point(self.rng), corridor_width)
+        
+        return connected_pairs
     
-    def _add_extra_connections(self, rooms: List[Room], max_distance: int, corridor_width: int, connected_rooms: set):
+    def _add_extra_connections(self, rooms: List[Room], max_distance: int, corridor_width: int,
+                               connected_pairs: Set[Tuple[int, int]],
+                               candidate_edges: List[Tuple[int, int, int]]):
         """Adiciona conexões extras para salas próximas."""
-        # Encontra pares de salas próximas que ainda não estão conectadas
-        extra_connections = []
-        
-        for i in range(len(rooms)):
-            for j in range(i + 1, len(rooms)):
-                room1 = rooms[i]
-                room2 = rooms[j]
-                distance = room1.distance_to(room2)
-                
-                # Conecta se estão próximas o suficiente e não estão muito conectadas
-                if distance <= max_distance:
-                    extra_connections.append((room1, room2, distance))
-        
-        # Ordena por distância (mais próximas primeiro)
-        extra_connections.sort(key=lambda x: x[2])
-        
         # Adiciona algumas conexões extras (não todas para evitar sobrecarga)
         max_extra_connections = len(rooms) // 2  # Máximo de conexões extras
         connections_added = 0
         
-        for room1, room2, distance in extra_connections:
-            if connections_added >= max_extra_connections:
+        # Candidatas já vêm ordenadas por distância (mais próximas primeiro)
+        for distance, i, j in candidate_edges:
+            if connections_added >= max_extra_connections or distance > max_distance:
                 break
-                
+            
+            # Pula pares que já têm corredor
+            if (i, j) in connected_pairs:
+                continue
+            
             # Cria o corredor
-            point1 = room1.get_random_point()
-            point2 = room2.get_random_point()
-            self._create_corridor(point1, point2, corridor_width)
+            self._create_corridor(rooms[i].get_random_point(self.rng),
+                                  rooms[j].get_random_point(self.rng), corridor_width)
+            connected_pairs.add((i, j))
             connections_added += 1
     
+    def _apply_decay(self, iterations: int, components: Optional[int] = None):
+        """Roda o desgaste sobre o grid (convertendo as listas se preciso)."""
+        from .decay import decay_grid
+        
+        grid = self.grid if self.grid is not None else self.get_grid()
+        self.decay_stats = decay_grid(grid, derive_seed(self.seed, "decay"), iterations,
+                                      components=components)
+        self.crumbled_cells = self.decay_stats.pop("crumbled_cells").tolist()
+        self._reset_lookups()
+        if self.grid is None:
+            self.map_data = grid.tolist()
+    
+    def _verify_connectivity(self, corridor_width: int, repair: bool = True):
+        """
+        Rotula as regiões caminháveis e liga cada região isolada à maior
+        delas com um corredor (ou levanta ValueError se repair=False).
+        Uma única rotulação basta: cada corredor novo parte de uma célula da
+        região isolada e termina dentro da região principal.
+        """
+        from .connectivity import label_components, representative_cells
+        
+        labels, sizes = label_components(self.grid if self.grid is not None else self.map_data)
+        self.component_count = len(sizes) - 1
+        if self.component_count <= 1:
+            return
+        if not repair:
+            raise ValueError(f"Mansão com {self.component_count} regiões desconectadas "
+                             f"(semente {self.seed})")
+        
+        main = max(range(1, len(sizes)), key=sizes.__getitem__)
+        cells = representative_cells(labels, self.component_count)
+        
+        # Destinos na região principal: centros das salas que estão nela
+        centers = [room.get_center() for room in self.rooms]
+        targets = [(cx, cy) for cx, cy in centers if labels[cy][cx] == main]
+        if not targets:
+            targets = [cells[main - 1]]
+        
+        for label, (x, y) in enumerate(cells, start=1):
+            if label == main:
+                continue
+            target = min(targets, key=lambda c: abs(c[0] - x) + abs(c[1] - y))
+            self._create_corridor((x, y), target, corridor_width)
+        self._reset_lookups()
+    
+    def _fill_rect(self, x1: int, y1: int, x2: int, y2: int,
+                   cell: int) -> Optional[Tuple[int, int, int, int]]:
+        """
+        Preenche o retângulo [x1, x2) x [y1, y2), recortado aos limites do mapa.
+        
+        Returns:
+            O retângulo recortado (x1, y1, x2, y2), ou None se ficou vazio
+        """
+        x1 = max(0, x1)
+        y1 = max(0, y1)
+        x2 = min(self.map_width, x2)
+        y2 = min(self.map_height, y2)
+        if x1 >= x2 or y1 >= y2:
+            return None
+        
+        if self.grid is not None:
+            self.grid[y1:y2, x1:x2] = cell
+        else:
+            row_fill = [cell] * (x2 - x1)
+            for y in range(y1, y2):
+                self.map_data[y][x1:x2] = row_fill
+        
+        return (x1, y1, x2, y2)
+    
+    def _assign_prefab(self, room: Room):
+        """Sorteia um prefab que caiba na sala (consulta O(1) por tamanho) e adota o tipo dele."""
+        if self.prefab_library is None:
+            return
+        prefab = self.prefab_library.pick(room.width, room.height, self.rng)
+        if prefab is not None:
+            room.prefab = prefab
+            room.room_type = prefab.room_type
+    
     def _carve_room(self, room: Room):
-        """Cava uma sala no mapa."""
-        for y in range(room.y, room.y + room.height):
-            for x in range(room.x, room.x + room.width):
-                if self.is_valid_position(x, y):
-                    self.map_data[y][x] = CELL_FLOOR
+        """Cava uma sala no mapa (e carimba o prefab dela, centralizado)."""
+        self._fill_rect(room.x, room.y, room.x + room.width, room.y + room.height, CELL_FLOOR)
+        prefab = room.prefab
+        if prefab is not None:
+            prefab.stamp(self, room.x + (room.width - prefab.width) // 2,
+                         room.y + (room.height - prefab.height) // 2)
     
     def _create_corridor(self, start: Tuple[int, int], end: Tuple[int, int], corridor_width: int):
         """Cria um corredor entre dois pontos com largura completa."""
@@ -268,80 +627,47 @@ class HauntedMansionGenerator:
         x2, y2 = end
         
         # Cria corredor em L (primeiro horizontal, depois vertical)
-        if random.random() < 0.5:
+        if self.rng.random() < 0.5:
             # Primeiro horizontal, depois vertical
             # Garante que o corredor horizontal vai até o ponto de conexão
-            self._carve_horizontal_corridor(x1, x2, y1, corridor_width)
-            # Garante que o corredor vertical vai desde o ponto de conexão até o destino
-            self._carve_vertical_corridor(y1, y2, x2, corridor_width)
-            # Preenche o canto do L para garantir largura completa
-            self._fill_corner(x2, y1, corridor_width, "horizontal_to_vertical")
+            rects = [self._carve_horizontal_corridor(x1, x2, y1, corridor_width),
+                     # Garante que o corredor vertical vai desde o ponto de conexão até o destino
+                     self._carve_vertical_corridor(y1, y2, x2, corridor_width),
+                     # Preenche o canto do L para garantir largura completa
+                     self._fill_corner(x2, y1, corridor_width, "horizontal_to_vertical")]
         else:
             # Primeiro vertical, depois horizontal
             # Garante que o corredor vertical vai até o ponto de conexão
-            self._carve_vertical_corridor(y1, y2, x1, corridor_width)
-            # Garante que o corredor horizontal vai desde o ponto de conexão até o destino
-            self._carve_horizontal_corridor(x1, x2, y2, corridor_width)
-            # Preenche o canto do L para garantir largura completa
-            self._fill_corner(x1, y2, corridor_width, "vertical_to_horizontal")
+            rects = [self._carve_vertical_corridor(y1, y2, x1, corridor_width),
+                     # Garante que o corredor horizontal vai desde o ponto de conexão até o destino
+                     self._carve_horizontal_corridor(x1, x2, y2, corridor_width),
+                     # Preenche o canto do L para garantir largura completa
+                     self._fill_corner(x1, y2, corridor_width, "vertical_to_horizontal")]
+        
+        # Registra os retângulos cavados (bucket do corredor no índice de células caminháveis)
+        self.corridor_rects.append([rect for rect in rects if rect is not None])
     
     def _carve_horizontal_corridor(self, x1: int, x2: int, y: int, width: int):
         """Cava um corredor horizontal com largura completa."""
-        start_x = min(x1, x2)
-        end_x = max(x1, x2) + 1
-        
         # Calcula o offset para centralizar o corredor
         offset = width // 2
         
-        # Cava toda a largura do corredor
-        for x in range(start_x, end_x):
-            for w in range(width):
-                corridor_y = y - offset + w
-                if self.is_valid_position(x, corridor_y):
-                    self.map_data[corridor_y][x] = CELL_CORRIDOR
+        return self._fill_rect(min(x1, x2), y - offset, max(x1, x2) + 1, y - offset + width, CELL_CORRIDOR)
     
     def _carve_vertical_corridor(self, y1: int, y2: int, x: int, width: int):
         """Cava um corredor vertical com largura completa."""
-        start_y = min(y1, y2)
-        end_y = max(y1, y2) + 1
-        
         # Calcula o offset para centralizar o corredor
         offset = width // 2
         
-        # Cava toda a largura do corredor
-        for y in range(start_y, end_y):
-            for w in range(width):
-                corridor_x = x - offset + w
-                if self.is_valid_position(corridor_x, y):
-                    self.map_data[y][corridor_x] = CELL_CORRIDOR
+        return self._fill_rect(x - offset, min(y1, y2), x - offset + width, max(y1, y2) + 1, CELL_CORRIDOR)
     
     def _fill_corner(self, corner_x: int, corner_y: int, width: int, direction: str):
         """Preenche o canto do L para garantir largura completa."""
+        # O quadrado width x width centrado no canto é o mesmo nas duas direções
         offset = width // 2
         
-        if direction == "horizontal_to_vertical":
-            # Preenche o canto quando o corredor horizontal vira para vertical
-            # Preenche apenas as células que faltam no canto interno
-            for w in range(width):
-                for h in range(width):
-                    fill_x = corner_x - offset + w
-                    fill_y = corner_y - offset + h
-                    if self.is_valid_position(fill_x, fill_y):
-                        # Só preenche se não estiver já preenchido
-                        if self.map_data[fill_y][fill_x] != CELL_CORRIDOR:
-                            self.map_data[fill_y][fill_x] = CELL_CORRIDOR
-                        
-        elif direction == "vertical_to_horizontal":
-            # Preenche o canto quando o corredor vertical vira para horizontal
-            # Preenche apenas as células que faltam no canto interno
-            for w in range(width):
-                for h in range(width):
-                    fill_x = corner_x - offset + w
-                    fill_y = corner_y - offset + h
-                    if self.is_valid_position(fill_x, fill_y):
-                        # Só preenche se não estiver já preenchido
-                        if self.map_data[fill_y][fill_x] != CELL_CORRIDOR:
-                            self.map_data[fill_y][fill_x] = CELL_CORRIDOR
+        return self._fill_rect(corner_x - offset, corner_y - offset,
+                               corner_x - offset + width, corner_y - offset + width, CELL_CORRIDOR)
     
     def is_wall(self, x: int, y: int) -> bool:
         """Verifica se a posição é uma parede."""
@@ -353,32 +679,283 @@ class HauntedMansionGenerator:
         """Verifica se a posição está dentro dos limites."""
         return 0 <= x < self.map_width and 0 <= y < self.map_height
     
-    def find_valid_spawn_position(self) -> Tuple[int, int]:
-        """Encontra uma posição válida para spawn."""
-        for y in range(1, self.map_height - 1):
-            for x in range(1, self.map_width - 1):
-                if not self.is_wall(x, y):
-                    return (x, y)
+    @property
+    def walkable_index(self):
+        """Índice de células caminháveis da mansão atual (montado na primeira consulta)."""
+        if self._walkable_index is None:
+            from .walkable_index import WalkableIndex
+            self._walkable_index = WalkableIndex.from_map(
+                self.grid if self.grid is not None else self.map_data,
+                self.rooms, self.corridor_rects)
+        return self._walkable_index
+    
+    def find_valid_spawn_position(self, rng: Optional[random.Random] = None) -> Tuple[int, int]:
+        """Sorteia uma posição válida para spawn (dentro de uma sala, se houver)."""
+        rng = rng or self.rng
+        position = self._random_open_cell(rng)
+        if position is not None:
+            return position
         return (self.map_width // 2, self.map_height // 2)
     
+    def _random_open_cell(self, rng: random.Random) -> Optional[Tuple[int, int]]:
+        """Sorteia uma célula caminhável, de preferência dentro de uma sala."""
+        index = self.walkable_index
+        # Os buckets das salas já excluem as paredes internas (prefabs, desgaste)
+        position = index.random_room_cell(rng)
+        if position is None:
+            return index.random_cell(rng)
+        return position
+    
+    def place_stairs(self, up: bool = True, down: bool = True) -> Dict[str, Tuple[int, int]]:
+        """
+        Marca as escadas do andar em células de salas: "up" leva ao andar de
+        cima e "down" ao de baixo. As posições saem de um rng derivado da
+        semente, então o mesmo layout sempre recebe as mesmas escadas.
+        
+        Returns:
+            Posição de cada escada colocada, por direção
+        """
+        rng = random.Random(derive_seed(self.seed, "stairs"))
+        stairs = {}
+        for direction, wanted, cell in (("up", up, CELL_STAIRS_UP), ("down", down, CELL_STAIRS_DOWN)):
+            if not wanted:
+                continue
+            position = None
+            for _ in range(32):
+                position = self._random_open_cell(rng)
+                if position not in stairs.values():
+                    break
+            if position is None:
+                continue
+            # Escadas continuam caminháveis: os índices derivados seguem válidos
+            x, y = position
+            self._fill_rect(x, y, x + 1, y + 1, cell)
+            if self.grid is not None:
+                self.map_data[y][x] = cell
+            stairs[direction] = position
+        return stairs
+    
+    def _reset_lookups(self):
+        """Descarta os índices derivados do mapa (remontados na próxima consulta)."""
+        self._walkable_index = None
+        self._room_grid = None
+        self._room_adjacency = None
+        self._room_graph = None
+        self._pathfinder = None
+        self.corridor_rooms = []
+    
+    @property
+    def room_grid(self):
+        """
+        Grid paralelo ao mapa com o id de cada célula: 0 fora de salas e
+        corredores, i + 1 na sala i e -(c + 1) no corredor c. Salas têm
+        prioridade sobre os corredores que as atravessam.
+        """
+        if self._room_grid is None:
+            self._build_room_lookup()
+        return self._room_grid
+    
+    @property
+    def room_adjacency(self) -> List[Set[int]]:
+        """Salas ligadas a cada sala por algum corredor."""
+        if self._room_adjacency is None:
+            self._build_room_lookup()
+        return self._room_adjacency
+    
+    @property
+    def room_graph(self):
+        """RoomGraph da mansão atual (distâncias entre salas calculadas uma vez)."""
+        if self._room_graph is None:
+            from .room_graph import RoomGraph
+            self._room_graph = RoomGraph.from_generator(self)
+        return self._room_graph
+    
+    @property
+    def pathfinder(self):
+        """HierarchicalPathfinder da mansão atual (entradas calculadas na primeira rota)."""
+        if self._pathfinder is None:
+            from .pathfinding import HierarchicalPathfinder
+            self._pathfinder = HierarchicalPathfinder(self)
+        return self._pathfinder
+    
+    def find_path(self, start: Tuple[int, int], goal: Tuple[int, int]) -> Optional[List[Tuple[int, int]]]:
+        """Rota entre duas células caminháveis (ver HierarchicalPathfinder.find_path)."""
+        return self.pathfinder.find_path(start, goal)
+    
+    def _build_room_lookup(self):
+        """Monta o grid de ids e o grafo de adjacência das salas."""
+        if np is not None and self.grid is not None:
+            room_grid = np.zeros((self.map_height, self.map_width), dtype=np.int32)
+            for corridor_id, rects in enumerate(self.corridor_rects):
+                for x1, y1, x2, y2 in rects:
+                    room_grid[y1:y2, x1:x2] = -(corridor_id + 1)
+            for room_id, room in enumerate(self.rooms):
+                room_grid[room.y:room.y + room.height, room.x:room.x + room.width] = room_id + 1
+        else:
+            room_grid = [[ROOM_ID_NONE] * self.map_width for _ in range(self.map_height)]
+            for corridor_id, rects in enumerate(self.corridor_rects):
+                corridor_value = -(corridor_id + 1)
+                for x1, y1, x2, y2 in rects:
+                    for y in range(y1, y2):
+                        room_grid[y][x1:x2] = [corridor_value] * (x2 - x1)
+            for room_id, room in enumerate(self.rooms):
+                x1 = max(0, room.x)
+                x2 = min(self.map_width, room.x + room.width)
+                for y in range(max(0, room.y), min(self.map_height, room.y + room.height)):
+                    room_grid[y][x1:x2] = [room_id + 1] * (x2 - x1)
+        
+        self._assign_crumbled_cells(room_grid)
+        
+        # Um corredor liga todas as salas que toca (sobrepondo ou encostando por um lado)
+        index = self.room_index
+        if index is None or index.rooms != self.rooms:
+            index = RoomSpatialIndex(margin=ROOM_MIN_DISTANCE)
+            for room in self.rooms:
+                index.insert(room)
+        room_ids = {id(room): i for i, room in enumerate(self.rooms)}
+        
+        adjacency = [set() for _ in self.rooms]
+        corridor_rooms = []
+        for rects in self.corridor_rects:
+            touched = set()
+            for x1, y1, x2, y2 in rects:
+                for room in index.candidates(x1 - 1, y1 - 1, x2 - x1 + 2, y2 - y1 + 2):
+                    overlap_x = room.x < x2 and x1 < room.x + room.width
+                    overlap_y = room.y < y2 and y1 < room.y + room.height
+                    touch_x = room.x <= x2 and x1 <= room.x + room.width
+                    touch_y = room.y <= y2 and y1 <= room.y + room.height
+                    if (overlap_x and touch_y) or (overlap_y and touch_x):
+                        touched.add(room_ids[id(room)])
+            for i in touched:
+                adjacency[i].update(touched - {i})
+            corridor_rooms.append(sorted(touched))
+        
+        self._room_grid = room_grid
+        self._room_adjacency = adjacency
+        self.corridor_rooms = corridor_rooms
+    
+    def _assign_crumbled_cells(self, room_grid):
+        """
+        Dá às células caminháveis fora dos retângulos de salas e corredores
+        (paredes desmoronadas pelo desgaste) o id da sala ou corredor vizinho.
+        
+        Uma BFS parte das células já rotuladas, então cada célula fica ligada
+        ao resto do seu cluster e o pathfinder cria entradas para ela. Mapas
+        carregados (sem a lista do desgaste) procuram essas células no grid.
+        """
+        width = self.map_width
+        if self.crumbled_cells is not None:
+            orphans = self.crumbled_cells
+        elif np is not None:
+            walkable = self.get_grid() != CELL_WALL
+            ids = np.asarray(room_grid).reshape(walkable.shape)
+            orphans = np.flatnonzero(walkable & (ids == ROOM_ID_NONE)).tolist()
+        else:
+            orphans = [y * width + x for y, row in enumerate(self.map_data)
+                       for x, cell in enumerate(row)
+                       if cell != CELL_WALL and room_grid[y][x] == ROOM_ID_NONE]
+        
+        # Paredes internas de prefabs já estão dentro do retângulo da sala
+        pending = {cell for cell in orphans
+                   if room_grid[cell // width][cell % width] == ROOM_ID_NONE}
+        frontier = sorted(pending)
+        while frontier:
+            # Rotula de uma vez as pendentes com vizinha rotulada (ordem não importa)
+            assigned = []
+            for cell in frontier:
+                if cell not in pending:
+                    continue
+                y, x = divmod(cell, width)
+                for nx, ny in ((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)):
+                    if not self.is_wall(nx, ny) and room_grid[ny][nx] != ROOM_ID_NONE:
+                        assigned.append((cell, int(room_grid[ny][nx])))
+                        break
+            frontier = []
+            for cell, room_id in assigned:
+                y, x = divmod(cell, width)
+                room_grid[y][x] = room_id
+                pending.discard(cell)
+            for cell, _ in assigned:
+                y, x = divmod(cell, width)
+                for nx, ny in ((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)):
+                    if 0 <= nx < width and ny * width + nx in pending:
+                        frontier.append(ny * width + nx)
+    
+    def room_at(self, x: int, y: int) -> Optional[int]:
+        """Retorna o índice da sala que contém (x, y), ou None."""
+        if not self.is_valid_position(x, y):
+            return None
+        room_id = int(self.room_grid[y][x])
+        return room_id - 1 if room_id > 0 else None
+    
+    def corridor_at(self, x: int, y: int) -> Optional[int]:
+        """Retorna o índice do corredor em (x, y) (fora das salas), ou None."""
+        if not self.is_valid_position(x, y):
+            return None
+        room_id = int(self.room_grid[y][x])
+        return -room_id - 1 if room_id < 0 else None
+    
     def get_map_data(self) -> List[List[int]]:
         """Retorna os dados do mapa."""
         return self.map_data
+    
+    def load_mansion(self, map_data: List[List[int]], rooms: Optional[List[Room]] = None,
+                     seed: Optional[int] = None,
+                     corridors: Optional[List[List[Tuple[int, int, int, int]]]] = None):
+        """
+        Adota um mapa já pronto (ex.: vindo do cache) como o mapa atual.
+        
+        Args:
+            map_data: Lista 2D com as células do mapa
+            rooms: Salas do mapa, se conhecidas
+            seed: Semente que gerou o mapa, se conhecida
+            corridors: Retângulos de cada corredor, se conhecidos
+        """
+        self.map_data = map_data
+        self.map_height = len(map_data)
+        self.map_width = len(map_data[0]) if map_data else 0
+        self.rooms = rooms if rooms is not None else []
+        self.seed = seed
+        if seed is not None:
+            self.rng = random.Random(seed)
+        self.room_index = None
+        self.crumbled_cells = None
+        self.corridor_rects = [[tuple(rect) for rect in rects] for rects in corridors or []]
+        self._reset_lookups()
+        self.grid = None
+        if self.use_numpy:
+            self.grid = np.array(map_data, dtype=np.uint8).reshape(self.map_height, self.map_width)
+    
+    def get_grid(self):
+        """Retorna o mapa como ndarray uint8 (converte a partir das listas se preciso)."""
+        if np is None:
+            raise ImportError("get_grid requer o pacote numpy")
+        if self.grid is None:
+            return np.array(self.map_data, dtype=np.uint8).reshape(self.map_height, self.map_width)
+        return self.grid
 
 
 # Funções auxiliares
-def create_mansion_generator(map_width: int, map_height: int) -> HauntedMansionGenerator:
+def derive_seed(*parts) -> int:
+    """Deriva uma semente de 32 bits estável a partir de vários valores."""
+    text = ":".join(str(part) for part in parts)
+    return int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:4], "little")
+
+
+def create_mansion_generator(map_width: int, map_height: int,
+                             use_numpy: bool = False) -> HauntedMansionGenerator:
     """
     Factory function para criar um gerador de mansões mal assombradas.
     
     Args:
         map_width: Largura do mapa
         map_height: Altura do mapa
+        use_numpy: Usa o backend ndarray para o grid
         
     Returns:
         Instância de HauntedMansionGenerator configurada
     """
-    return HauntedMansionGenerator(map_width, map_height)
+    return HauntedMansionGenerator(map_width, map_height, use_numpy)
 
 
 # Constantes para tipos de células
@@ -387,4 +964,6 @@ CELL_WALL = 1
 CELL_DOOR = 2
 CELL_FLOOR = 3
 CELL_CORRIDOR = 4
-CELL_ROOM = 5 
\ No newline at end of file
+CELL_ROOM = 5
+CELL_STAIRS_UP = 6
+CELL_STAIRS_DOWN = 7 
\ No newline at end of file
@@ -0,0 +1,172 @@
+"""
+Formato compacto de mapa
+========================
+
+Guarda as células do mapa (valores CELL_*, que cabem em 3 bits) em um
+array de bits empacotado, precedido por um cabeçalho pequeno:
+
+    magic "CMAP" | versão (u8) | bits por célula (u8) | largura (u32) | altura (u32)
+
+O arquivo pode ser aberto com mmap: PackedMap lê as células direto do
+arquivo, sem decodificar o mapa inteiro nem copiá-lo para listas Python.
+"""
+
+import mmap
+import struct
+from typing import Iterator, List, Optional
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+PACKED_MAGIC = b"CMAP"
+PACKED_VERSION = 1
+BITS_PER_CELL = 3
+CELL_MASK = (1 << BITS_PER_CELL) - 1
+HEADER_FORMAT = "<4sBBII"
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+PACKED_FILE_EXTENSION = ".cmap"
+
+
+def pack_map(map_data) -> bytes:
+    """Empacota o mapa (lista 2D ou ndarray) no formato compacto."""
+    height = len(map_data)
+    width = len(map_data[0]) if height else 0
+    header = struct.pack(HEADER_FORMAT, PACKED_MAGIC, PACKED_VERSION, BITS_PER_CELL, width, height)
+
+    if np is not None:
+        cells = np.asarray(map_data, dtype=np.uint8).reshape(-1)
+        # Bits de cada célula em ordem little-endian: célula i ocupa os bits 3i..3i+2
+        bits = (cells[:, None] >> np.arange(BITS_PER_CELL, dtype=np.uint8)) & 1
+        packed = np.packbits(bits.reshape(-1), bitorder="little").tobytes()
+    else:
+        buffer = bytearray((width * height * BITS_PER_CELL + 7) // 8)
+        bit = 0
+        for row in map_data:
+            for cell in row:
+                value = (cell & CELL_MASK) << (bit & 7)
+                buffer[bit >> 3] |= value & 0xFF
+                if value > 0xFF:
+                    buffer[(bit >> 3) + 1] |= value >> 8
+                bit += BITS_PER_CELL
+        packed = bytes(buffer)
+
+    # Byte extra: a leitura de uma célula sempre pega 2 bytes
+    return header + packed + b"\0"
+
+
+def save_packed_map(path: str, map_data):
+    """Grava o mapa no formato compacto."""
+    with open(path, "wb") as file:
+        file.write(pack_map(map_data))
+
+
+class PackedRow:
+    """Visão de uma linha de um PackedMap (indexável como uma lista)."""
+
+    def __init__(self, packed_map: 'PackedMap', y: int):
+        self.packed_map = packed_map
+        self.y = y
+
+    def __len__(self) -> int:
+        return self.packed_map.width
+
+    def __getitem__(self, x: int) -> int:
+        if x < 0:
+            x += self.packed_map.width
+        if not 0 <= x < self.packed_map.width:
+            raise IndexError("coluna fora do mapa")
+        return self.packed_map.get_cell(x, self.y)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.packed_map.get_row(self.y))
+
+
+class PackedMap:
+    """
+    Mapa no formato compacto, lido sob demanda (via mmap quando aberto de
+    arquivo). Se comporta como uma lista 2D somente leitura: len(mapa),
+    mapa[y][x] e iteração por linhas.
+    """
+
+    def __init__(self, buffer, file=None):
+        magic, version, bits, width, height = struct.unpack_from(HEADER_FORMAT, buffer, 0)
+        if magic != PACKED_MAGIC or bits != BITS_PER_CELL:
+            raise ValueError("Arquivo não está no formato de mapa compacto")
+        if version != PACKED_VERSION:
+            raise ValueError(f"Versão de mapa compacto não suportada: {version}")
+
+        self.buffer = buffer
+        self.file = file
+        self.width = width
+        self.height = height
+
+    @classmethod
+    def open(cls, path: str) -> 'PackedMap':
+        """Abre um arquivo compacto com mmap (sem ler o mapa para a memória)."""
+        file = open(path, "rb")
+        try:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            file.close()
+            raise
+        return cls(buffer, file)
+
+    @classmethod
+    def from_map(cls, map_data) -> 'PackedMap':
+        """Cria um PackedMap em memória a partir de uma lista 2D."""
+        return cls(pack_map(map_data))
+
+    def close(self):
+        """Fecha o mmap e o arquivo."""
+        if isinstance(self.buffer, mmap.mmap):
+            self.buffer.close()
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def get_cell(self, x: int, y: int) -> int:
+        """Retorna a célula (x, y)."""
+        bit = (y * self.width + x) * BITS_PER_CELL
+        offset = HEADER_SIZE + (bit >> 3)
+        pair = self.buffer[offset] | (self.buffer[offset + 1] << 8)
+        return (pair >> (bit & 7)) & CELL_MASK
+
+    def get_row(self, y: int) -> List[int]:
+        """Decodifica uma linha inteira."""
+        if np is not None:
+            return self.to_grid(y, y + 1)[0].tolist()
+        return [self.get_cell(x, y) for x in range(self.width)]
+
+    def to_grid(self, start_row: int = 0, end_row: Optional[int] = None):
+        """Decodifica as linhas [start_row, end_row) como ndarray uint8."""
+        if np is None:
+            raise ImportError("to_grid requer o pacote numpy")
+        end_row = self.height if end_row is None else end_row
+        first_bit = start_row * self.width * BITS_PER_CELL
+        last_bit = end_row * self.width * BITS_PER_CELL
+        first_byte = first_bit >> 3
+        last_byte = (last_bit + 7) >> 3
+
+        raw = np.frombuffer(self.buffer, dtype=np.uint8, count=last_byte - first_byte,
+                            offset=HEADER_SIZE + first_byte)
+        bits = np.unpackbits(raw, bitorder="little")[first_bit & 7:]
+        bits = bits[:(end_row - start_row) * self.width * BITS_PER_CELL]
+        bits = bits.reshape(-1, BITS_PER_CELL)
+        cells = bits[:, 0] | (bits[:, 1] << 1) | (bits[:, 2] << 2)
+        return cells.reshape(end_row - start_row, self.width)
+
+    def __len__(self) -> int:
+        return self.height
+
+    def __getitem__(self, y: int) -> PackedRow:
+        if y < 0:
+            y += self.height
+        if not 0 <= y < self.height:
+            raise IndexError("linha fora do mapa")
+        return PackedRow(self, y)
+
+    def __iter__(self) -> Iterator[PackedRow]:
+        for y in range(self.height):
+            yield PackedRow(self, y)
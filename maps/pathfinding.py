@@ -0,0 +1,474 @@
+"""
+Pathfinding hierárquico
+=======================
+
+HPA* usando as salas e os corredores da mansão como clusters. As entradas
+(trechos de fronteira entre dois clusters vizinhos) e as distâncias dentro
+de cada cluster são calculadas uma vez por mansão. Uma consulta primeiro
+escolhe as salas da rota no RoomGraph (A* com landmarks), roda A* só
+sobre as entradas dessas salas e dos seus corredores e depois refina a
+rota descendo os campos de distância já guardados, sem busca célula a
+célula no mapa inteiro.
+"""
+
+import heapq
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .map_generator import CELL_WALL
+
+# Marcador do destino no A* abstrato
+_GOAL = -1
+
+# Rotas por salas mais longas que DETOUR_RATIO vezes a distância Manhattan são
+# comparadas com a rota pelo grafo de entradas (limitada ao comprimento delas)
+DETOUR_RATIO = 1.25
+
+# Só rotas por salas até este comprimento fazem a comparação (o custo dela
+# cresce com a área que o A* sobre as entradas precisa cobrir)
+SHORTCUT_MAX_LENGTH = 400
+
+
+class HierarchicalPathfinder:
+    """Pathfinder HPA* sobre as salas e corredores de um HauntedMansionGenerator."""
+
+    def __init__(self, generator, exhaustive_fallback: bool = False):
+        """
+        Args:
+            generator: Gerador com a mansão atual (usa room_grid e o mapa)
+            exhaustive_fallback: Se as buscas por salas e por entradas falharem,
+                tenta A* célula a célula no mapa inteiro (caro; para depuração)
+        """
+        self.generator = generator
+        self.exhaustive_fallback = exhaustive_fallback
+        self.map_width = generator.map_width
+        self.map_height = generator.map_height
+        self.cluster_of: Optional[List[int]] = None  # Cluster de cada célula (0 = nenhum)
+        self.entrances: Dict[int, List[int]] = {}  # Células de entrada de cada cluster
+        self.fields: Dict[int, Dict[int, int]] = {}  # Distâncias no cluster a partir de cada entrada
+        self.edges: Dict[int, List[Tuple[int, int]]] = {}  # Grafo abstrato: entrada -> (vizinha, custo)
+        self.segments: Dict[Tuple[int, int], List[int]] = {}  # Células entre duas entradas do mesmo cluster
+        self.legs: Dict[Tuple[int, int], List[int]] = {}  # Células entre duas salas vizinhas no RoomGraph
+
+    def build(self):
+        """Encontra as entradas e calcula os caminhos dentro dos clusters (uma vez)."""
+        if self.cluster_of is not None:
+            return
+
+        width = self.map_width
+        if np is not None:
+            walkable = self.generator.get_grid() != CELL_WALL
+            room_grid = np.asarray(self.generator.room_grid, dtype=np.int32)
+            clusters = np.where(walkable, room_grid.reshape(walkable.shape), 0)
+            pairs = []
+            # Pares de células vizinhas em clusters diferentes (fronteira vertical e horizontal)
+            left, right = clusters[:, :-1], clusters[:, 1:]
+            ys, xs = np.nonzero((left != right) & (left != 0) & (right != 0))
+            for y, x in zip(ys.tolist(), xs.tolist()):
+                cell = y * width + x
+                pairs.append((0, x, y, cell, cell + 1))
+            top, bottom = clusters[:-1, :], clusters[1:, :]
+            ys, xs = np.nonzero((top != bottom) & (top != 0) & (bottom != 0))
+            for y, x in zip(ys.tolist(), xs.tolist()):
+                cell = y * width + x
+                pairs.append((1, y, x, cell, cell + width))
+            cluster_of = clusters.reshape(-1).tolist()
+        else:
+            cluster_of = []
+            for row, ids in zip(self.generator.get_map_data(), self.generator.room_grid):
+                cluster_of.extend(cluster if cell != CELL_WALL else 0
+                                  for cell, cluster in zip(row, ids))
+            pairs = []
+            for cell, cluster in enumerate(cluster_of):
+                if not cluster:
+                    continue
+                y, x = divmod(cell, width)
+                right = cluster_of[cell + 1] if x + 1 < width else 0
+                if right and right != cluster:
+                    pairs.append((0, x, y, cell, cell + 1))
+                below = cluster_of[cell + width] if y + 1 < self.map_height else 0
+                if below and below != cluster:
+                    pairs.append((1, y, x, cell, cell + width))
+
+        self.cluster_of = cluster_of
+        self._add_entrances(pairs)
+        # Landmarks do A* entre salas, fora do caminho das consultas
+        self.generator.room_graph.prepare_landmarks()
+
+        # Campo de distâncias de cada entrada dentro do seu cluster e arestas internas
+        for cluster, cells in self.entrances.items():
+            for cell in cells:
+                self.fields[cell] = self._flood(cell, cluster)
+            for cell in cells:
+                field = self.fields[cell]
+                for other in cells:
+                    if other != cell and other in field:
+                        self.edges[cell].append((other, field[other]))
+
+    def _add_entrances(self, pairs: List[Tuple[int, int, int, int, int]]):
+        """
+        Agrupa os pares de fronteira em entradas: cada trecho contínuo de
+        fronteira entre dois clusters vira uma entrada no seu par do meio.
+
+        Args:
+            pairs: (orientação, linha da fronteira, posição ao longo dela, célula a, célula b)
+        """
+        cluster_of = self.cluster_of
+        keyed = sorted((orientation, line, cluster_of[a], cluster_of[b], position, a, b)
+                       for orientation, line, position, a, b in pairs)
+
+        run = []
+        for item in keyed + [None]:
+            if run and (item is None or item[:4] != run[-1][:4] or item[4] != run[-1][4] + 1):
+                _, _, _, _, _, a, b = run[len(run) // 2]
+                for cell, other in ((a, b), (b, a)):
+                    if cell not in self.edges:
+                        self.edges[cell] = []
+                        self.entrances.setdefault(cluster_of[cell], []).append(cell)
+                    self.edges[cell].append((other, 1))
+                run = []
+            if item is not None:
+                run.append(item)
+
+    def _neighbours(self, cell: int) -> List[int]:
+        """Células vizinhas (conectividade 4) dentro do mapa."""
+        width = self.map_width
+        x = cell % width
+        result = []
+        if x > 0:
+            result.append(cell - 1)
+        if x + 1 < width:
+            result.append(cell + 1)
+        if cell >= width:
+            result.append(cell - width)
+        if cell + width < width * self.map_height:
+            result.append(cell + width)
+        return result
+
+    def _flood(self, origin: int, cluster: int) -> Dict[int, int]:
+        """BFS a partir de origin restrita às células do cluster."""
+        cluster_of = self.cluster_of
+        field = {origin: 0}
+        frontier = [origin]
+        distance = 0
+        while frontier:
+            distance += 1
+            next_frontier = []
+            for cell in frontier:
+                for neighbour in self._neighbours(cell):
+                    if neighbour not in field and cluster_of[neighbour] == cluster:
+                        field[neighbour] = distance
+                        next_frontier.append(neighbour)
+            frontier = next_frontier
+        return field
+
+    def _descend(self, field: Dict[int, int], cell: int) -> List[int]:
+        """Caminho de cell até a origem do campo, sempre para a vizinha mais próxima."""
+        path = [cell]
+        distance = field[cell]
+        while distance > 0:
+            for neighbour in self._neighbours(cell):
+                if field.get(neighbour) == distance - 1:
+                    cell = neighbour
+                    break
+            path.append(cell)
+            distance -= 1
+        return path
+
+    def _heuristic(self, cell: int, goal: int) -> int:
+        width = self.map_width
+        return abs(cell % width - goal % width) + abs(cell // width - goal // width)
+
+    def _cell_search(self, start: int, goal: int, cluster: Optional[int]) -> Optional[List[int]]:
+        """A* célula a célula (restrito a um cluster, ou a todo o mapa se cluster=None)."""
+        cluster_of = self.cluster_of
+        is_wall = self.generator.is_wall
+        width = self.map_width
+        came_from = {start: None}
+        cost = {start: 0}
+        heap = [(self._heuristic(start, goal), 0, start)]
+        while heap:
+            _, distance, cell = heapq.heappop(heap)
+            if cell == goal:
+                path = []
+                while cell is not None:
+                    path.append(cell)
+                    cell = came_from[cell]
+                return path[::-1]
+            if distance > cost[cell]:
+                continue
+            for neighbour in self._neighbours(cell):
+                if cluster is not None:
+                    if cluster_of[neighbour] != cluster:
+                        continue
+                elif is_wall(neighbour % width, neighbour // width):
+                    continue
+                if distance + 1 < cost.get(neighbour, distance + 2):
+                    cost[neighbour] = distance + 1
+                    came_from[neighbour] = cell
+                    heapq.heappush(heap, (distance + 1 + self._heuristic(neighbour, goal),
+                                          distance + 1, neighbour))
+        return None
+
+    def find_path(self, start: Tuple[int, int], goal: Tuple[int, int]) -> Optional[List[Tuple[int, int]]]:
+        """
+        Calcula uma rota entre duas células caminháveis.
+
+        Args:
+            start: Posição (x, y) de origem
+            goal: Posição (x, y) de destino
+
+        Returns:
+            Lista de posições de start até goal (inclusive), ou None se não houver rota
+        """
+        generator = self.generator
+        if generator.is_wall(*start) or generator.is_wall(*goal):
+            return None
+        self.build()
+
+        width = self.map_width
+        start_cell = start[1] * width + start[0]
+        goal_cell = goal[1] * width + goal[0]
+        start_cluster = self.cluster_of[start_cell]
+        goal_cluster = self.cluster_of[goal_cell]
+
+        # Células fora de salas e corredores conhecidos: busca no mapa inteiro
+        if not start_cluster or not goal_cluster:
+            cells = self._cell_search(start_cell, goal_cell, None)
+        else:
+            cells = None
+            if start_cluster == goal_cluster:
+                cells = self._cell_search(start_cell, goal_cell, start_cluster)
+            if cells is None:
+                cells = self._room_route_path(start_cell, goal_cell)
+                # Rota por salas bem maior que a distância em linha reta (ex.: dois
+                # corredores que se cruzam): tenta o atalho, limitado ao comprimento dela
+                if (cells is not None and len(cells) - 1 <= SHORTCUT_MAX_LENGTH
+                        and DETOUR_RATIO * self._heuristic(start_cell, goal_cell) < len(cells) - 1):
+                    shortcut = self._entrance_path(start_cell, goal_cell, None, limit=len(cells) - 1)
+                    if shortcut is not None and len(shortcut) < len(cells):
+                        cells = shortcut
+            if cells is None:
+                cells = self._entrance_path(start_cell, goal_cell, None)
+            # Busca no mapa inteiro (O(mapa)) antes de desistir, só se pedida
+            if cells is None and self.exhaustive_fallback:
+                cells = self._cell_search(start_cell, goal_cell, None)
+
+        if cells is None:
+            return None
+        return [(cell % width, cell // width) for cell in cells]
+
+    def _rooms_of(self, cluster: int) -> List[int]:
+        """Salas de um cluster (a própria sala, ou as salas tocadas pelo corredor)."""
+        if cluster > 0:
+            return [cluster - 1]
+        corridor_rooms = self.generator.corridor_rooms
+        corridor_id = -cluster - 1
+        return corridor_rooms[corridor_id] if corridor_id < len(corridor_rooms) else []
+
+    def _room_route_path(self, start: int, goal: int) -> Optional[List[int]]:
+        """
+        Rota em dois níveis: escolhe as salas com um A* no RoomGraph e emenda
+        os trechos sala a sala, calculados uma vez e guardados.
+        """
+        start_rooms = self._rooms_of(self.cluster_of[start])
+        goal_rooms = self._rooms_of(self.cluster_of[goal])
+        if not start_rooms or not goal_rooms:
+            return None
+
+        # Custo de entrada e saída de cada sala: distância Manhattan até o centro
+        rooms = self.generator.rooms
+        width = self.map_width
+        sources = {}
+        for room in start_rooms:
+            center_x, center_y = rooms[room].get_center()
+            sources[room] = abs(start % width - center_x) + abs(start // width - center_y)
+        targets = {}
+        for room in goal_rooms:
+            center_x, center_y = rooms[room].get_center()
+            targets[room] = abs(goal % width - center_x) + abs(goal // width - center_y)
+
+        found = self.generator.room_graph.route(sources, targets)
+        if found is None:
+            return None
+        route = found[1]
+
+        # Da origem até a primeira sala da rota
+        cells = self._entrance_path(start, None, route[0] + 1)
+        if cells is None:
+            return None
+
+        # Sala a sala: atravessa a sala atual até o trecho pronto para a próxima
+        for a, b in zip(route, route[1:]):
+            leg = self._leg(a, b)
+            if leg is None:
+                return None
+            cells.extend(self._cross_cluster(cells[-1], leg[0])[1:])
+            cells.extend(leg[1:])
+
+        # Da última sala até o destino
+        if self.cluster_of[goal] == route[-1] + 1:
+            cells.extend(self._cross_cluster(cells[-1], goal)[1:])
+        else:
+            tail = self._entrance_path(cells[-1], goal, None)
+            if tail is None:
+                return None
+            cells.extend(tail[1:])
+        return cells
+
+    def _leg(self, room_a: int, room_b: int) -> Optional[List[int]]:
+        """Células de uma entrada da sala a até uma entrada da sala b (guardado por par)."""
+        leg = self.legs.get((room_a, room_b))
+        if leg is None:
+            # Pode atravessar as outras salas que o corredor da aresta toca
+            _, corridor_id = self.generator.room_graph.edges[(min(room_a, room_b), max(room_a, room_b))]
+            allowed = {room + 1 for room in self.generator.corridor_rooms[corridor_id]}
+            entrances = self.entrances
+            route = self._search({cell: 0 for cell in entrances.get(room_a + 1, ())},
+                                 {cell: 0 for cell in entrances.get(room_b + 1, ())},
+                                 self.generator.rooms[room_b].get_center(), allowed)
+            if route is None:
+                return None
+            leg = self._refine(route)
+            self.legs[(room_a, room_b)] = leg
+            self.legs[(room_b, room_a)] = leg[::-1]
+        return leg
+
+    def _cross_cluster(self, origin: int, target: int) -> List[int]:
+        """Células de origin até target dentro do mesmo cluster."""
+        if origin == target:
+            return [origin]
+        if target in self.fields:
+            if origin in self.fields:
+                return [origin] + self._segment(origin, target)
+            return self._descend(self.fields[target], origin)
+        if origin in self.fields:
+            return self._descend(self.fields[origin], target)[::-1]
+        return self._cell_search(origin, target, self.cluster_of[origin])
+
+    def _sources(self, cell: int) -> Dict[int, int]:
+        """Entradas do cluster da célula alcançáveis a partir dela, com o custo."""
+        if cell in self.fields:
+            return {cell: 0}
+        sources = {}
+        for entrance in self.entrances.get(self.cluster_of[cell], ()):
+            distance = self.fields[entrance].get(cell)
+            if distance is not None:
+                sources[entrance] = distance
+        return sources
+
+    def _entrance_path(self, start: int, goal: Optional[int], goal_cluster: Optional[int] = None,
+                       limit: Optional[int] = None) -> Optional[List[int]]:
+        """
+        Rota pelo grafo de entradas de start até goal (ou até qualquer entrada
+        de goal_cluster, se goal for None), refinada em células. Com limit,
+        desiste de rotas com custo maior ou igual a ele.
+        """
+        if goal is not None:
+            targets = self._sources(goal)
+            heuristic_target = (goal % self.map_width, goal // self.map_width)
+            allowed = None
+        else:
+            targets = {cell: 0 for cell in self.entrances.get(goal_cluster, ())}
+            heuristic_target = self.generator.rooms[goal_cluster - 1].get_center()
+            allowed = {self.cluster_of[start], goal_cluster}
+
+        if start in targets and goal is None:
+            return [start]
+        route = self._search(self._sources(start), targets, heuristic_target, allowed, limit)
+        if route is None:
+            return None
+
+        cells = self._cross_cluster(start, route[0])
+        cells.extend(self._refine(route)[1:])
+        if goal is not None:
+            cells.extend(self._cross_cluster(route[-1], goal)[1:])
+        return cells
+
+    def _search(self, sources: Dict[int, int], targets: Dict[int, int],
+                heuristic_target: Tuple[int, int], allowed: Optional[set],
+                limit: Optional[int] = None) -> Optional[List[int]]:
+        """
+        A* sobre o grafo de entradas.
+
+        Args:
+            sources: Entradas de partida e o custo até cada uma
+            targets: Entradas de chegada e o custo restante a partir de cada uma
+            heuristic_target: Posição usada na heurística (distância Manhattan)
+            allowed: Salas (clusters) que podem ser atravessadas; corredores são
+                sempre livres, pois um corredor pode ter sido cortado por outro
+            limit: Custo a partir do qual a busca desiste (None = sem limite)
+
+        Returns:
+            Sequência de entradas da primeira à última, ou None sem rota
+        """
+        cluster_of = self.cluster_of
+        width = self.map_width
+        target_x, target_y = heuristic_target
+
+        came_from = {}
+        cost = {}
+        heap = []
+        for entrance, distance in sources.items():
+            cost[entrance] = distance
+            came_from[entrance] = None
+            heuristic = abs(entrance % width - target_x) + abs(entrance // width - target_y)
+            heapq.heappush(heap, (distance + heuristic, distance, entrance))
+
+        while heap:
+            _, distance, node = heapq.heappop(heap)
+            if node == _GOAL:
+                break
+            if distance > cost[node]:
+                continue
+            if node in targets:
+                total = distance + targets[node]
+                if total < cost.get(_GOAL, total + 1):
+                    cost[_GOAL] = total
+                    came_from[_GOAL] = node
+                    heapq.heappush(heap, (total, total, _GOAL))
+            for neighbour, step in self.edges[node]:
+                cluster = cluster_of[neighbour]
+                if allowed is not None and cluster > 0 and cluster not in allowed:
+                    continue
+                candidate = distance + step
+                if candidate < cost.get(neighbour, candidate + 1):
+                    heuristic = abs(neighbour % width - target_x) + abs(neighbour // width - target_y)
+                    if limit is not None and candidate + heuristic >= limit:
+                        continue
+                    cost[neighbour] = candidate
+                    came_from[neighbour] = node
+                    heapq.heappush(heap, (candidate + heuristic, candidate, neighbour))
+        else:
+            return None
+
+        route = []
+        node = came_from[_GOAL]
+        while node is not None:
+            route.append(node)
+            node = came_from[node]
+        route.reverse()
+        return route
+
+    def _refine(self, route: List[int]) -> List[int]:
+        """Células de uma sequência de entradas (trechos internos guardados por par)."""
+        cluster_of = self.cluster_of
+        cells = [route[0]]
+        for previous, entrance in zip(route, route[1:]):
+            if cluster_of[previous] == cluster_of[entrance]:
+                cells.extend(self._segment(previous, entrance))
+            else:
+                cells.append(entrance)
+        return cells
+
+    def _segment(self, origin: int, target: int) -> List[int]:
+        """Células após origin até target, duas entradas do mesmo cluster (guardado)."""
+        segment = self.segments.get((origin, target))
+        if segment is None:
+            segment = self._descend(self.fields[target], origin)[1:]
+            self.segments[(origin, target)] = segment
+        return segment
@@ -0,0 +1,210 @@
+"""
+Salas pré-fabricadas
+====================
+
+Salas desenhadas à mão (salão de baile, cripta, biblioteca) carregadas uma
+vez por biblioteca e indexadas pelo tamanho da sala em que cabem, para que
+o gerador encontre as candidatas de uma sala sorteada com uma consulta a
+um dicionário. Cada prefab é carimbado no mapa com cópias em bloco (uma
+atribuição de fatia do ndarray, ou uma por linha nas listas) em vez de
+escrever célula a célula.
+
+Formato dos arquivos de prefabs (blocos separados por linha em branco):
+
+    name: salao_de_baile
+    type: ballroom
+    ..........
+    .#......#.
+
+"." é chão e "#" é parede (colunas, estantes, sarcófagos); linhas que
+começam com ";" são comentários.
+"""
+
+import random
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .map_generator import CELL_FLOOR, CELL_WALL
+
+# Biblioteca embutida (nome aceito por load_library)
+BUILTIN_LIBRARY = "builtin"
+
+# Quantas células a sala pode ter a mais que o prefab em cada eixo (o prefab fica centralizado)
+PREFAB_SLACK = 4
+
+# Chance de uma sala com candidatas virar prefab
+PREFAB_CHANCE = 0.5
+
+PREFAB_LEGEND = {".": CELL_FLOOR, "#": CELL_WALL}
+
+BUILTIN_PREFABS = """
+name: salao_de_baile
+type: ballroom
+..............
+..............
+..#..#..#..#..
+..............
+..............
+..............
+..............
+..............
+..............
+..#..#..#..#..
+..............
+..............
+
+name: cripta
+type: crypt
+.........
+.##...##.
+.........
+.##...##.
+.........
+.##...##.
+.........
+
+name: cripta_pequena
+type: crypt
+......
+.#..#.
+......
+......
+.#..#.
+......
+
+name: biblioteca
+type: library
+............
+.####..####.
+............
+.####..####.
+............
+.####..####.
+............
+.####..####.
+............
+............
+
+name: biblioteca_pequena
+type: library
+........
+.##..##.
+........
+.##..##.
+........
+.##..##.
+........
+........
+"""
+
+
+class Prefab:
+    """Sala pré-fabricada: células de um retângulo e o room_type que ela dá à sala."""
+
+    def __init__(self, name: str, room_type: str, cells: List[List[int]]):
+        self.name = name
+        self.room_type = room_type
+        self.cells = cells
+        self.height = len(cells)
+        self.width = len(cells[0]) if cells else 0
+        self.array = np.array(cells, dtype=np.uint8) if np is not None else None
+
+    @classmethod
+    def from_rows(cls, name: str, room_type: str, rows: List[str]) -> 'Prefab':
+        """Monta o prefab a partir das linhas desenhadas com a legenda PREFAB_LEGEND."""
+        if len({len(row) for row in rows}) != 1:
+            raise ValueError(f"Prefab {name}: todas as linhas precisam ter o mesmo tamanho")
+        try:
+            cells = [[PREFAB_LEGEND[char] for char in row] for row in rows]
+        except KeyError as error:
+            raise ValueError(f"Prefab {name}: caractere desconhecido {error}") from None
+        return cls(name, room_type, cells)
+
+    def rotated(self) -> 'Prefab':
+        """O prefab girado 90° (transposto), para caber em salas de proporção invertida."""
+        return Prefab(self.name + ":r", self.room_type, [list(column) for column in zip(*self.cells)])
+
+    def stamp(self, generator, x: int, y: int):
+        """Copia o prefab para o mapa do gerador com o canto em (x, y)."""
+        if generator.grid is not None:
+            generator.grid[y:y + self.height, x:x + self.width] = self.array
+        else:
+            for row, cells in enumerate(self.cells):
+                generator.map_data[y + row][x:x + self.width] = cells
+
+
+def parse_prefabs(text: str) -> List[Prefab]:
+    """Lê os prefabs de um texto no formato descrito no módulo."""
+    prefabs = []
+    for block in text.strip().split("\n\n"):
+        header = {}
+        rows = []
+        for line in block.strip().splitlines():
+            line = line.strip()
+            if not line or line.startswith(";"):
+                continue
+            if ":" in line:
+                key, value = line.split(":", 1)
+                header[key.strip()] = value.strip()
+            else:
+                rows.append(line)
+        if rows:
+            prefabs.append(Prefab.from_rows(header.get("name", f"prefab_{len(prefabs)}"),
+                                            header.get("type", "normal"), rows))
+    return prefabs
+
+
+class PrefabLibrary:
+    """Prefabs indexados pelo tamanho (largura, altura) das salas em que cabem."""
+
+    def __init__(self, prefabs: List[Prefab], slack: int = PREFAB_SLACK,
+                 chance: float = PREFAB_CHANCE):
+        """
+        Args:
+            prefabs: Prefabs da biblioteca (as versões giradas são incluídas)
+            slack: Células a mais que a sala pode ter em cada eixo
+            chance: Chance de usar um prefab quando há candidatas
+        """
+        self.prefabs = list(prefabs)
+        self.chance = chance
+        self.by_size: Dict[Tuple[int, int], List[Prefab]] = {}
+
+        variants = []
+        for prefab in self.prefabs:
+            variants.append(prefab)
+            if prefab.width != prefab.height:
+                variants.append(prefab.rotated())
+        for prefab in variants:
+            for width in range(prefab.width, prefab.width + slack + 1):
+                for height in range(prefab.height, prefab.height + slack + 1):
+                    self.by_size.setdefault((width, height), []).append(prefab)
+
+    def candidates(self, width: int, height: int) -> List[Prefab]:
+        """Prefabs que cabem em uma sala do tamanho dado."""
+        return self.by_size.get((width, height), [])
+
+    def pick(self, width: int, height: int, rng: random.Random) -> Optional[Prefab]:
+        """Sorteia (com a chance da biblioteca) um prefab para a sala, ou None."""
+        candidates = self.by_size.get((width, height))
+        if not candidates or rng.random() >= self.chance:
+            return None
+        return rng.choice(candidates)
+
+
+@lru_cache(maxsize=None)
+def load_library(name: str = BUILTIN_LIBRARY) -> PrefabLibrary:
+    """
+    Carrega uma biblioteca uma única vez por processo.
+
+    Args:
+        name: BUILTIN_LIBRARY ou o caminho de um arquivo de prefabs
+    """
+    if name == BUILTIN_LIBRARY:
+        return PrefabLibrary(parse_prefabs(BUILTIN_PREFABS))
+    with open(name, encoding="utf-8") as file:
+        return PrefabLibrary(parse_prefabs(file.read()))
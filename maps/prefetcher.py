@@ -0,0 +1,186 @@
+"""
+Pré-geração de mansões em segundo plano
+=======================================
+
+Gera a próxima mansão em um processo separado enquanto o jogo atual
+acontece, para que o recomeço só precise trocar o mapa. Se o processo
+ainda não terminou (ou não pôde ser criado), gera de forma síncrona.
+
+O mesmo worker também aceita gerações avulsas identificadas pela chave do
+cache (submit/collect), usadas para adiantar os andares vizinhos da
+FloorStack.
+"""
+
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+from .map_generator import HauntedMansionGenerator
+from .mansion_cache import CachedMansion, MansionCache
+
+
+def _generate_mansion_bytes(map_width: int, map_height: int, seed: int, params: dict) -> bytes:
+    """
+    Gera uma mansão no processo worker e devolve em formato compacto.
+
+    Um parâmetro stairs = [subida, descida] (chave dos andares da
+    FloorStack) coloca as escadas depois de gerar.
+    """
+    params = dict(params)
+    stairs = params.pop("stairs", None)
+    generator = HauntedMansionGenerator(map_width, map_height)
+    generator.generate_mansion(seed=seed, **params)
+    if stairs is not None:
+        generator.place_stairs(up=stairs[0], down=stairs[1])
+    return CachedMansion(generator.get_map_data(), generator.rooms, seed,
+                         generator.corridor_rects).to_bytes()
+
+
+class MansionPrefetcher:
+    """Gera a próxima mansão em um processo worker e entrega no recomeço."""
+
+    def __init__(self, map_width: int, map_height: int, cache: MansionCache, **params):
+        """
+        Inicializa o prefetcher.
+
+        Args:
+            map_width: Largura do mapa
+            map_height: Altura do mapa
+            cache: Cache onde as mansões geradas são guardadas
+            **params: Parâmetros de generate_mansion
+        """
+        self.map_width = map_width
+        self.map_height = map_height
+        self.cache = cache
+        self.params = params
+
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self.future: Optional[Future] = None
+        self.pending_seed: Optional[int] = None
+        self.jobs: Dict[str, Future] = {}  # Gerações avulsas por chave do cache
+
+        # Estatísticas de tempo (ms) de cada caminho
+        self.stats = {
+            "prefetched": 0,
+            "prefetched_ms": 0.0,
+            "sync": 0,
+            "sync_ms": 0.0,
+        }
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        """Cria o pool de um worker na primeira vez (None se não for possível)."""
+        if self.executor is None:
+            try:
+                self.executor = ProcessPoolExecutor(max_workers=1)
+            except (OSError, NotImplementedError):
+                return None
+        return self.executor
+
+    def prefetch(self, seed: int):
+        """Começa a gerar a mansão da semente em segundo plano."""
+        if self.future is not None:
+            self.future.cancel()
+        self.future = None
+        self.pending_seed = seed
+
+        # Já está no cache: não precisa de worker
+        key = MansionCache.make_key(self.map_width, self.map_height, seed, **self.params)
+        if key in self.cache.entries:
+            return
+
+        executor = self._get_executor()
+        if executor is not None:
+            self.future = executor.submit(_generate_mansion_bytes, self.map_width,
+                                          self.map_height, seed, self.params)
+
+    def take(self, generator: HauntedMansionGenerator, seed: int) -> List[List[int]]:
+        """
+        Carrega a mansão da semente no gerador, usando o resultado do worker
+        se estiver pronto e gerando de forma síncrona caso contrário.
+
+        Returns:
+            Lista 2D representando o mapa da mansão
+        """
+        start = time.perf_counter()
+        future = self.future
+        prefetched = (future is not None and seed == self.pending_seed and
+                      future.done() and not future.cancelled() and future.exception() is None)
+
+        if prefetched:
+            entry = CachedMansion.from_bytes(future.result())
+            key = MansionCache.make_key(self.map_width, self.map_height, seed, **self.params)
+            self.cache.put(key, entry)
+            generator.load_mansion(entry.map_data, list(entry.rooms), entry.seed, entry.corridors)
+            map_data = generator.get_map_data()
+        else:
+            # Worker não terminou: descarta e gera aqui (ou carrega do cache)
+            if future is not None:
+                future.cancel()
+            map_data = self.cache.get_or_generate(generator, seed, **self.params)
+
+        self.future = None
+        self.pending_seed = None
+
+        path = "prefetched" if prefetched else "sync"
+        self.stats[path] += 1
+        self.stats[path + "_ms"] = (time.perf_counter() - start) * 1000
+        return map_data
+
+    def submit(self, seed: int, **extra) -> Optional[str]:
+        """
+        Começa a gerar em segundo plano a mansão da semente com os parâmetros
+        do prefetcher mais extra (ex.: stairs), sem mexer na pré-geração do
+        recomeço.
+
+        Returns:
+            Chave do cache da mansão, ou None se já estiver no cache ou se o
+            worker não puder ser criado
+        """
+        key = MansionCache.make_key(self.map_width, self.map_height, seed, **extra, **self.params)
+        if key in self.jobs:
+            return key
+        if key in self.cache.entries:
+            return None
+        executor = self._get_executor()
+        if executor is None:
+            return None
+        self.jobs[key] = executor.submit(_generate_mansion_bytes, self.map_width, self.map_height,
+                                         seed, dict(self.params, **extra))
+        return key
+
+    def collect(self, key: str) -> Optional[CachedMansion]:
+        """
+        Espera a geração avulsa da chave terminar e guarda o resultado no cache.
+
+        Returns:
+            A mansão gerada, ou None se não houver geração dessa chave (ou se
+            ela falhou)
+        """
+        future = self.jobs.pop(key, None)
+        if future is None:
+            return None
+        start = time.perf_counter()
+        if future.cancelled() or future.exception() is not None:
+            return None
+        entry = CachedMansion.from_bytes(future.result())
+        self.cache.put(key, entry)
+        self.stats["prefetched"] += 1
+        self.stats["prefetched_ms"] = (time.perf_counter() - start) * 1000
+        return entry
+
+    def discard(self, keep=()):
+        """Cancela as gerações avulsas cujas chaves não estão em keep."""
+        for key in [key for key in self.jobs if key not in keep]:
+            self.jobs.pop(key).cancel()
+
+    def get_stats(self) -> Dict[str, float]:
+        """Retorna quantas mansões vieram de cada caminho e o último tempo (ms) de cada um."""
+        return dict(self.stats)
+
+    def shutdown(self):
+        """Encerra o processo worker."""
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+        self.future = None
+        self.jobs = {}
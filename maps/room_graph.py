@@ -0,0 +1,238 @@
+"""
+Grafo de salas
+==============
+
+Topologia da mansão no nível das salas: cada aresta liga duas salas tocadas
+pelo mesmo corredor e pesa o comprimento desse corredor. As distâncias
+entre todos os pares de salas (e o próximo salto de cada rota) podem ser
+calculadas uma vez por mansão, então perguntas como "quão longe o jogador
+está da cripta" viram uma consulta em tabela.
+
+Para rotas avulsas a tabela é cara demais em mansões grandes (V buscas de
+Dijkstra); route faz um A* sobre o grafo com limites inferiores ALT,
+tirados das distâncias a algumas salas de referência (landmarks).
+"""
+
+import heapq
+import itertools
+import math
+import operator
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Retângulo [x1, x2) x [y1, y2)
+Rect = Tuple[int, int, int, int]
+
+# Salas de referência usadas pelo limite inferior do A* (route)
+LANDMARK_COUNT = 8
+
+
+def corridor_length(rects: Sequence[Rect]) -> int:
+    """
+    Comprimento de um corredor: área da união dos seus retângulos dividida
+    pela largura (o lado menor do retângulo mais estreito).
+    """
+    if not rects:
+        return 0
+
+    # Inclusão-exclusão (corredores têm poucos retângulos)
+    area = 0
+    for count in range(1, len(rects) + 1):
+        for combination in itertools.combinations(rects, count):
+            x1 = max(rect[0] for rect in combination)
+            y1 = max(rect[1] for rect in combination)
+            x2 = min(rect[2] for rect in combination)
+            y2 = min(rect[3] for rect in combination)
+            if x1 < x2 and y1 < y2:
+                area += (-1) ** (count + 1) * (x2 - x1) * (y2 - y1)
+
+    width = min(min(x2 - x1, y2 - y1) for x1, y1, x2, y2 in rects)
+    return max(1, round(area / width))
+
+
+class RoomGraph:
+    """Salas ligadas por corredores, com distâncias entre todos os pares."""
+
+    def __init__(self, room_count: int, edges: Sequence[Tuple[int, int, float, int]]):
+        """
+        Args:
+            room_count: Número de salas
+            edges: Arestas (sala i, sala j, peso, id do corredor); entre duas
+                salas fica só a aresta mais leve
+        """
+        self.room_count = room_count
+        self.edges: Dict[Tuple[int, int], Tuple[float, int]] = {}
+        self.adjacency: List[List[Tuple[int, float, int]]] = [[] for _ in range(room_count)]
+
+        for i, j, weight, corridor_id in edges:
+            if i == j:
+                continue
+            key = (min(i, j), max(i, j))
+            if key not in self.edges or weight < self.edges[key][0]:
+                self.edges[key] = (weight, corridor_id)
+
+        for (i, j), (weight, corridor_id) in self.edges.items():
+            self.adjacency[i].append((j, weight, corridor_id))
+            self.adjacency[j].append((i, weight, corridor_id))
+
+        self.distances = None  # distances[i][j] (inf se não houver rota)
+        self.next_room = None  # next_room[i][j]: primeira sala após i na rota até j (-1 sem rota)
+        self.landmarks: Optional[List[Optional[Tuple[float, ...]]]] = None  # Distâncias de cada sala aos landmarks
+
+    @classmethod
+    def from_generator(cls, generator) -> 'RoomGraph':
+        """Monta o grafo da mansão atual de um HauntedMansionGenerator."""
+        generator.room_adjacency  # Garante corridor_rooms montado
+        edges = []
+        for corridor_id, rooms in enumerate(generator.corridor_rooms):
+            if len(rooms) < 2:
+                continue
+            weight = corridor_length(generator.corridor_rects[corridor_id])
+            for i, j in itertools.combinations(rooms, 2):
+                edges.append((i, j, weight, corridor_id))
+        return cls(len(generator.rooms), edges)
+
+    def neighbours(self, room_id: int) -> List[Tuple[int, float, int]]:
+        """Salas vizinhas como (sala, peso, id do corredor)."""
+        return self.adjacency[room_id]
+
+    def compute_distances(self):
+        """Calcula (uma vez) as distâncias e próximos saltos entre todos os pares."""
+        if self.distances is not None:
+            return
+        # Grafo esparso (poucas arestas por sala): Dijkstra por origem é mais
+        # rápido que Floyd–Warshall, O(V * E log V) contra O(V³)
+        self._all_dijkstra()
+
+    def _all_dijkstra(self):
+        """Dijkstra a partir de cada sala."""
+        self.distances = []
+        self.next_room = []
+        for source in range(self.room_count):
+            distances, first_hop = self._dijkstra(source)
+            self.distances.append(distances)
+            self.next_room.append(first_hop)
+
+    def _dijkstra(self, source: int) -> Tuple[List[float], List[int]]:
+        """Distâncias e primeiro salto de source até cada sala."""
+        distances = [math.inf] * self.room_count
+        first_hop = [-1] * self.room_count
+        distances[source] = 0
+        first_hop[source] = source
+        heap = [(0, source)]
+        while heap:
+            distance, room = heapq.heappop(heap)
+            if distance > distances[room]:
+                continue
+            for neighbour, weight, _ in self.adjacency[room]:
+                candidate = distance + weight
+                if candidate < distances[neighbour]:
+                    distances[neighbour] = candidate
+                    first_hop[neighbour] = neighbour if room == source else first_hop[room]
+                    heapq.heappush(heap, (candidate, neighbour))
+        return distances, first_hop
+
+    def distances_from(self, source: int) -> List[float]:
+        """Distâncias de uma sala a todas as outras (usa a tabela se já calculada)."""
+        if self.distances is not None:
+            return self.distances[source]
+        return self._dijkstra(source)[0]
+
+    def prepare_landmarks(self, count: int = LANDMARK_COUNT):
+        """
+        Escolhe (uma vez) as salas de referência do A*: cada uma é a mais
+        distante das já escolhidas, o que espalha os landmarks pelas bordas
+        da mansão. Custa count buscas de Dijkstra.
+        """
+        if self.landmarks is not None:
+            return
+        columns = []
+        if self.room_count:
+            # Menor distância de cada sala aos landmarks escolhidos (inf = outro componente)
+            nearest = self._dijkstra(0)[0]
+            for _ in range(min(count, self.room_count)):
+                landmark = max((distance, room) for room, distance in enumerate(nearest)
+                               if distance != math.inf)[1]
+                distances = self._dijkstra(landmark)[0]
+                columns.append(distances)
+                nearest = [min(a, b) for a, b in zip(nearest, distances)]
+        # Uma tupla de distâncias por sala; None fora do componente dos landmarks
+        self.landmarks = [None if not vector or vector[0] == math.inf else vector
+                          for vector in zip(*columns)] if columns else [None] * self.room_count
+
+    def _lower_bound(self, room: int, target: int) -> float:
+        """Limite inferior ALT da distância entre duas salas (inf se desconectadas)."""
+        a = self.landmarks[room]
+        b = self.landmarks[target]
+        if a is None or b is None:
+            return 0 if a is b else math.inf  # Só um deles alcança os landmarks
+        return max(map(abs, map(operator.sub, a, b)))
+
+    def route(self, sources: Dict[int, float], targets: Dict[int, float]) -> Optional[Tuple[float, List[int]]]:
+        """
+        Rota mais curta de qualquer sala de sources até qualquer sala de targets.
+
+        Args:
+            sources: Sala de partida -> custo para chegar nela
+            targets: Sala de chegada -> custo para sair dela até o destino
+
+        Returns:
+            (custo total, salas da rota), ou None se não houver rota
+        """
+        self.prepare_landmarks()
+        bounds: Dict[int, float] = {}
+
+        def heuristic(room: int) -> float:
+            bound = bounds.get(room)
+            if bound is None:
+                bound = min(self._lower_bound(room, target) + cost for target, cost in targets.items())
+                bounds[room] = bound
+            return bound
+
+        cost: Dict[int, float] = {}
+        came_from: Dict[int, int] = {}
+        heap = []
+        for room, distance in sources.items():
+            if distance < cost.get(room, math.inf):
+                cost[room] = distance
+                heapq.heappush(heap, (distance + heuristic(room), distance, room))
+
+        best = None  # (custo total, sala de chegada)
+        while heap:
+            estimate, distance, room = heapq.heappop(heap)
+            if best is not None and estimate >= best[0]:
+                break
+            if distance > cost[room]:
+                continue
+            if room in targets and (best is None or distance + targets[room] < best[0]):
+                best = (distance + targets[room], room)
+            for neighbour, weight, _ in self.adjacency[room]:
+                candidate = distance + weight
+                if candidate < cost.get(neighbour, math.inf):
+                    bound = heuristic(neighbour)
+                    if bound == math.inf:
+                        continue
+                    cost[neighbour] = candidate
+                    came_from[neighbour] = room
+                    heapq.heappush(heap, (candidate + bound, candidate, neighbour))
+
+        if best is None:
+            return None
+        rooms = [best[1]]
+        while rooms[-1] in came_from:
+            rooms.append(came_from[rooms[-1]])
+        return best[0], rooms[::-1]
+
+    def distance(self, start: int, goal: int) -> float:
+        """Distância (soma dos corredores percorridos) entre duas salas."""
+        self.compute_distances()
+        return float(self.distances[start][goal])
+
+    def path(self, start: int, goal: int) -> Optional[List[int]]:
+        """Sequência de salas da rota mais curta, ou None se não houver rota."""
+        self.compute_distances()
+        if self.next_room[start][goal] < 0:
+            return None
+        rooms = [start]
+        while rooms[-1] != goal:
+            rooms.append(int(self.next_room[rooms[-1]][goal]))
+        return rooms
@@ -0,0 +1,87 @@
+"""
+Índice espacial de salas
+========================
+
+Grid uniforme de buckets sobre os retângulos das salas já posicionadas.
+Cada sala é registrada nos buckets cobertos pelo seu retângulo expandido
+pela margem mínima, então uma candidata só precisa ser comparada com as
+salas dos buckets que ela mesma cobre.
+"""
+
+from typing import Dict, Iterator, List, Tuple
+
+
+class RoomSpatialIndex:
+    """Índice em grid uniforme para consultas de colisão e vizinhança entre salas."""
+
+    def __init__(self, cell_size: int = 24, margin: int = 3):
+        """
+        Inicializa o índice.
+
+        Args:
+            cell_size: Tamanho (em células do mapa) de cada bucket
+            margin: Distância mínima (Manhattan) exigida entre salas
+        """
+        self.cell_size = cell_size
+        self.margin = margin
+        self.rooms = []
+        self.buckets: Dict[Tuple[int, int], List] = {}
+        self.extent = 0  # Maior coordenada coberta pelas salas registradas
+
+    def __len__(self) -> int:
+        return len(self.rooms)
+
+    def _bucket_range(self, x1: int, y1: int, x2: int, y2: int) -> Iterator[Tuple[int, int]]:
+        """Itera os buckets que cobrem o retângulo [x1, x2) x [y1, y2)."""
+        size = self.cell_size
+        for by in range(y1 // size, (y2 - 1) // size + 1):
+            for bx in range(x1 // size, (x2 - 1) // size + 1):
+                yield (bx, by)
+
+    def insert(self, room):
+        """Registra uma sala nos buckets do seu retângulo expandido pela margem."""
+        self.rooms.append(room)
+        self.extent = max(self.extent, room.x + room.width, room.y + room.height)
+        # Salas a distância < margem estão a menos de margem em cada eixo
+        expand = self.margin
+        for key in self._bucket_range(room.x - expand, room.y - expand,
+                                      room.x + room.width + expand,
+                                      room.y + room.height + expand):
+            self.buckets.setdefault(key, []).append(room)
+
+    def candidates(self, x: int, y: int, width: int, height: int) -> Iterator:
+        """Itera (sem repetição) as salas registradas nos buckets do retângulo."""
+        seen = set()
+        for key in self._bucket_range(x, y, x + width, y + height):
+            for room in self.buckets.get(key, ()):
+                if id(room) not in seen:
+                    seen.add(id(room))
+                    yield room
+
+    def collides(self, room) -> bool:
+        """Verifica se a sala intersecta ou fica a menos da margem de alguma sala do índice."""
+        for other in self.candidates(room.x, room.y, room.width, room.height):
+            if room.distance_to(other) < self.margin:
+                return True
+        return False
+
+    def nearby(self, room, radius: int) -> List:
+        """Retorna as salas (exceto a própria) a distância <= radius da sala."""
+        # Os buckets já guardam as salas expandidas pela margem
+        reach = max(0, radius + 1 - self.margin)
+        return [other for other in self.candidates(room.x - reach, room.y - reach,
+                                                    room.width + 2 * reach,
+                                                    room.height + 2 * reach)
+                if other is not room and room.distance_to(other) <= radius]
+
+    def nearest(self, room, k: int) -> List:
+        """Retorna as k salas mais próximas (distância Manhattan entre bordas)."""
+        radius = self.cell_size
+        while True:
+            found = self.nearby(room, radius)
+            # Todas as salas fora do raio estão mais longe que as encontradas
+            if len(found) >= k or radius > self.extent:
+                break
+            radius *= 2
+        found.sort(key=room.distance_to)
+        return found[:k]
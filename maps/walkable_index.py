@@ -0,0 +1,221 @@
+"""
+Índice de células caminháveis
+=============================
+
+Guarda, para uma mansão gerada, as células de chão e corredor em arrays
+planos (id = y * largura + x) e os buckets de cada sala e de cada
+corredor, para sortear posições de spawn, monstros e itens em O(1) sem
+varrer o mapa. O bucket de uma sala é o seu retângulo, ou a lista das
+células abertas dele quando há paredes dentro (prefabs, desgaste).
+"""
+
+import itertools
+import random
+from array import array
+from typing import Callable, Dict, Hashable, List, Optional, Sequence, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .map_generator import CELL_CORRIDOR, CELL_WALL, Room
+
+# Retângulo [x1, x2) x [y1, y2)
+Rect = Tuple[int, int, int, int]
+
+# Modos de peso (funções) guardados antes de esvaziar o cache de pesos acumulados
+ROOM_WEIGHT_CACHE_LIMIT = 32
+
+
+class WalkableIndex:
+    """Células caminháveis de uma mansão, com buckets por sala e por corredor."""
+
+    def __init__(self, map_width: int, map_height: int, rooms: Sequence[Room],
+                 corridors: Sequence[Sequence[Rect]], cells, corridor_cells,
+                 room_open_cells: Optional[Dict[int, Sequence[int]]] = None):
+        """
+        Args:
+            map_width: Largura do mapa
+            map_height: Altura do mapa
+            rooms: Salas da mansão (bucket de cada sala = seu retângulo)
+            corridors: Retângulos cavados por cada corredor
+            cells: Ids planos de todas as células caminháveis
+            corridor_cells: Ids planos das células de corredor
+            room_open_cells: Ids planos das células abertas das salas com
+                paredes dentro do retângulo (sala -> ids); as demais salas
+                são sorteadas direto do retângulo
+        """
+        self.map_width = map_width
+        self.map_height = map_height
+        self.rooms = list(rooms)
+        self.corridors = [list(rects) for rects in corridors]
+        self.cells = cells
+        self.corridor_cells = corridor_cells
+        self.room_open_cells = dict(room_open_cells or {})
+
+        # Pesos acumulados das salas por modo de peso (None = células abertas), montados uma vez por modo
+        self._room_weights: Dict[Hashable, List[float]] = {
+            None: list(itertools.accumulate(self.room_area(room_id) for room_id in range(len(self.rooms))))}
+
+        # Ids únicos das células de cada corredor (os retângulos se sobrepõem nas
+        # curvas e cruzamentos), montados na primeira vez que o corredor é sorteado
+        self._corridor_cell_ids: Dict[int, List[int]] = {}
+
+    @classmethod
+    def from_map(cls, map_data, rooms: Sequence[Room] = (),
+                 corridors: Sequence[Sequence[Rect]] = ()) -> 'WalkableIndex':
+        """
+        Monta o índice a partir do mapa (lista 2D, ndarray ou PackedMap).
+
+        Lê o mapa final em vez de somar os retângulos cavados: prefabs,
+        desgaste e o reparo de conectividade mudam células depois de cavar,
+        e a varredura vetorizada custa poucos ms mesmo em 1024x1024.
+        """
+        map_height = len(map_data)
+        map_width = len(map_data[0]) if map_height else 0
+
+        if np is not None:
+            if hasattr(map_data, "to_grid"):
+                grid = map_data.to_grid()
+            else:
+                grid = np.asarray(map_data, dtype=np.uint8).reshape(map_height, map_width)
+            flat = grid.reshape(-1)
+            cells = np.flatnonzero(flat != CELL_WALL).astype(np.uint32)
+            corridor_cells = np.flatnonzero(flat == CELL_CORRIDOR).astype(np.uint32)
+
+            # Salas com paredes dentro (prefabs, desgaste): bucket = células abertas
+            room_open_cells = {}
+            for room_id, room in enumerate(rooms):
+                block = grid[room.y:room.y + room.height, room.x:room.x + room.width] != CELL_WALL
+                if not block.all():
+                    ys, xs = np.nonzero(block)
+                    room_open_cells[room_id] = ((ys + room.y) * map_width + xs + room.x).astype(np.uint32)
+        else:
+            cells = array("I")
+            corridor_cells = array("I")
+            for y, row in enumerate(map_data):
+                base = y * map_width
+                cells.extend(base + x for x, cell in enumerate(row) if cell != CELL_WALL)
+                corridor_cells.extend(base + x for x, cell in enumerate(row) if cell == CELL_CORRIDOR)
+
+            room_open_cells = {}
+            for room_id, room in enumerate(rooms):
+                open_cells = array("I")
+                for y in range(room.y, room.y + room.height):
+                    row = map_data[y]
+                    open_cells.extend(y * map_width + x for x in range(room.x, room.x + room.width)
+                                      if row[x] != CELL_WALL)
+                if len(open_cells) < room.width * room.height:
+                    room_open_cells[room_id] = open_cells
+
+        return cls(map_width, map_height, rooms, corridors, cells, corridor_cells, room_open_cells)
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    def room_area(self, room_id: int) -> int:
+        """Número de células abertas da sala."""
+        open_cells = self.room_open_cells.get(room_id)
+        if open_cells is not None:
+            return len(open_cells)
+        room = self.rooms[room_id]
+        return room.width * room.height
+
+    def _to_position(self, cell_id: int) -> Tuple[int, int]:
+        y, x = divmod(int(cell_id), self.map_width)
+        return (x, y)
+
+    def random_cell(self, rng: random.Random = random) -> Optional[Tuple[int, int]]:
+        """Sorteia uma célula caminhável qualquer (uniforme)."""
+        if not len(self.cells):
+            return None
+        return self._to_position(self.cells[rng.randrange(len(self.cells))])
+
+    def random_corridor_cell(self, rng: random.Random = random,
+                             corridor_id: Optional[int] = None) -> Optional[Tuple[int, int]]:
+        """Sorteia uma célula de corredor (de um corredor específico, se informado)."""
+        if corridor_id is None:
+            if not len(self.corridor_cells):
+                return None
+            return self._to_position(self.corridor_cells[rng.randrange(len(self.corridor_cells))])
+
+        cells = self._corridor_cells(corridor_id)
+        if not cells:
+            return None
+        return self._to_position(cells[rng.randrange(len(cells))])
+
+    def _corridor_cells(self, corridor_id: int) -> List[int]:
+        """Ids das células do corredor, sem repetir as cobertas por mais de um retângulo."""
+        cells = self._corridor_cell_ids.get(corridor_id)
+        if cells is None:
+            width = self.map_width
+            unique = set()
+            for x1, y1, x2, y2 in self.corridors[corridor_id]:
+                for y in range(y1, y2):
+                    unique.update(range(y * width + x1, y * width + x2))
+            cells = sorted(unique)
+            self._corridor_cell_ids[corridor_id] = cells
+        return cells
+
+    def _cumulative_room_weights(self, weights: Union[None, Dict[str, float], Callable[[Room], float]]
+                                 ) -> List[float]:
+        """Pesos acumulados das salas para o modo de peso (calculados uma vez por modo)."""
+        key = weights if weights is None or callable(weights) else tuple(sorted(weights.items()))
+        cumulative = self._room_weights.get(key)
+        if cumulative is None:
+            if callable(weights):
+                room_weights = (weights(room) for room in self.rooms)
+            else:
+                room_weights = (weights.get(room.room_type, 0) for room in self.rooms)
+            cumulative = list(itertools.accumulate(room_weights))
+            if len(self._room_weights) > ROOM_WEIGHT_CACHE_LIMIT:
+                self._room_weights = {None: self._room_weights[None]}
+            self._room_weights[key] = cumulative
+        return cumulative
+
+    def random_room_cell(self, rng: random.Random = random, room_id: Optional[int] = None,
+                         weights: Union[None, Dict[str, float], Callable[[Room], float]] = None
+                         ) -> Optional[Tuple[int, int]]:
+        """
+        Sorteia uma célula dentro de uma sala.
+
+        Args:
+            rng: Gerador aleatório
+            room_id: Sala específica (None sorteia a sala)
+            weights: Peso de cada sala ao sortear: None = proporcional às
+                células abertas (uniforme sobre as células das salas), dict por room_type ou
+                função que recebe a Room (deve ser determinística: os pesos
+                de cada modo são calculados uma vez e reaproveitados)
+
+        Returns:
+            Posição (x, y) caminhável ou None se não houver salas (ou se
+            nenhuma sala tiver peso positivo)
+        """
+        if not self.rooms:
+            return None
+
+        if room_id is None:
+            cumulative = self._cumulative_room_weights(weights)
+            if cumulative[-1] <= 0:
+                return None
+            # Busca binária nos pesos acumulados: O(log salas) por sorteio
+            room_id = rng.choices(range(len(self.rooms)), cum_weights=cumulative)[0]
+
+        open_cells = self.room_open_cells.get(room_id)
+        if open_cells is not None:
+            if not len(open_cells):
+                return None
+            return self._to_position(open_cells[rng.randrange(len(open_cells))])
+        room = self.rooms[room_id]
+        return (rng.randrange(room.x, room.x + room.width),
+                rng.randrange(room.y, room.y + room.height))
+
+    def room_cells(self, room_id: int) -> List[Tuple[int, int]]:
+        """Lista as células abertas de uma sala."""
+        open_cells = self.room_open_cells.get(room_id)
+        if open_cells is not None:
+            return [self._to_position(cell_id) for cell_id in open_cells]
+        room = self.rooms[room_id]
+        return [(x, y) for y in range(room.y, room.y + room.height)
+                for x in range(room.x, room.x + room.width)]
@@ -2,6 +2,10 @@
 UI module - Interface do usuário
 """
 
+from .chat_layout import ChatLayout
 from .interface import GameInterface
+from .map_renderer import ChunkMapRenderer, MapRenderer
+from .panels import CachedPanel
+from .text_renderer import TextRenderer
 
-__all__ = ['GameInterface'] 
\ No newline at end of file
+__all__ = ['GameInterface', 'MapRenderer', 'ChunkMapRenderer', 'CachedPanel', 'TextRenderer', 'ChatLayout'] 
\ No newline at end of file
@@ -0,0 +1,146 @@
+"""
+Diagramação do chat com quebra de linha memorizada e rolagem virtualizada
+"""
+
+from bisect import bisect_right
+from typing import Iterator, List, Tuple
+
+from core.constants import COLOR_WHITE, COLOR_YELLOW
+
+# Quebra de linha do chat (caracteres por linha com o texto grande)
+CHAT_WRAP_CHARS = 20
+
+# Métricas verticais: remetente, cada linha de texto e espaço após a mensagem
+LINE_HEIGHT = 12
+MESSAGE_GAP = 16
+GLYPH_HEIGHT = 6
+
+
+def wrap_text(text: str, limit: int = CHAT_WRAP_CHARS) -> List[str]:
+    """Quebra o texto em linhas de menos de limit caracteres (palavras inteiras)."""
+    lines = []
+    words = []
+    length = 0
+    for word in text.split():
+        if words and length + len(word) >= limit:
+            lines.append(" ".join(words))
+            words = []
+            length = 0
+        words.append(word)
+        length += len(word) + 1
+    if words:
+        lines.append(" ".join(words))
+    return lines
+
+
+class ChatLayout:
+    """
+    Linhas já quebradas de cada mensagem do chat e a posição vertical de
+    cada uma no histórico.
+
+    Cada mensagem é quebrada uma única vez, quando chega; as posições
+    acumuladas permitem achar por busca binária a primeira mensagem da
+    janela visível, então desenhar um frame custa só as linhas visíveis,
+    não importa o tamanho do histórico.
+    """
+
+    def __init__(self, wrap_chars: int = CHAT_WRAP_CHARS):
+        self.wrap_chars = wrap_chars
+        self.base_id = 0  # Id da mensagem em self.senders[0]
+        self.start = 0  # Índice da mensagem mais antiga ainda no histórico
+        self.senders: List[str] = []
+        self.lines: List[List[str]] = []
+        self.tops = [0]  # Topo de cada mensagem (e o fim da última) em pixels
+        self.next_id = 0
+
+    def __len__(self) -> int:
+        return len(self.senders) - self.start
+
+    def add(self, message_id: int, sender: str, text: str) -> int:
+        """
+        Diagrama uma mensagem nova (ids consecutivos).
+
+        Returns:
+            Altura da mensagem em pixels
+        """
+        if not self.senders:
+            self.base_id = message_id
+        lines = wrap_text(text, self.wrap_chars)
+        height = LINE_HEIGHT * max(1, len(lines)) + MESSAGE_GAP
+        self.senders.append(f"{sender}:")
+        self.lines.append(lines)
+        self.tops.append(self.tops[-1] + height)
+        self.next_id = message_id + 1
+        return height
+
+    def sync(self, messages) -> int:
+        """
+        Diagrama as mensagens ainda não vistas e esquece as que saíram do histórico.
+
+        Args:
+            messages: Mensagens do chat em ordem (dicts com 'id', 'sender' e 'message')
+
+        Returns:
+            Altura total adicionada em pixels
+        """
+        if not messages:
+            return 0
+
+        # Só as mensagens novas, percorrendo a partir do fim
+        new = []
+        for message in reversed(messages):
+            if message['id'] < self.next_id:
+                break
+            new.append(message)
+        added = sum(self.add(message['id'], message['sender'], message['message'])
+                    for message in reversed(new))
+
+        self.trim(messages[0]['id'])
+        return added
+
+    def trim(self, oldest_id: int):
+        """Esquece as mensagens com id menor que oldest_id."""
+        self.start = max(self.start, min(oldest_id - self.base_id, len(self.senders)))
+        # Compacta as listas de vez em quando (custo amortizado constante)
+        if self.start > 1024 and self.start * 2 > len(self.senders):
+            del self.senders[:self.start]
+            del self.lines[:self.start]
+            del self.tops[:self.start]
+            self.base_id += self.start
+            self.start = 0
+
+    @property
+    def content_height(self) -> int:
+        """Altura do histórico inteiro em pixels."""
+        return self.tops[-1] - self.tops[self.start]
+
+    def max_scroll(self, view_height: int) -> int:
+        """Maior deslocamento de rolagem (a partir do fim) que ainda mostra conteúdo."""
+        return max(0, self.content_height - view_height)
+
+    def visible_lines(self, scroll: int, view_height: int) -> Iterator[Tuple[int, str, int]]:
+        """
+        Linhas inteiramente dentro da janela visível.
+
+        Args:
+            scroll: Pixels rolados a partir do fim do histórico (0 = mais recentes)
+            view_height: Altura da janela em pixels
+
+        Returns:
+            Iterador de (y relativo à janela, texto, cor)
+        """
+        first_top = self.tops[self.start]
+        # Histórico menor que a janela fica alinhado ao topo
+        window_top = max(first_top, self.tops[-1] - scroll - view_height)
+        window_bottom = window_top + view_height
+
+        index = max(self.start, bisect_right(self.tops, window_top, lo=self.start) - 1)
+        while index < len(self.senders) and self.tops[index] < window_bottom:
+            y = self.tops[index] - window_top
+            if 0 <= y and y + GLYPH_HEIGHT <= view_height:
+                yield y, self.senders[index], COLOR_YELLOW
+            for line in self.lines[index]:
+                y += LINE_HEIGHT
+                if 0 <= y and y + GLYPH_HEIGHT <= view_height:
+                    yield y, line, COLOR_WHITE
+            index += 1
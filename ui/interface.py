@@ -5,17 +5,18 @@ Interface principal do jogo
 import pyxel
 from typing import List, Dict, Tuple
 from core.constants import *
+from .map_renderer import ChunkMapRenderer, FogRenderer, MapRenderer
+from .chat_layout import LINE_HEIGHT, ChatLayout
+from .panels import CachedPanel
+from .text_renderer import text_renderer
 
-def draw_large_text(x: int, y: int, text: str, color: int):
-    """Desenha texto em tamanho maior."""
-    for i, char in enumerate(text):
-        pyxel.text(x + i * 6, y, char, color)
+def draw_large_text(x: int, y: int, text: str, color: int, surface=pyxel):
+    """Desenha texto em tamanho maior (na tela ou em uma pyxel.Image) com um blt por string."""
+    text_renderer.draw(x, y, text, color, surface=surface)
 
-def draw_large_text_centered(x: int, y: int, text: str, color: int, width: int):
+def draw_large_text_centered(x: int, y: int, text: str, color: int, width: int, surface=pyxel):
     """Desenha texto centralizado em tamanho maior."""
-    text_width = len(text) * 6
-    start_x = x + (width - text_width) // 2
-    draw_large_text(start_x, y, text, color)
+    text_renderer.draw_centered(x, y, text, color, width, surface=surface)
 
 
 class GameInterface:
@@ -61,6 +62,30 @@ class GameInterface:
             {"text": "Descansar", "key": "R", "action": ACTION_REST},
             {"text": "Inventário", "key": "TAB", "action": ACTION_OPEN_INVENTORY}
         ]
+        
+        # Mapa rasterizado em cache (reconstruído só quando o mapa muda)
+        self.map_renderer = MapRenderer(scale=MAP_SCALE)
+        self.chunk_renderer = ChunkMapRenderer(scale=MAP_SCALE)
+        self.fog_renderer = FogRenderer(scale=MAP_SCALE)
+        
+        # Chat: mensagens quebradas uma vez e rolagem em pixels a partir das mais recentes
+        self.chat_layout = ChatLayout()
+        self.chat_scroll = 0
+        self.chat_view_y = 30
+        self.chat_view_height = self.chat_height - 40
+        
+        # Painéis em imagens offscreen, redesenhados só quando as entradas mudam
+        self.chat_panel = CachedPanel(self.chat_x, self.chat_y, self.chat_width, self.chat_height,
+                                      self._draw_chat, self._chat_key)
+        self.status_panel = CachedPanel(self.status_x, self.status_y, self.status_width,
+                                        self.status_height, self._draw_status,
+                                        lambda game_state: tuple(game_state.get_player_status().values()))
+        self.actions_panel = CachedPanel(self.actions_x, self.actions_y, self.actions_width,
+                                         self.actions_height, self._draw_actions, self._actions_key)
+        self.inventory_panel = CachedPanel(self.inventory_x, self.inventory_y, self.inventory_width,
+                                           self.inventory_height, self._draw_inventory_summary,
+                                           lambda game_state: None)
+        self.panels = [self.chat_panel, self.status_panel, self.actions_panel, self.inventory_panel]
     
     def draw(self, game_state):
         """Desenha a interface completa."""
@@ -70,168 +95,153 @@ class GameInterface:
         # Desenha área do jogo
         self._draw_game_area(game_state)
         
-        # Desenha chat
-        self._draw_chat(game_state)
-        
-        # Desenha status
-        self._draw_status(game_state)
-        
-        # Desenha ações
-        self._draw_actions(game_state)
-        
-        # Desenha inventário resumido
-        self._draw_inventory_summary(game_state)
+        # Chat, status, ações e inventário resumido: um blt por painel
+        for panel in self.panels:
+            panel.draw(game_state)
+    
+    def _chat_key(self, game_state):
+        """Entradas do painel do chat: mensagens diagramadas e posição da rolagem."""
+        added = self.chat_layout.sync(game_state.chat_messages)
+        # Rolado para cima, a janela fica parada enquanto chegam mensagens
+        if added and self.chat_scroll:
+            self.chat_scroll = min(self.chat_scroll + added,
+                                   self.chat_layout.max_scroll(self.chat_view_height))
+        return (game_state.chat_revision, self.chat_scroll)
+    
+    def handle_scroll(self, game_state, x: int, y: int, wheel: int) -> bool:
+        """Rola o histórico do chat com a roda do mouse (wheel > 0 = mensagens antigas)."""
+        if not (self.chat_x <= x < self.chat_x + self.chat_width and
+                self.chat_y <= y < self.chat_y + self.chat_height):
+            return False
+        self.chat_layout.sync(game_state.chat_messages)
+        max_scroll = self.chat_layout.max_scroll(self.chat_view_height)
+        self.chat_scroll = max(0, min(max_scroll, self.chat_scroll + wheel * 3 * LINE_HEIGHT))
+        return True
+    
+    def handle_zoom(self, game_state, x: int, y: int, wheel: int) -> bool:
+        """Muda o zoom do mapa com a roda do mouse sobre a área do jogo (wheel > 0 = aproxima)."""
+        camera = game_state.camera
+        if not camera.contains_screen(x, y):
+            return False
+        return camera.set_scale(camera.scale + wheel)
+    
+    def _actions_key(self, game_state):
+        """Entradas do painel de ações: quais botões visíveis estão habilitados."""
+        return tuple(game_state.player.can_perform_action(button["action"])
+                     for button in self.action_buttons[:3])
     
     def _draw_game_area(self, game_state):
         """Desenha a área principal do jogo."""
-        # Desenha o mapa
-        map_data = game_state.get_map_data()
-        player_x, player_y = game_state.player.get_position()
-        
-        # Calcula offset da câmera para centralizar o jogador
-        camera_x = max(0, min(player_x - self.game_area_width // 2, len(map_data[0]) - self.game_area_width))
-        camera_y = max(0, min(player_y - self.game_area_height // 2, len(map_data) - self.game_area_height))
+        camera = game_state.update_camera()
+        
+        # Zoom mudou: as imagens do mapa são refeitas na nova escala
+        if camera.scale != self.map_renderer.scale:
+            self.map_renderer = MapRenderer(scale=camera.scale)
+            self.chunk_renderer = ChunkMapRenderer(scale=camera.scale)
+            self.fog_renderer = FogRenderer(scale=camera.scale)
+        
+        if game_state.chunk_manager is not None:
+            # Mundo infinito: um blt por chunk visível
+            self.chunk_renderer.draw(game_state.chunk_manager, *camera.visible_rect())
+        else:
+            # Desenha o mapa visível com zoom (um único blt da imagem em cache)
+            self.map_renderer.draw(game_state.get_map_data(), *camera.visible_rect())
+            
+            # Névoa de guerra por cima (repintada só quando a visão muda)
+            if game_state.fov is not None:
+                self.fog_renderer.draw(game_state.fov, *camera.visible_rect())
         
-        # Desenha o mapa visível com zoom
-        scale = 3  # Aumenta o tamanho do mapa
-        for y in range(self.game_area_height // scale):
-            for x in range(self.game_area_width // scale):
-                map_x = camera_x + x
-                map_y = camera_y + y
-                
-                if (0 <= map_x < len(map_data[0]) and 
-                    0 <= map_y < len(map_data)):
-                    
-                    cell = map_data[map_y][map_x]
-                    
-                    if cell == CELL_WALL:
-                        pyxel.rect(x * scale, y * scale, scale, scale, COLOR_GRAY)
-                    elif cell == CELL_FLOOR:
-                        pyxel.rect(x * scale, y * scale, scale, scale, COLOR_BROWN)
-                    elif cell == CELL_CORRIDOR:
-                        pyxel.rect(x * scale, y * scale, scale, scale, COLOR_BROWN)
-        
-        # Desenha o jogador
-        player_screen_x = player_x - camera_x
-        player_screen_y = player_y - camera_y
-        
-        if (0 <= player_screen_x < self.game_area_width // scale and 
-            0 <= player_screen_y < self.game_area_height // scale):
-            pyxel.rect(player_screen_x * scale, player_screen_y * scale, scale, scale, COLOR_RED)
+        # Desenha o jogador (só se estiver na janela da câmera)
+        player_x, player_y = game_state.player.get_position()
+        if camera.is_visible(player_x, player_y):
+            screen_x, screen_y = camera.world_to_screen(player_x, player_y)
+            pyxel.rect(screen_x, screen_y, camera.scale, camera.scale, COLOR_RED)
     
-    def _draw_chat(self, game_state):
-        """Desenha o chat de eventos."""
+    def _draw_chat(self, surface, game_state):
+        """Desenha o chat de eventos na imagem do painel."""
         # Fundo do chat
-        pyxel.rect(self.chat_x, self.chat_y, self.chat_width, self.chat_height, COLOR_DARK_BLUE)
+        surface.rect(0, 0, self.chat_width, self.chat_height, COLOR_DARK_BLUE)
         
         # Título do chat
-        draw_large_text(self.chat_x + 5, 5, "Chat do Mestre", COLOR_WHITE)
+        draw_large_text(5, 5, "Chat do Mestre", COLOR_WHITE, surface)
         
         # Linha separadora
-        pyxel.line(self.chat_x, 20, self.chat_x + self.chat_width - 1, 20, COLOR_WHITE)
+        surface.line(0, 20, self.chat_width - 1, 20, COLOR_WHITE)
         
-        # Mensagens do chat
-        messages = game_state.get_recent_chat_messages(10)  # Menos mensagens para texto maior
-        y_offset = 30
-        
-        for message in messages:
-            sender = message['sender']
-            text = message['message']
-            
-            # Nome do remetente
-            draw_large_text(self.chat_x + 5, y_offset, f"{sender}:", COLOR_YELLOW)
-            
-            # Quebra o texto em linhas
-            words = text.split()
-            line = ""
-            line_y = y_offset + 12
-            
-            for word in words:
-                if len(line + word) < 20:  # Limite menor para texto maior
-                    line += word + " "
-                else:
-                    draw_large_text(self.chat_x + 5, line_y, line, COLOR_WHITE)
-                    line = word + " "
-                    line_y += 12
-            
-            if line:
-                draw_large_text(self.chat_x + 5, line_y, line, COLOR_WHITE)
-            
-            y_offset = line_y + 16
-            
-            if y_offset > self.chat_height - 30:
-                break
+        # Só as linhas dentro da janela visível (já quebradas pelo ChatLayout)
+        for line_y, line, color in self.chat_layout.visible_lines(self.chat_scroll, self.chat_view_height):
+            draw_large_text(5, self.chat_view_y + line_y, line, color, surface)
     
-    def _draw_status(self, game_state):
-        """Desenha o status do jogador."""
+    def _draw_status(self, surface, game_state):
+        """Desenha o status do jogador na imagem do painel."""
         # Fundo do status
-        pyxel.rect(self.status_x, self.status_y, self.status_width, self.status_height, COLOR_NAVY)
+        surface.rect(0, 0, self.status_width, self.status_height, COLOR_NAVY)
         
         # Informações do jogador
         status = game_state.get_player_status()
         
         # HP
         hp_text = f"HP: {status['hp']}/{status['max_hp']}"
-        draw_large_text(self.status_x + 5, self.status_y + 5, hp_text, COLOR_WHITE)
+        draw_large_text(5, 5, hp_text, COLOR_WHITE, surface)
         
         # Barra de HP
         hp_percentage = status['hp_percentage']
         hp_bar_width = int((self.status_width - 10) * hp_percentage)
-        pyxel.rect(self.status_x + 5, self.status_y + 20, hp_bar_width, 10, COLOR_RED)
-        pyxel.rect(self.status_x + 5, self.status_y + 20, self.status_width - 10, 10, COLOR_GRAY)
+        surface.rect(5, 20, hp_bar_width, 10, COLOR_RED)
+        surface.rect(5, 20, self.status_width - 10, 10, COLOR_GRAY)
         
         # Level e XP
         level_text = f"Level: {status['level']}"
-        draw_large_text(self.status_x + 5, self.status_y + 35, level_text, COLOR_WHITE)
+        draw_large_text(5, 35, level_text, COLOR_WHITE, surface)
         
         xp_text = f"XP: {status['experience']}"
-        draw_large_text(self.status_x + 5, self.status_y + 50, xp_text, COLOR_WHITE)
+        draw_large_text(5, 50, xp_text, COLOR_WHITE, surface)
         
         # Ouro
         gold_text = f"Ouro: {status['gold']}"
-        draw_large_text(self.status_x + 5, self.status_y + 65, gold_text, COLOR_YELLOW)
+        draw_large_text(5, 65, gold_text, COLOR_YELLOW, surface)
     
-    def _draw_actions(self, game_state):
-        """Desenha as ações disponíveis."""
+    def _draw_actions(self, surface, game_state):
+        """Desenha as ações disponíveis na imagem do painel."""
         # Fundo das ações
-        pyxel.rect(self.actions_x, self.actions_y, self.actions_width, self.actions_height, COLOR_PURPLE)
+        surface.rect(0, 0, self.actions_width, self.actions_height, COLOR_PURPLE)
         
         # Título
-        draw_large_text(self.actions_x + 5, self.actions_y + 5, "Ações", COLOR_WHITE)
+        draw_large_text(5, 5, "Ações", COLOR_WHITE, surface)
         
         # Botões de ação
-        button_y = self.actions_y + 25
+        button_y = 25
         for i, button in enumerate(self.action_buttons):
             if i < 3:  # Mostra apenas 3 botões por vez
                 # Fundo do botão
                 button_color = COLOR_GREEN if game_state.player.can_perform_action(button["action"]) else COLOR_GRAY
-                pyxel.rect(self.actions_x + 5, button_y, self.actions_width - 10, 25, button_color)
+                surface.rect(5, button_y, self.actions_width - 10, 25, button_color)
                 
                 # Texto do botão
-                draw_large_text(self.actions_x + 10, button_y + 5, button["text"], COLOR_WHITE)
-                draw_large_text(self.actions_x + 10, button_y + 18, f"({button['key']})", COLOR_WHITE)
+                draw_large_text(10, button_y + 5, button["text"], COLOR_WHITE, surface)
+                draw_large_text(10, button_y + 18, f"({button['key']})", COLOR_WHITE, surface)
                 
                 button_y += 30
     
-    def _draw_inventory_summary(self, game_state):
-        """Desenha o resumo do inventário."""
+    def _draw_inventory_summary(self, surface, game_state):
+        """Desenha o resumo do inventário na imagem do painel."""
         # Fundo do inventário
-        pyxel.rect(self.inventory_x, self.inventory_y, self.inventory_width, self.inventory_height, COLOR_BROWN)
+        surface.rect(0, 0, self.inventory_width, self.inventory_height, COLOR_BROWN)
         
         # Título
-        draw_large_text(self.inventory_x + 5, self.inventory_y + 5, "Inventário", COLOR_WHITE)
+        draw_large_text(5, 5, "Inventário", COLOR_WHITE, surface)
         
         # Itens disponíveis (simulação - será implementado depois)
         items = ["Espada", "Poção"]  # Placeholder
         
-        item_y = self.inventory_y + 25
+        item_y = 25
         for i, item in enumerate(items[:2]):  # Mostra apenas 2 itens
-            draw_large_text(self.inventory_x + 5, item_y, f"{i+1}. {item}", COLOR_WHITE)
+            draw_large_text(5, item_y, f"{i+1}. {item}", COLOR_WHITE, surface)
             item_y += 20
         
         # Botão para abrir inventário completo
-        pyxel.rect(self.inventory_x + 5, self.inventory_y + 65, self.inventory_width - 10, 25, COLOR_GREEN)
-        draw_large_text(self.inventory_x + 10, self.inventory_y + 70, "Abrir Inventário", COLOR_WHITE)
+        surface.rect(5, 65, self.inventory_width - 10, 25, COLOR_GREEN)
+        draw_large_text(10, 70, "Abrir Inventário", COLOR_WHITE, surface)
     
     def handle_click(self, x: int, y: int) -> str:
         """Processa cliques na interface."""
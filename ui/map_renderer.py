@@ -0,0 +1,216 @@
+"""
+Renderizador do mapa com cache em imagem offscreen
+"""
+
+import pyxel
+from typing import Dict, List, Optional, Tuple
+from core.constants import *
+
+# Cor de cada tipo de célula no mapa
+CELL_COLORS = {
+    CELL_WALL: COLOR_GRAY,
+    CELL_FLOOR: COLOR_BROWN,
+    CELL_CORRIDOR: COLOR_BROWN,
+    CELL_STAIRS_UP: COLOR_YELLOW,
+    CELL_STAIRS_DOWN: COLOR_ORANGE,
+}
+
+# Cor transparente da imagem da névoa de guerra
+FOG_CLEAR = COLOR_WHITE
+
+
+def rasterize_map(map_data: List[List[int]], scale: int) -> pyxel.Image:
+    """Desenha o mapa em uma nova imagem offscreen (scale pixels por célula)."""
+    map_height = len(map_data)
+    map_width = len(map_data[0]) if map_data else 0
+
+    image = pyxel.Image(max(1, map_width * scale), max(1, map_height * scale))
+    image.cls(COLOR_BLACK)
+
+    # Agrupa células vizinhas da mesma cor em um único rect por linha
+    for y, row in enumerate(map_data):
+        # Linhas que não são listas (ex.: PackedMap) são decodificadas de uma vez
+        if not isinstance(row, list):
+            row = list(row)
+        run_start = 0
+        run_color = CELL_COLORS.get(row[0]) if map_width else None
+        for x in range(1, map_width + 1):
+            color = CELL_COLORS.get(row[x]) if x < map_width else None
+            if x < map_width and color == run_color:
+                continue
+            if run_color is not None:
+                image.rect(run_start * scale, y * scale, (x - run_start) * scale, scale, run_color)
+            run_start = x
+            run_color = color
+
+    return image
+
+
+def blt_visible(image: pyxel.Image, map_width: int, map_height: int, scale: int,
+                camera_x: int, camera_y: int, view_width: int, view_height: int,
+                colkey: Optional[int] = None):
+    """Copia para a tela a janela visível de uma imagem do mapa inteiro (recortada às bordas)."""
+    src_x = max(0, camera_x)
+    src_y = max(0, camera_y)
+    width = min(view_width - (src_x - camera_x), map_width - src_x)
+    height = min(view_height - (src_y - camera_y), map_height - src_y)
+    if width <= 0 or height <= 0:
+        return
+
+    pyxel.blt((src_x - camera_x) * scale, (src_y - camera_y) * scale, image,
+              src_x * scale, src_y * scale, width * scale, height * scale, colkey)
+
+
+class MapRenderer:
+    """
+    Rasteriza o mapa uma única vez em uma pyxel.Image e desenha a área
+    visível com um só blt por frame.
+
+    A imagem só é reconstruída quando o map_data muda (outra lista ou
+    invalidate() chamado após alterações no próprio mapa).
+    """
+
+    def __init__(self, scale: int = 3):
+        self.scale = scale
+        self.image: Optional[pyxel.Image] = None
+        self._cached_map = None
+        self._map_width = 0
+        self._map_height = 0
+
+    def invalidate(self):
+        """Força a reconstrução da imagem no próximo draw."""
+        self._cached_map = None
+
+    def update(self, map_data: List[List[int]]):
+        """Reconstrói a imagem se o mapa mudou."""
+        if map_data is self._cached_map and self.image is not None:
+            return
+        self._rasterize(map_data)
+        self._cached_map = map_data
+
+    def _rasterize(self, map_data: List[List[int]]):
+        """Desenha o mapa inteiro na imagem offscreen."""
+        self._map_height = len(map_data)
+        self._map_width = len(map_data[0]) if map_data else 0
+        self.image = rasterize_map(map_data, self.scale)
+
+    def draw(self, map_data: List[List[int]], camera_x: int, camera_y: int,
+             view_width: int, view_height: int):
+        """
+        Desenha a parte visível do mapa na tela.
+
+        Args:
+            map_data: Dados do mapa
+            camera_x: Coluna do mapa no canto superior esquerdo
+            camera_y: Linha do mapa no canto superior esquerdo
+            view_width: Largura visível em células
+            view_height: Altura visível em células
+        """
+        self.update(map_data)
+        blt_visible(self.image, self._map_width, self._map_height, self.scale,
+                    camera_x, camera_y, view_width, view_height)
+
+
+class FogRenderer:
+    """
+    Névoa de guerra em uma imagem do tamanho do mapa, desenhada por cima
+    do mapa com um blt (a cor FOG_CLEAR é transparente).
+
+    Células nunca vistas ficam pretas e as já exploradas fora da visão
+    ficam escurecidas; a cada novo cálculo do FieldOfView só as células
+    que entraram ou saíram da visão são repintadas.
+    """
+
+    def __init__(self, scale: int = 3):
+        self.scale = scale
+        self.image: Optional[pyxel.Image] = None
+        self._fov = None
+        self._revision = -1
+
+        # Célula escurecida: xadrez de pixels pretos e transparentes
+        self._dim_tile = pyxel.Image(scale, scale)
+        self._dim_tile.cls(FOG_CLEAR)
+        for y in range(scale):
+            for x in range(scale):
+                if (x + y) % 2 == 0:
+                    self._dim_tile.pset(x, y, COLOR_BLACK)
+
+    def _paint(self, cell_id: int, visible: bool):
+        """Pinta uma célula como visível (transparente) ou explorada (escurecida)."""
+        scale = self.scale
+        y, x = divmod(cell_id, self._fov.map_width)
+        if visible:
+            self.image.rect(x * scale, y * scale, scale, scale, FOG_CLEAR)
+        else:
+            self.image.blt(x * scale, y * scale, self._dim_tile, 0, 0, scale, scale)
+
+    def update(self, fov):
+        """Atualiza a névoa com o último cálculo do campo de visão."""
+        if fov is self._fov and fov.revision == self._revision and self.image is not None:
+            return
+
+        if fov is self._fov and fov.revision == self._revision + 1 and self.image is not None:
+            # Um cálculo novo: repinta só quem saiu e quem entrou na visão
+            for cell_id in fov.previous_cells:
+                self._paint(cell_id, False)
+        else:
+            # Outro mapa (ou cálculos perdidos): refaz a imagem inteira
+            self._fov = fov
+            self.image = pyxel.Image(max(1, fov.map_width * self.scale),
+                                     max(1, fov.map_height * self.scale))
+            self.image.cls(COLOR_BLACK)
+            for cell_id in fov.explored_cells():
+                self._paint(cell_id, False)
+        for cell_id in fov.visible_cells:
+            self._paint(cell_id, True)
+        self._revision = fov.revision
+
+    def draw(self, fov, camera_x: int, camera_y: int, view_width: int, view_height: int):
+        """Desenha a névoa da janela visível (mesmos argumentos de MapRenderer.draw)."""
+        self.update(fov)
+        blt_visible(self.image, fov.map_width, fov.map_height, self.scale,
+                    camera_x, camera_y, view_width, view_height, FOG_CLEAR)
+
+
+class ChunkMapRenderer:
+    """
+    Desenha uma mansão em chunks com uma imagem em cache por chunk.
+
+    Cada chunk é rasterizado uma vez quando aparece; as imagens de chunks
+    descartados pelo ChunkManager são liberadas.
+    """
+
+    def __init__(self, scale: int = 3):
+        self.scale = scale
+        self.images: Dict[Tuple[int, int], Tuple[object, pyxel.Image]] = {}
+
+    def draw(self, chunk_manager, camera_x: int, camera_y: int,
+             view_width: int, view_height: int):
+        """
+        Desenha os chunks visíveis na tela.
+
+        Args:
+            chunk_manager: ChunkManager do mundo
+            camera_x: Coluna do mundo no canto superior esquerdo
+            camera_y: Linha do mundo no canto superior esquerdo
+            view_width: Largura visível em células
+            view_height: Altura visível em células
+        """
+        scale = self.scale
+        size = chunk_manager.chunk_size
+
+        pyxel.clip(0, 0, view_width * scale, view_height * scale)
+        for key in chunk_manager.visible_chunks(camera_x, camera_y, view_width, view_height):
+            chunk = chunk_manager.get_chunk(*key)
+            cached = self.images.get(key)
+            if cached is None or cached[0] is not chunk:
+                cached = (chunk, rasterize_map(chunk.map_data, scale))
+                self.images[key] = cached
+            screen_x = (key[0] * size - camera_x) * scale
+            screen_y = (key[1] * size - camera_y) * scale
+            pyxel.blt(screen_x, screen_y, cached[1], 0, 0, size * scale, size * scale)
+        pyxel.clip()
+
+        # Libera imagens de chunks que saíram da memória
+        for key in [k for k in self.images if k not in chunk_manager.chunks]:
+            del self.images[key]
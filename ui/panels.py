@@ -0,0 +1,62 @@
+"""
+Painéis da interface em modo retido
+"""
+
+import pyxel
+from typing import Callable, Hashable, Optional
+
+# Valor que nunca é igual a uma chave real (força o primeiro desenho)
+_NOT_RENDERED = object()
+
+
+class CachedPanel:
+    """
+    Painel desenhado em uma pyxel.Image própria e copiado para a tela com
+    um blt por frame.
+
+    A imagem só é redesenhada quando a chave calculada a partir das entradas
+    do painel muda (ex.: número de mensagens, status do jogador).
+    """
+
+    def __init__(self, x: int, y: int, width: int, height: int,
+                 render: Callable[[pyxel.Image, object], None],
+                 key: Callable[[object], Hashable]):
+        """
+        Args:
+            x: Posição do painel na tela
+            y: Posição do painel na tela
+            width: Largura do painel
+            height: Altura do painel
+            render: Desenha o painel na imagem (coordenadas relativas ao painel)
+            key: Calcula, a partir do estado do jogo, a chave das entradas do painel
+        """
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.render = render
+        self.key = key
+        self.image: Optional[pyxel.Image] = None
+        self._rendered_key = _NOT_RENDERED
+        self.render_count = 0
+
+    def invalidate(self):
+        """Força o redesenho no próximo draw."""
+        self._rendered_key = _NOT_RENDERED
+
+    def update(self, game_state):
+        """Redesenha a imagem se as entradas do painel mudaram."""
+        key = self.key(game_state)
+        if key == self._rendered_key and self.image is not None:
+            return
+        if self.image is None:
+            self.image = pyxel.Image(self.width, self.height)
+        self.image.cls(0)
+        self.render(self.image, game_state)
+        self._rendered_key = key
+        self.render_count += 1
+
+    def draw(self, game_state):
+        """Atualiza (se preciso) e copia o painel para a tela."""
+        self.update(game_state)
+        pyxel.blt(self.x, self.y, self.image, 0, 0, self.width, self.height)
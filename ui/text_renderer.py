@@ -0,0 +1,109 @@
+"""
+Renderizador de texto com cache de strings pré-desenhadas
+"""
+
+import os
+import pyxel
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+# Espaçamento do "texto grande" com a fonte embutida (4 px de glifo + 2 de folga)
+LARGE_TEXT_ADVANCE = 6
+DEFAULT_FONT_HEIGHT = 6
+
+# Fonte BDF para títulos (a mesma dos exemplos do pyxel; None usa a fonte embutida)
+TITLE_FONT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                          "examples", "assets", "umplus_j12r.bdf")
+if not os.path.exists(TITLE_FONT):
+    TITLE_FONT = None
+
+
+class TextRenderer:
+    """
+    Desenha strings inteiras com um blt de uma imagem pré-renderizada.
+
+    Cada string é diagramada uma vez (glifo a glifo, ou com uma fonte BDF)
+    em uma pyxel.Image guardada em um LRU pela chave (texto, cor, fonte);
+    as strings menos usadas são descartadas quando o cache enche.
+    """
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[Tuple[str, int, Optional[str]], Tuple[pyxel.Image, int]]" = OrderedDict()
+        self.fonts: Dict[str, Tuple[pyxel.Font, int]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _font(self, path: str) -> Tuple[pyxel.Font, int]:
+        """Carrega (uma vez) uma fonte BDF e a altura da sua caixa de glifos."""
+        font = self.fonts.get(path)
+        if font is None:
+            height = DEFAULT_FONT_HEIGHT
+            with open(path, encoding="latin-1") as file:
+                for line in file:
+                    if line.startswith("FONTBOUNDINGBOX"):
+                        height = int(line.split()[2])
+                        break
+            font = (pyxel.Font(path), height)
+            self.fonts[path] = font
+        return font
+
+    def text_width(self, text: str, font: Optional[str] = None) -> int:
+        """Largura em pixels da string."""
+        if font is None:
+            return len(text) * LARGE_TEXT_ADVANCE
+        return self._font(font)[0].text_width(text)
+
+    def text_height(self, font: Optional[str] = None) -> int:
+        """Altura em pixels de uma linha."""
+        if font is None:
+            return DEFAULT_FONT_HEIGHT
+        return self._font(font)[1]
+
+    def _render(self, text: str, color: int, font: Optional[str]) -> Tuple[pyxel.Image, int]:
+        """Diagrama a string em uma imagem nova (fundo na cor transparente)."""
+        colkey = 1 if color == 0 else 0
+        image = pyxel.Image(max(1, self.text_width(text, font)), self.text_height(font))
+        image.cls(colkey)
+        if font is None:
+            for i, char in enumerate(text):
+                image.text(i * LARGE_TEXT_ADVANCE, 0, char, color)
+        else:
+            image.text(0, 0, text, color, self._font(font)[0])
+        return image, colkey
+
+    def get(self, text: str, color: int, font: Optional[str] = None) -> Tuple[pyxel.Image, int]:
+        """Retorna (imagem, cor transparente) da string, renderizando se preciso."""
+        key = (text, color, font)
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        entry = self._render(text, color, font)
+        self.entries[key] = entry
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return entry
+
+    def draw(self, x: int, y: int, text: str, color: int, font: Optional[str] = None, surface=pyxel):
+        """Desenha a string em (x, y) na tela ou em uma pyxel.Image."""
+        if not text:
+            return
+        image, colkey = self.get(text, color, font)
+        surface.blt(x, y, image, 0, 0, image.width, image.height, colkey)
+
+    def draw_centered(self, x: int, y: int, text: str, color: int, width: int,
+                      font: Optional[str] = None, surface=pyxel):
+        """Desenha a string centralizada em [x, x + width)."""
+        self.draw(x + (width - self.text_width(text, font)) // 2, y, text, color, font, surface)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Retorna contadores de uso do cache."""
+        return {"entries": len(self.entries), "hits": self.hits, "misses": self.misses}
+
+
+# Renderizador compartilhado pela interface e pelas telas do main.py
+text_renderer = TextRenderer()